@@ -15,7 +15,7 @@ from ..models import (
     AnalysisStartRequest, AnalysisStatusResponse, AnalysisStatus,
     CacheStatsResponse, SuccessResponse
 )
-from core_engine.audio_analysis.analyzer import AudioAnalyzer
+from core_engine.audio_analysis.analyzer import AudioAnalyzer, ANALYSIS_SAMPLE_RATE, MAX_ANALYSIS_MEMORY_MB
 from core_engine.data_management.database_manager import DatabaseManager
 from core_engine.mood_classifier.mood_classifier import MoodClassifier
 from config.settings import settings
@@ -36,11 +36,21 @@ def get_analyzer():
     if _analyzer is None:
         _analyzer = AudioAnalyzer(
             db_path=settings.get("audio_analysis.db_path", "data/database.db"),
-            enable_multiprocessing=settings.get("audio_analysis.enable_multiprocessing", True)
+            enable_multiprocessing=settings.get("audio_analysis.enable_multiprocessing", True),
+            analysis_sample_rate=settings.get("audio_analysis.analysis_sample_rate", ANALYSIS_SAMPLE_RATE),
+            max_analysis_memory_mb=settings.get("audio_analysis.max_analysis_memory_mb", MAX_ANALYSIS_MEMORY_MB)
         )
     return _analyzer
 
 
+def close_analyzer():
+    """Beendet den Worker-Pool des AudioAnalyzer (beim Herunterfahren)"""
+    global _analyzer
+    if _analyzer is not None:
+        _analyzer.close()
+        _analyzer = None
+
+
 def get_database_manager():
     """Get DatabaseManager instance"""
     global _cache_manager
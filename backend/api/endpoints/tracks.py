@@ -1,11 +1,14 @@
 """Tracks API Endpoints - Track-Management und Suche"""
 
 import os
+import math
 import logging
 import time
 from typing import List, Optional
 from pathlib import Path
 
+import numpy as np
+
 from fastapi import APIRouter, HTTPException, Query, Depends
 from fastapi.responses import JSONResponse
 
@@ -13,7 +16,8 @@ from ..models import (
     Track, TrackSummary, TracksListResponse, TrackDetailsResponse,
     TracksQueryParams, ErrorResponse, MoodCategory
 )
-from core_engine.audio_analysis.analyzer import AudioAnalyzer
+from core_engine.audio_analysis.analyzer import AudioAnalyzer, ANALYSIS_SAMPLE_RATE, MAX_ANALYSIS_MEMORY_MB
+from core_engine.audio_analysis.feature_extractor import stats1d
 from core_engine.data_management.database_manager import DatabaseManager
 from core_engine.mood_classifier.mood_classifier import MoodClassifier
 from config.settings import settings
@@ -33,11 +37,21 @@ def get_analyzer():
     if _analyzer is None:
         _analyzer = AudioAnalyzer(
             db_path=settings.get("audio_analysis.db_path", "data/database.db"),
-            enable_multiprocessing=settings.get("audio_analysis.enable_multiprocessing", True)
+            enable_multiprocessing=settings.get("audio_analysis.enable_multiprocessing", True),
+            analysis_sample_rate=settings.get("audio_analysis.analysis_sample_rate", ANALYSIS_SAMPLE_RATE),
+            max_analysis_memory_mb=settings.get("audio_analysis.max_analysis_memory_mb", MAX_ANALYSIS_MEMORY_MB)
         )
     return _analyzer
 
 
+def close_analyzer():
+    """Beendet den Worker-Pool des AudioAnalyzer (beim Herunterfahren)"""
+    global _analyzer
+    if _analyzer is not None:
+        _analyzer.close()
+        _analyzer = None
+
+
 def get_database_manager():
     """Get DatabaseManager instance"""
     global _database_manager
@@ -54,6 +68,14 @@ def get_mood_classifier():
     return _mood_classifier
 
 
+def _summary_stats(values: List[float]) -> dict:
+    """Min/Max/Mean/Std einer Zeitreihe in einem Durchlauf (leeres Dict ohne Werte)"""
+    if not values:
+        return {}
+    mean, var, lo, hi = stats1d(np.asarray(values, dtype=np.float64))
+    return {"min": lo, "max": hi, "mean": mean, "std": math.sqrt(var)}
+
+
 def parse_query_params(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(50, ge=1, le=200, description="Items per page"),
@@ -491,25 +513,8 @@ async def get_track_time_series(track_id: str,
         energy_values = [d["energy_value"] for d in time_series_data if d["energy_value"] is not None]
         brightness_values = [d["brightness_value"] for d in time_series_data if d["brightness_value"] is not None]
         
-        import numpy as np
-        energy_stats = {}
-        brightness_stats = {}
-        
-        if energy_values:
-            energy_stats = {
-                "min": float(np.min(energy_values)),
-                "max": float(np.max(energy_values)),
-                "mean": float(np.mean(energy_values)),
-                "std": float(np.std(energy_values))
-            }
-        
-        if brightness_values:
-            brightness_stats = {
-                "min": float(np.min(brightness_values)),
-                "max": float(np.max(brightness_values)),
-                "mean": float(np.mean(brightness_values)),
-                "std": float(np.std(brightness_values))
-            }
+        energy_stats = _summary_stats(energy_values)
+        brightness_stats = _summary_stats(brightness_values)
         
         return {
             "file_path": file_path,
@@ -78,6 +78,8 @@ class Settings:
                 ],
                 "max_file_size_mb": 500,
                 "sample_rate": 44100,
+                "analysis_sample_rate": 22050,  # Feature-Extraktion (halbe FFT-Last ggü. 44,1 kHz)
+                "max_analysis_memory_mb": 512,  # Längere Dateien → zentrierter Ausschnitt
                 "enable_essentia": True,
                 "fallback_to_librosa": True,
                 "analysis_timeout_seconds": 300,
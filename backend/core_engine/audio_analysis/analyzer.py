@@ -1,14 +1,21 @@
 """Audio Analyzer - Erweiterte Audioanalyse mit Essentia + librosa für Backend"""
 
 import os
+import stat
 import json
 import logging
 import multiprocessing as mp
+import multiprocessing.util as mp_util
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple, Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple, Callable
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import hashlib
+import mmap
+from contextlib import contextmanager
 import asyncio
+import threading
+import time
 
 try:
     import essentia.standard as es
@@ -26,55 +33,403 @@ except ImportError:
     LIBROSA_AVAILABLE = False
     print("[WARNING] Could not import librosa. Some audio analysis features will be limited.")
     raise ImportError("The librosa package is required for audio analysis. Please install it using 'pip install librosa'")
+
+try:
+    import soxr
+    SOXR_AVAILABLE = True
+except ImportError:
+    SOXR_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    # xxh3 (SIMD) für den Cache-Fingerprint; sonst blake2b aus der Standardbibliothek
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
 import numpy as np
+import scipy.fft
+
+try:
+    # FFTW (SIMD, Plan-Cache) als globales scipy.fft-Backend; gilt auch für librosa.stft
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft
+    pyfftw.interfaces.cache.enable()
+    scipy.fft.set_global_backend(pyfftw.interfaces.scipy_fft)
+    PYFFTW_AVAILABLE = True
+except ImportError:
+    PYFFTW_AVAILABLE = False
+import soundfile as sf
 from mutagen import File as MutagenFile
-from ..data_management.database_manager import DatabaseManager, get_conn
-from .feature_extractor import FeatureExtractor
+from ..data_management.database_manager import DatabaseManager, close_thread_conns
+from .feature_extractor import (FeatureExtractor, FeatureExtractorPool, _AnalysisContext, _hann_window,
+                                FEATURE_EXTRACTOR_VERSION, SILENCE_PEAK_THRESHOLD)
 from ..mood_classifier.mood_classifier import MoodClassifier # Neuer Import
 
 logger = logging.getLogger(__name__)
 
 DB_PATH = 'data/database.db'
 
-def db_insert_result(result: dict) -> None:
+# Frame-Raster für die Zeitreihen-Features (gemeinsame STFT auf heruntergetastetem Signal)
+TIME_SERIES_SAMPLE_RATE = 11025
+TIME_SERIES_N_FFT = 2048
+TIME_SERIES_HOP_LENGTH = 512
+# Feste Feld-Reihenfolge der Zeitreihen-Punkte (Spalten werden in dieser Reihenfolge gezippt)
+TIME_SERIES_FIELDS = (
+    'energy_value',
+    'rms_energy',
+    'brightness_value',
+    'spectral_rolloff',
+    'timestamp',
+    'zero_crossing_rate',
+    'spectral_bandwidth',
+)
+
+# FFT-Threads pro Transformation: -1 = alle Kerne; Worker-Prozesse setzen 1 (Parallelität über den Pool)
+FFT_WORKERS = -1
+
+# Write-Behind während Batch-Analysen: Flush nach N Ergebnissen oder spätestens nach X Sekunden
+WRITE_BEHIND_BATCH_SIZE = 32
+WRITE_BEHIND_INTERVAL_SECONDS = 2.0
+
+def _magnitude_stft(y: np.ndarray, n_fft: int, hop_length: int) -> np.ndarray:
+    """
+    Betragsspektrogramm wie np.abs(librosa.stft(y, center=True, pad_mode='constant')),
+    aber als ein einziger scipy.fft.rfft-Aufruf über alle Frames (FFT_WORKERS Threads)
+    
+    Die Frames liegen zeilenweise (n_frames, n_fft), damit jede rfft über zusammenhängenden
+    Speicher läuft; die gefensterte Kopie ist temporär und darf überschrieben werden.
+    Rückgabe als (1 + n_fft // 2, n_frames)-Sicht.
+    """
+    y = np.pad(y, n_fft // 2, mode='constant')
+    frames = librosa.util.frame(y, frame_length=n_fft, hop_length=hop_length, axis=0)
+    windowed = frames * _hann_window(n_fft, y.dtype.str)
+    return np.abs(scipy.fft.rfft(windowed, axis=-1, workers=FFT_WORKERS, overwrite_x=True)).T
+
+def _rms_zcr_per_window_numpy(y: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """RMS und Zero-Crossing-Rate pro Fenster [starts[i], ends[i]) via np.add.reduceat"""
+    lengths = ends - starts
+    y = y[:ends[-1]]
+    rms = np.sqrt(np.add.reduceat(np.square(y, dtype=np.float64), starts) / lengths)
+    # Vorzeichenwechsel einmal über das ganze Signal (bool-XOR), dann pro Fenster zählen;
+    # Index i markiert den Wechsel zwischen y[i-1] und y[i]
+    signs = y >= 0
+    crossing_idx = np.flatnonzero(signs[1:] ^ signs[:-1]) + 1
+    counts = np.searchsorted(crossing_idx, ends) - np.searchsorted(crossing_idx, starts)
+    zcr = counts / lengths
+    return rms, zcr
+
+# Kein cache=True: das Modul wird als backend.core_engine... (Tests) und core_engine... (App)
+# importiert, ein On-Disk-Cache des einen Namens ist unter dem anderen nicht ladbar
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True)
+    def _rms_zcr_kernel(y, starts, ends):
+        """Ein fusionierter Durchlauf über y: RMS und Zero-Crossing-Rate pro Fenster"""
+        n_windows = len(starts)
+        rms = np.empty(n_windows, dtype=np.float64)
+        zcr = np.empty(n_windows, dtype=np.float64)
+        for w in prange(n_windows):
+            s2 = 0.0
+            zc = 0
+            for i in range(starts[w], ends[w]):
+                s2 += y[i] * y[i]
+                if i > 0 and (y[i] >= 0) != (y[i - 1] >= 0):
+                    zc += 1
+            length = ends[w] - starts[w]
+            rms[w] = np.sqrt(s2 / length)
+            zcr[w] = zc / length
+        return rms, zcr
+    
+    def _rms_zcr_per_window(y: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """RMS und ZCR pro Fenster über den numba-Kernel, NumPy bei Laufzeitfehlern des Dispatchers"""
+        try:
+            return _rms_zcr_kernel(y, starts, ends)
+        except Exception as e:
+            logger.debug(f"numba-Kernel fehlgeschlagen, nutze NumPy: {e}")
+            return _rms_zcr_per_window_numpy(y, starts, ends)
+    
+    # JIT beim Import aufwärmen, damit die erste Analyse keine Kompilierzeit zahlt
+    try:
+        _rms_zcr_kernel(np.zeros(4, dtype=np.float32), np.array([0], dtype=np.int64), np.array([4], dtype=np.int64))
+    except Exception as e:
+        logger.debug(f"numba-Kernel nicht verfügbar, nutze NumPy: {e}")
+        NUMBA_AVAILABLE = False
+        _rms_zcr_per_window = _rms_zcr_per_window_numpy
+else:
+    _rms_zcr_per_window = _rms_zcr_per_window_numpy
+
+# Bytes vom Datei-Anfang und -Ende für den Inhalts-Fingerprint (Cache-Schlüssel)
+FINGERPRINT_CHUNK_BYTES = 1024 * 1024
+
+def _new_digest():
+    """128-Bit-Hashobjekt für den Fingerprint: xxh3_128 wenn installiert, sonst blake2b"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+def _fingerprint(file_path: str) -> str:
+    """
+    Schneller Inhalts-Hash (erste + letzte 1 MB + Dateigröße) als pfadunabhängiger Cache-Schlüssel.
+    
+    FEATURE_EXTRACTOR_VERSION fließt mit ein, damit geänderte Feature-Berechnungen neu analysieren.
+    """
+    digest = _new_digest()
+    digest.update(FEATURE_EXTRACTOR_VERSION.encode('ascii'))
+    with open(file_path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        digest.update(file_size.to_bytes(8, 'little'))
+        if file_size == 0:
+            return digest.hexdigest()
+        
+        # mmap + memoryview: Bytes gehen ohne Python-Zwischenpuffer in den Hash
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                digest.update(view[:FINGERPRINT_CHUNK_BYTES])
+                if file_size > FINGERPRINT_CHUNK_BYTES:
+                    tail_start = max(file_size - FINGERPRINT_CHUNK_BYTES, FINGERPRINT_CHUNK_BYTES)
+                    digest.update(view[tail_start:])
+    return digest.hexdigest()
+
+# librosa-Resampler: soxr_hq (C/SIMD) wenn installiert, sonst scipy-Polyphase statt resampy
+RESAMPLE_TYPE = 'soxr_hq' if SOXR_AVAILABLE else 'polyphase'
+
+# Erweiterte unterstützte Audioformate (Dateiendungen, kleingeschrieben)
+SUPPORTED_FORMATS = frozenset({
+    '.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.aiff', '.aif', '.au',
+    '.wma', '.mp4', '.3gp', '.amr', '.opus', '.webm', '.mkv'
+})
+
+# Kleinere Dateien können keine analysierbare Audiospur enthalten (Pre-Check in analyze_track)
+MIN_AUDIO_FILE_BYTES = 1024
+
+# Analyse-Rate: BPM, Chroma, MFCC und Spektralfeatures brauchen nicht mehr als 11 kHz Bandbreite
+ANALYSIS_SAMPLE_RATE = 22050
+# Obergrenze für das dekodierte Analyse-Signal; längere Dateien → zentrierter Ausschnitt
+# (512 MB ≈ 100 min bei 22,05 kHz; None = unbegrenzt)
+MAX_ANALYSIS_MEMORY_MB = 512
+
+# Blockgröße beim Dekodieren (Sekunden): begrenzt den Mehrkanal-Zwischenpuffer
+LOAD_BLOCK_SECONDS = 60
+
+def _read_mono_blocks(file_path: str, max_seconds: Optional[float] = None,
+                      sr: Optional[int] = None) -> Tuple[np.ndarray, int]:
+    """
+    Dekodiert blockweise direkt in einen vorallokierten Mono-float32-Puffer.
+    
+    Das Mehrkanal-Signal liegt nie komplett im Speicher, nur jeweils ein Block;
+    Spitzen-RSS ist damit ~Mono-Länge statt Kanäle x Länge + Mono-Kopie.
+    Mit max_seconds wird nur ein zentrierter Ausschnitt dieser Länge dekodiert.
+    
+    Mit sr (und soxr) wird jeder Block über soxr.ResampleStream direkt in einen Puffer mit
+    Ziel-Rate resampelt; der Puffer ist dann max_seconds * sr groß, unabhängig von der
+    Original-Rate. Ohne soxr wird der Ausschnitt so gekürzt, dass Original-Puffer plus
+    resampelte Kopie (load_audio) zusammen in max_seconds * sr passen.
+    """
+    with sf.SoundFile(file_path) as f:
+        native_sr = f.samplerate
+        stream = None
+        if sr is not None and sr != native_sr:
+            if SOXR_AVAILABLE:
+                stream = soxr.ResampleStream(native_sr, sr, 1, dtype='float32', quality='HQ')
+            elif max_seconds is not None:
+                max_seconds = max_seconds * sr / (native_sr + sr)
+        
+        n_frames = f.frames
+        if max_seconds is not None and n_frames > int(max_seconds * native_sr):
+            n_frames = int(max_seconds * native_sr)
+            f.seek((f.frames - n_frames) // 2)
+        if stream is None:
+            y = np.empty(n_frames, dtype=np.float32)
+        else:
+            # Etwas Reserve für Rundung der Ausgabelänge, gekappt wird unten
+            y = np.empty(int(np.ceil(n_frames * sr / native_sr)) + 16, dtype=np.float32)
+        pos = 0
+        for block in f.blocks(blocksize=LOAD_BLOCK_SECONDS * native_sr, dtype='float32',
+                              always_2d=True, frames=n_frames):
+            if stream is not None:
+                mono = (np.mean(block, axis=1, dtype=np.float32) if block.shape[1] > 1
+                        else np.ascontiguousarray(block[:, 0]))
+                pos = _append_clipped(y, pos, stream.resample_chunk(mono))
+                continue
+            n = min(len(block), len(y) - pos)
+            if block.shape[1] > 1:
+                np.mean(block[:n], axis=1, dtype=np.float32, out=y[pos:pos + n])
+            else:
+                y[pos:pos + n] = block[:n, 0]
+            pos += n
+        if stream is not None:
+            pos = _append_clipped(y, pos, stream.resample_chunk(np.empty(0, dtype=np.float32), last=True))
+            return y[:pos], sr
+    return y[:pos], native_sr
+
+def _append_clipped(y: np.ndarray, pos: int, chunk: np.ndarray) -> int:
+    """Kopiert chunk ab pos in y (höchstens bis zum Pufferende) und liefert die neue Position"""
+    n = min(len(chunk), len(y) - pos)
+    y[pos:pos + n] = chunk[:n]
+    return pos + n
+
+def load_audio(file_path: str, sr: int, max_seconds: Optional[float] = None) -> Tuple[np.ndarray, int]:
+    """
+    Lädt eine Audio-Datei als Mono-float32 mit Ziel-Sample-Rate.
+    
+    Direkter soundfile-Decode mit blockweisem soxr-Resampling; librosa.load (audioread) nur
+    für Formate, die libsndfile nicht lesen kann. Längere Dateien als max_seconds
+    werden auf einen zentrierten Ausschnitt begrenzt.
+    """
+    try:
+        y, read_sr = _read_mono_blocks(file_path, max_seconds, sr)
+    except Exception as e:
+        logger.debug(f"soundfile kann {file_path} nicht lesen, nutze librosa: {e}")
+        offset = 0.0
+        if max_seconds is not None:
+            total_seconds = librosa.get_duration(path=file_path)
+            offset = max(total_seconds - max_seconds, 0.0) / 2
+        return librosa.load(file_path, sr=sr, offset=offset, duration=max_seconds, res_type=RESAMPLE_TYPE)
+    
+    # Gleiche Rate bzw. schon beim Lesen resampelt: kein weiteres Resampling
+    if read_sr != sr:
+        y = librosa.resample(y, orig_sr=read_sr, target_sr=sr, res_type=RESAMPLE_TYPE)
+    
+    return np.ascontiguousarray(y, dtype=np.float32), sr
+
+# Fensterlänge für die Stille-Erkennung beim Trimmen (entspricht librosa.effects.trim)
+TRIM_FRAME_LENGTH = 2048
+
+def _trim_silence(y: np.ndarray, top_db: float = 20.0,
+                  frame_length: int = TRIM_FRAME_LENGTH) -> np.ndarray:
+    """
+    Schneidet Stille am Anfang/Ende ab (Ersatz für librosa.effects.trim).
+    
+    Gleitender RMS über eine kumulative Summe der Quadrate: ein linearer Durchlauf
+    über y statt Framing + RMS-Matrix, Schwelle relativ zum RMS-Maximum.
+    """
+    n = len(y)
+    if n == 0:
+        return y
+    
+    # Kumulative Leistung, links/rechts mit den Randwerten verlängert: Fenstersumme um
+    # Sample i ist dann ext[i + frame_length] - ext[i] (keine Index-Arrays nötig)
+    half = frame_length // 2
+    csum = np.cumsum(np.square(y, dtype=np.float64))
+    ext = np.empty(n + frame_length + 1)
+    ext[:half + 1] = 0.0
+    ext[half + 1:half + 1 + n] = csum
+    ext[half + 1 + n:] = csum[-1]
+    del csum
+    mean_power = ext[frame_length:frame_length + n] - ext[:n]
+    mean_power /= frame_length
+    
+    peak = mean_power.max()
+    if peak <= 0:
+        return y[:0]
+    
+    # 20*log10(rms) > 20*log10(peak_rms) - top_db  <=>  power > peak_power * 10^(-top_db/10)
+    # Erstes/letztes Sample über der Schwelle per argmax von vorn/hinten (keine Indexliste)
+    above = mean_power > peak * 10.0 ** (-top_db / 10.0)
+    start = int(np.argmax(above))
+    end = n - int(np.argmax(above[::-1]))
+    return y[start:end]
+
+def _normalize_inplace(y: np.ndarray) -> np.ndarray:
+    """
+    Peak-Normalisierung auf 1.0 im vorhandenen Puffer (wie librosa.util.normalize, ohne Kopie)
+    
+    Stille Signale (Spitzenpegel unter SILENCE_PEAK_THRESHOLD) bleiben unverändert, damit die
+    Feature-Extraktion sie erkennt, statt das Grundrauschen auf Vollaussteuerung zu verstärken.
+    """
+    # max/-min statt np.abs(y).max(): kein temporäres Array in Signalgröße
+    peak = max(float(y.max()), -float(y.min())) if len(y) else 0.0
+    if peak >= SILENCE_PEAK_THRESHOLD:
+        y *= 1.0 / peak
+    return y
+
+# Status, den analyze_track für vollständig analysierte Tracks setzt
+COMPLETED_STATUS = 'completed'
+
+def db_insert_result(result: dict, database_manager: Optional[DatabaseManager] = None) -> None:
     """Thread-sichere DB-Insertion für Analyse-Ergebnisse"""
-    if result.get('status') != 'success':
-        return
-    f = result.get('features', {})
-    c = result.get('camelot', {})
+    db_insert_results_bulk([result], database_manager)
+
+def db_insert_results_bulk(results: List[dict],
+                           database_manager: Optional[DatabaseManager] = None) -> int:
+    """
+    Schreibt alle abgeschlossenen Ergebnisse in einer Transaktion (tracks + global_features)
+    
+    Nutzt das Schema des DatabaseManager (save_many_to_cache); ohne Manager wird DB_PATH verwendet.
+    Returns: Anzahl gespeicherter Ergebnisse
+    """
+    items = [(r['file_path'], r, r.get('content_hash'))
+             for r in results if r.get('status') == COMPLETED_STATUS and r.get('file_path')]
+    if not items:
+        return 0
+    if database_manager is None:
+        database_manager = DatabaseManager(DB_PATH)
+    saved = database_manager.save_many_to_cache(items)
+    if saved < len(items):
+        logger.error(f"DB insert failed for {len(items) - saved} of {len(items)} results")
+    return saved
+
+
+# Pro Worker-Prozess einmal erzeugter Analyzer (nur für executor_backend='process')
+_process_analyzer = None
+
+def _init_process_worker(db_path: str, analyzer_kwargs: Optional[Dict[str, Any]] = None) -> None:
+    """Initializer des Worker-Prozesses: Analyzer (inkl. FeatureExtractor) einmal pro Prozess"""
+    global _process_analyzer, FFT_WORKERS
+    # Ein FFT-Thread pro Worker, sonst konkurrieren N Prozesse x alle Kerne
+    FFT_WORKERS = 1
+    _process_analyzer = AudioAnalyzer(db_path=db_path, enable_multiprocessing=False,
+                                      **(analyzer_kwargs or {}))
+    # Worker schreiben nicht selbst in die DB; der Elternprozess übernimmt die Ergebnisse gebündelt
+    _process_analyzer.defer_writes = True
+    _warm_up_feature_extractor(_process_analyzer.feature_extractor,
+                               _process_analyzer.import_config['analysis_sample_rate'])
+    # DB-Connections beim Prozessende schließen (Finalizer laufen in multiprocessing-Kindprozessen)
+    mp_util.Finalize(None, _close_process_worker, exitpriority=10)
+
+def _close_process_worker() -> None:
+    """Finalizer des Worker-Prozesses: Connections von DatabaseManager und get_conn schließen"""
+    if _process_analyzer is not None:
+        _process_analyzer.database_manager.close()
+    close_thread_conns()
+
+def _warm_up_feature_extractor(feature_extractor: FeatureExtractor, sr: int) -> None:
+    """
+    Einmalige Probe-Extraktion auf 1 s Rauschen: numba-Kernel, librosa-Caches und lazy
+    Essentia-Algorithmen werden beim Worker-Start statt beim ersten echten Track initialisiert.
+    """
+    y = (0.1 * np.random.default_rng(0).standard_normal(sr)).astype(np.float32)
     try:
-        with get_conn(DB_PATH) as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                INSERT INTO tracks (file_path, bpm, musical_key, energy, mood, camelot)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(file_path) DO UPDATE SET
-                  bpm=excluded.bpm,
-                  musical_key=excluded.musical_key,
-                  energy=excluded.energy,
-                  mood=excluded.mood,
-                  camelot=excluded.camelot,
-                  updated_at=CURRENT_TIMESTAMP
-                """,
-                (
-                    result.get('file_path'),
-                    f.get('bpm', 0.0),
-                    c.get('key', ''),
-                    f.get('energy', 0.0),
-                    result.get('mood', {}).get('primary_mood', ''),
-                    c.get('camelot', '')
-                )
-            )
-            conn.commit()
+        feature_extractor.extract_all_features(y, sr)
+        feature_extractor.estimate_key(y, sr)
     except Exception as e:
-        logger.error(f"DB insert failed: {e}")
+        logger.debug(f"Worker-Warm-up fehlgeschlagen: {e}")
+
+def _analyze_track_in_process(file_path: str, db_path: str,
+                              analyzer_kwargs: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], List[tuple]]:
+    """
+    Modul-Level-Worker für ProcessPoolExecutor (picklebar, ohne gebundene Methode).
+    
+    Returns:
+        (Analyse-Ergebnis, zurückgestellte DB-Schreibzugriffe für den Elternprozess)
+    """
+    if _process_analyzer is None:
+        _init_process_worker(db_path, analyzer_kwargs)
+    result = _process_analyzer._analyze_track_safe(file_path)
+    return result, _process_analyzer._drain_writes()
 
 
 class AudioAnalyzer:
     """Erweiterte Audio-Analyse-Engine mit Essentia + librosa für headless Backend"""
     
-    def __init__(self, db_path: str = "data/database.db", enable_multiprocessing: bool = True):
+    def __init__(self, db_path: str = "data/database.db", enable_multiprocessing: bool = True,
+                 analysis_sample_rate: int = ANALYSIS_SAMPLE_RATE,
+                 max_analysis_memory_mb: Optional[float] = MAX_ANALYSIS_MEMORY_MB):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -90,17 +445,32 @@ class AudioAnalyzer:
         # Multiprocessing-Konfiguration
         self.enable_multiprocessing = enable_multiprocessing
         self.max_workers = min(mp.cpu_count() or 1, 8)
+        # 'process': echte Parallelität über alle Kerne (Python-Steuerfluss hält sonst die GIL)
+        # 'thread': ohne Pickling/Prozessstart, z. B. für kleine Batches oder Tests
+        self.executor_backend = 'process'
+        # Write-Behind-Puffer für DB-Schreibzugriffe (nur aktiv während analyze_batch_async)
+        self._write_queue: List[Tuple[str, Dict, Optional[str]]] = []
+        self._write_lock = threading.Lock()
+        self._write_behind_depth = 0
+        self._last_flush = time.monotonic()
+        # In Worker-Prozessen: Schreibzugriffe nur sammeln (_drain_writes), nie selbst flushen
+        self.defer_writes = False
         
-        # Erweiterte unterstützte Audioformate
-        self.supported_formats = {
-            '.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.aiff', '.aif', '.au',
-            '.wma', '.mp4', '.3gp', '.amr', '.opus', '.webm', '.mkv'
-        }
+        # Persistenter Worker-Pool (lazy, lebt so lange wie der Analyzer; siehe close())
+        self._executor = None
+        self._executor_kind = None
+        # Thread-Backend: ein FeatureExtractor pro Worker-Thread (Essentia ist nicht threadsicher)
+        self._extractor_pool: Optional[FeatureExtractorPool] = None
+        
+        # Erweiterte unterstützte Audioformate (modulweite Konstante, nicht pro Instanz)
+        self.supported_formats = SUPPORTED_FORMATS
         
         # Import-Konfiguration
         self.import_config = {
             'max_file_size_mb': 500,
             'sample_rate': 44100,
+            'analysis_sample_rate': analysis_sample_rate,
+            'max_analysis_memory_mb': max_analysis_memory_mb,
             'mono': True,
             'normalize': True,
             'trim_silence': True
@@ -113,71 +483,210 @@ class AudioAnalyzer:
             'errors': 0,
             'processing_time': 0.0
         }
+        self._stats_lock = threading.Lock()
+    
+    def _bump_stat(self, key: str, amount: float = 1) -> None:
+        """Erhöht einen Statistik-Zähler threadsicher (Batch-Worker laufen parallel)"""
+        with self._stats_lock:
+            self.analysis_stats[key] += amount
     
-    def load_cached_analysis(self, file_path: str) -> Optional[Dict]:
-        """Lädt Analyse-Ergebnisse aus der Datenbank"""
-        cached = self.database_manager.load_from_cache(file_path)
+    def _content_hash(self, file_path: str) -> Optional[str]:
+        """Inhalts-Fingerprint oder None, falls die Datei nicht lesbar ist"""
+        try:
+            return _fingerprint(file_path)
+        except OSError:
+            return None
+    
+    def load_cached_analysis(self, file_path: str, content_hash: Optional[str] = None) -> Optional[Dict]:
+        """Lädt Analyse-Ergebnisse aus der Datenbank (Schlüssel: Inhalts-Hash, Fallback: Pfad)"""
+        if content_hash is None:
+            content_hash = self._content_hash(file_path)
+        if content_hash:
+            cached = self.database_manager.load_from_cache(file_path, content_hash)
+        else:
+            cached = self.database_manager.load_from_cache(file_path)
         if cached:
-            self.analysis_stats['cache_hits'] += 1
+            self._bump_stat('cache_hits')
             return cached
         return None
     
-    def save_analysis_results(self, file_path: str, analysis: Dict):
-        """Speichert Analyse-Ergebnisse in der Datenbank"""
-        success = self.database_manager.save_to_cache(file_path, analysis)
+    def save_analysis_results(self, file_path: str, analysis: Dict, content_hash: Optional[str] = None):
+        """Speichert Analyse-Ergebnisse in der Datenbank (während Batches gepuffert)"""
+        if content_hash is None:
+            content_hash = self._content_hash(file_path)
+        
+        if self.defer_writes or self._write_behind_depth > 0:
+            self._enqueue_writes([(file_path, analysis, content_hash)])
+            return
+        
+        if content_hash:
+            success = self.database_manager.save_to_cache(file_path, analysis, content_hash)
+        else:
+            success = self.database_manager.save_to_cache(file_path, analysis)
         if not success:
             logger.warning(f"Analyse-Ergebnisse konnten nicht gespeichert werden für: {file_path}")
     
+    def _enqueue_writes(self, items: List[Tuple[str, Dict, Optional[str]]]):
+        """Reiht Schreibzugriffe in den Write-Behind-Puffer ein und flusht bei Bedarf"""
+        with self._write_lock:
+            self._write_queue.extend(items)
+            flush_due = not self.defer_writes and (
+                len(self._write_queue) >= WRITE_BEHIND_BATCH_SIZE or
+                time.monotonic() - self._last_flush >= WRITE_BEHIND_INTERVAL_SECONDS)
+        if flush_due:
+            self._flush_now()
+    
+    def _drain_writes(self) -> List[Tuple[str, Dict, Optional[str]]]:
+        """Entnimmt alle gepufferten Schreibzugriffe (für die Übergabe an den Elternprozess)"""
+        with self._write_lock:
+            items, self._write_queue = self._write_queue, []
+        return items
+    
+    def _flush_now(self):
+        """Schreibt alle gepufferten Ergebnisse in einer Transaktion"""
+        with self._write_lock:
+            items, self._write_queue = self._write_queue, []
+            self._last_flush = time.monotonic()
+        if items:
+            saved = self.database_manager.save_many_to_cache(items)
+            if saved < len(items):
+                logger.warning(f"{len(items) - saved} von {len(items)} Analyse-Ergebnissen konnten nicht gespeichert werden")
+    
     def is_cached(self, file_path: str) -> bool:
         """Prüft ob eine Datei bereits analysiert ist"""
         return self.database_manager.is_cached(file_path)
     
+    def _quick_validate(self, file_path: str, st: os.stat_result) -> bool:
+        """Prüft Format und Dateigröße anhand eines bereits vorhandenen stat-Ergebnisses"""
+        # Prüfe Dateiformat (reiner String-Vergleich, kein Syscall)
+        dot = file_path.rfind('.')
+        file_ext = file_path[dot:].lower() if dot > file_path.rfind(os.sep) else ''
+        if file_ext not in self.supported_formats:
+            logger.warning(f"Nicht unterstütztes Format: {file_ext}")
+            return False
+        
+        # Prüfe Dateigröße
+        file_size_mb = st.st_size / (1024 * 1024)
+        if file_size_mb > self.import_config['max_file_size_mb']:
+            logger.warning(f"Datei zu groß: {file_size_mb:.1f}MB > {self.import_config['max_file_size_mb']}MB")
+            return False
+        
+        return True
+    
+    def _check_file_constraints(self, file_path: str) -> bool:
+        """Prüft Dateigröße und -format (ein stat-Aufruf, ohne die Datei zu öffnen)"""
+        return self._quick_validate(file_path, os.stat(file_path))
+    
     def validate_audio_file(self, file_path: str) -> bool:
-        """Validiert Audio-Datei vor der Analyse"""
+        """Validiert Audio-Datei vor der Analyse (nur Metadaten, ohne Audio zu dekodieren)"""
         try:
-            # Prüfe Dateigröße
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            if file_size_mb > self.import_config['max_file_size_mb']:
-                logger.warning(f"Datei zu groß: {file_size_mb:.1f}MB > {self.import_config['max_file_size_mb']}MB")
+            if not self._check_file_constraints(file_path):
                 return False
             
-            # Prüfe Dateiformat
-            file_ext = Path(file_path).suffix.lower()
-            if file_ext not in self.supported_formats:
-                logger.warning(f"Nicht unterstütztes Format: {file_ext}")
-                return False
-            
-            # Prüfe ob Datei lesbar ist
+            # Prüfe ob Datei lesbar ist: Header via soundfile ...
             try:
-                y, sr = librosa.load(file_path, sr=None, duration=1.0)
-                if len(y) == 0:
+                info = sf.info(file_path)
+                if info.frames == 0 or info.channels == 0:
                     logger.warning(f"Leere Audio-Datei: {file_path}")
                     return False
-            except Exception as e:
-                logger.warning(f"Kann Audio-Datei nicht laden: {e}")
-                return False
+                return True
+            except Exception:
+                pass
             
-            return True
+            # ... oder Stream-Info via mutagen (MP3/M4A ohne ffmpeg-Decode)
+            try:
+                audio_file = MutagenFile(file_path)
+                if audio_file is not None and audio_file.info is not None:
+                    if audio_file.info.length <= 0 or getattr(audio_file.info, 'channels', 1) <= 0:
+                        logger.warning(f"Leere Audio-Datei: {file_path}")
+                        return False
+                    return True
+            except Exception:
+                pass
+            
+            logger.warning(f"Kann Audio-Metadaten nicht lesen: {file_path}")
+            return False
             
         except Exception as e:
             logger.error(f"Fehler bei Datei-Validierung: {e}")
             return False
     
+    def _load_audio(self, file_path: str) -> Tuple[np.ndarray, int]:
+        """Einziger Decode pro Track; ein leeres Ergebnis ist zugleich die Leer-Prüfung"""
+        return load_audio(file_path, self.import_config['analysis_sample_rate'],
+                          self._max_analysis_seconds())
+    
+    def _load_and_validate(self, file_path: str, st: os.stat_result) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Prüft Format/Größe anhand des stat-Ergebnisses und dekodiert genau einmal.
+        
+        Lesbarkeit wird nicht separat geprüft: schlägt der Decode fehl, bricht analyze_track ab.
+        """
+        if not self._quick_validate(file_path, st):
+            return None
+        return self._load_audio(file_path)
+    
+    def _max_analysis_seconds(self) -> Optional[float]:
+        """Maximale Signaldauer, die in max_analysis_memory_mb passt (float32 mono)"""
+        budget_mb = self.import_config.get('max_analysis_memory_mb')
+        if not budget_mb:
+            return None
+        bytes_per_second = 4 * self.import_config['analysis_sample_rate']
+        return budget_mb * 1024 * 1024 / bytes_per_second
+    
+    def _decode_for_batch(self, file_path: str) -> Optional[np.ndarray]:
+        """Decode + Vorverarbeitung wie in analyze_track; None bei Fehler, leerer Datei oder Stille"""
+        try:
+            y, _ = self._load_audio(file_path)
+        except Exception as e:
+            logger.warning(f"Decode fehlgeschlagen für {file_path}: {e}")
+            return None
+        if self.import_config['trim_silence'] and len(y):
+            y = _trim_silence(y, top_db=20)
+        if len(y) == 0:
+            return None
+        y = np.ascontiguousarray(y, dtype=np.float32)
+        return _normalize_inplace(y) if self.import_config['normalize'] else y
+    
+    def extract_features_batch(self, file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Features für viele Dateien auf einmal (z.B. Bibliotheks-Import)
+        
+        Dekodiert parallel in einem Thread-Pool (soundfile/soxr geben den GIL frei) und rechnet
+        die STFT aller Tracks in einem gemeinsamen rfft-Aufruf (extract_all_features_batch).
+        Nicht dekodierbare oder leere Dateien fehlen im Ergebnis.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            decoded = list(pool.map(self._decode_for_batch, file_paths))
+        
+        loaded = [(path, y) for path, y in zip(file_paths, decoded) if y is not None]
+        if not loaded:
+            return {}
+        sr = self.import_config['analysis_sample_rate']
+        with scipy.fft.set_workers(FFT_WORKERS):
+            features = self.feature_extractor.extract_all_features_batch([y for _, y in loaded], sr)
+        return {path: track_features for (path, _), track_features in zip(loaded, features)}
+    
     def analyze_track(self, file_path: str) -> Dict[str, Any]:
         """Analysiert einen Audio-Track komplett - mit ultimativer Fehlerbehandlung"""
-        # Check cache first
-        cached = self.load_cached_analysis(file_path)
+        # Check cache first (Inhalts-Hash, damit verschobene/umbenannte Dateien Treffer liefern).
+        # Treffer werden ohne weitere Umwandlung zurückgegeben; das Ergebnis-Dict entsteht erst beim Miss.
+        content_hash = self._content_hash(file_path)
+        cached = self.load_cached_analysis(file_path, content_hash)
         if cached:
             return cached
         
-        # Ultra-safe file validation
-        from .feature_extractor import safe_analyze_audio_file, get_fallback_analysis
+        # Ultra-safe file validation (ein stat für Existenz, Mindestgröße, Format und Maximalgröße)
+        from .feature_extractor import get_fallback_analysis
         
-        pre_check = safe_analyze_audio_file(file_path)
-        if pre_check and pre_check.get('status') == 'fallback':
-            # File validation failed
+        try:
+            st = os.stat(file_path)
+        except OSError as e:
+            logger.warning(f"Pre-check failed for {file_path} ({e}), using fallback")
+            return get_fallback_analysis(file_path)
+        if not stat.S_ISREG(st.st_mode) or st.st_size < MIN_AUDIO_FILE_BYTES:
             logger.warning(f"Pre-check failed for {file_path}, using fallback")
-            return pre_check
+            return get_fallback_analysis(file_path)
         
         result = {
             'file_path': file_path,
@@ -192,67 +701,95 @@ class AudioAnalyzer:
         }
         
         try:
-            # Validierung
-            if not self.validate_audio_file(file_path):
-                result['errors'].append(f"Datei-Validierung fehlgeschlagen")
-                result['status'] = 'error'
-                return result
-            
-            # Audio laden
-            y, sr = librosa.load(file_path, sr=self.import_config['sample_rate'])
-            
-            if len(y) == 0:
-                result['errors'].append("Leere Audio-Datei")
-                result['status'] = 'error'
-                return result
-            
-            # Audio preprocessing
-            if self.import_config['trim_silence']:
-                y, _ = librosa.effects.trim(y, top_db=20)
-            
-            if self.import_config['normalize']:
-                y = librosa.util.normalize(y)
-            
-            # Features extrahieren
-            all_features = self.feature_extractor.extract_all_features(y, sr)
-            result['features'].update(all_features)
-            
-            # NEUE Phase 2 Funktionalität: Zeitreihen-Features extrahieren
-            time_series_features = self._extract_time_series_features(y, sr)
-            result['time_series_features'] = time_series_features
-            
-            # Metadaten extrahieren
-            metadata = self.feature_extractor.extract_metadata(file_path)
-            metadata['duration'] = len(y) / sr
-            result['metadata'] = metadata
-            
-            # Camelot Wheel Info
-            key, camelot = self.feature_extractor.estimate_key(y, sr)
-            result['camelot'] = {
-                'key': key,
-                'camelot': camelot,
-                'key_confidence': result['features'].get('key_confidence', 0.0),
-                'compatible_keys': self.feature_extractor.get_compatible_keys(camelot)
-            }
-            
-            # Mood-Klassifikation
-            mood, confidence, scores = self.mood_classifier.classify_mood(result['features'])
-            result['mood'] = {
-                'primary_mood': mood,
-                'confidence': confidence,
-                'scores': scores
-            }
-            
-            result['status'] = 'completed'
-            self.analysis_stats['total_analyzed'] += 1
-            
-            # Ergebnisse in Datenbank speichern
-            self.save_analysis_results(file_path, result)
-            
+            with self._borrow_extractor() as feature_extractor:
+                # Validierung + genau ein Decode
+                loaded = self._load_and_validate(file_path, st)
+                if loaded is None:
+                    result['errors'].append(f"Datei-Validierung fehlgeschlagen")
+                    result['status'] = 'error'
+                    return result
+                y, sr = loaded
+                max_seconds = self._max_analysis_seconds()
+                is_excerpt = max_seconds is not None and len(y) >= int(max_seconds * sr)
+                
+                if len(y) == 0:
+                    result['errors'].append("Leere Audio-Datei")
+                    result['status'] = 'error'
+                    return result
+                
+                # Audio preprocessing
+                if self.import_config['trim_silence']:
+                    y = _trim_silence(y, top_db=20)
+                    if len(y) == 0:
+                        result['errors'].append("Audio enthält nur Stille")
+                        result['status'] = 'error'
+                        return result
+                
+                # float32 durchgängig halten (halbe Speicherbandbreite für FFTs und Reduktionen)
+                y = np.ascontiguousarray(y, dtype=np.float32)
+                
+                if self.import_config['normalize']:
+                    # y ist der eigene Dekodier-Puffer (bzw. eine Sicht darauf): in-place skalieren
+                    y = _normalize_inplace(y)
+                
+                # Features extrahieren (Kontext bleibt für die Tonart-Schätzung erhalten);
+                # librosa rechnet über scipy.fft (rfft), hier mit derselben Thread-Zahl wie _magnitude_stft
+                ctx = _AnalysisContext(y, sr)
+                with scipy.fft.set_workers(FFT_WORKERS):
+                    all_features = feature_extractor.extract_all_features(y, sr, ctx=ctx)
+                result['features'].update(all_features)
+                
+                # NEUE Phase 2 Funktionalität: Zeitreihen-Features extrahieren
+                time_series_features = self._extract_time_series_features(y, sr)
+                result['time_series_features'] = time_series_features
+                
+                # Metadaten extrahieren
+                metadata = feature_extractor.extract_metadata(file_path)
+                metadata['duration'] = len(y) / sr
+                if is_excerpt:
+                    # Nur ein Ausschnitt wurde analysiert: echte Dauer aus dem Header
+                    metadata['analysis_excerpt'] = True
+                    try:
+                        metadata['duration'] = sf.info(file_path).duration
+                    except Exception:
+                        pass
+                result['metadata'] = metadata
+                
+                # Camelot Wheel Info (Tonart aus dem Chroma des zentrierten 60s-Ausschnitts);
+                # die tonalen Features haben sie meist schon geschätzt
+                key = result['features'].get('key')
+                if result['features'].get('silent'):
+                    # Stille: keine Tonart schätzen (kein STFT/Chroma), 'Unknown' bleibt stehen
+                    camelot = result['features'].get('camelot', '')
+                elif isinstance(key, str) and key in feature_extractor.camelot_wheel:
+                    camelot = feature_extractor.camelot_wheel[key]
+                else:
+                    key, camelot = feature_extractor.estimate_key(y, sr, ctx=ctx)
+                result['camelot'] = {
+                    'key': key,
+                    'camelot': camelot,
+                    'key_confidence': result['features'].get('key_confidence', 0.0),
+                    'compatible_keys': feature_extractor.get_compatible_keys(camelot)
+                }
+                
+                # Mood-Klassifikation
+                mood, confidence, scores = self.mood_classifier.classify_mood(result['features'])
+                result['mood'] = {
+                    'primary_mood': mood,
+                    'confidence': confidence,
+                    'scores': scores
+                }
+                
+                result['status'] = 'completed'
+                self._bump_stat('total_analyzed')
+                
+                # Ergebnisse in Datenbank speichern
+                self.save_analysis_results(file_path, result, content_hash)
+                
         except Exception as e:
             error_msg = f"Fehler bei der Analyse von {file_path}: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            self.analysis_stats['errors'] += 1
+            self._bump_stat('errors')
             
             # Return comprehensive fallback instead of broken result
             from .feature_extractor import get_fallback_analysis
@@ -261,7 +798,7 @@ class AudioAnalyzer:
             fallback_result['status'] = 'error_fallback'
             
             # Still save fallback to avoid reprocessing
-            self.save_analysis_results(file_path, fallback_result)
+            self.save_analysis_results(file_path, fallback_result, content_hash)
             return fallback_result
         
         return result
@@ -281,18 +818,117 @@ class AudioAnalyzer:
                 'mood': {}
             }
     
+    def _get_executor(self):
+        """Liefert den persistenten Executor für executor_backend (einmalig erzeugt)"""
+        if self._executor is not None and self._executor_kind != self.executor_backend:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        
+        if self._executor is None:
+            if self.executor_backend == 'process':
+                # forkserver: Worker starten aus einem schlanken Server-Prozess (nicht auf Windows verfügbar)
+                mp_context = mp.get_context('forkserver') if 'forkserver' in mp.get_all_start_methods() else None
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp_context,
+                                                     initializer=_init_process_worker,
+                                                     initargs=(str(self.db_path), self._worker_kwargs()))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+                if self._extractor_pool is None:
+                    self._extractor_pool = FeatureExtractorPool(size=self.max_workers,
+                                                                use_essentia=ESSENTIA_AVAILABLE)
+            self._executor_kind = self.executor_backend
+        
+        return self._executor
+    
+    def _worker_kwargs(self) -> Dict[str, Any]:
+        """Konstruktor-Argumente, mit denen Worker-Prozesse ihren Analyzer gleich konfigurieren"""
+        return {
+            'analysis_sample_rate': self.import_config['analysis_sample_rate'],
+            'max_analysis_memory_mb': self.import_config['max_analysis_memory_mb'],
+        }
+    
+    def close(self):
+        """Beendet den persistenten Worker-Pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._executor_kind = None
+        self._extractor_pool = None
+    
+    @contextmanager
+    def _borrow_extractor(self):
+        """FeatureExtractor für den aktuellen Thread: aus dem Pool (Thread-Backend), sonst die eigene Instanz"""
+        pool = self._extractor_pool
+        if pool is None:
+            yield self.feature_extractor
+            return
+        with pool.borrow() as extractor:
+            yield extractor
+    
     async def analyze_batch_async(self, file_paths: List[str], 
                                  progress_callback: Optional[Callable] = None) -> Dict[str, Dict]:
         """Analysiert mehrere Dateien asynchron"""
         results = {}
+        total = len(file_paths)
+        
+        # Nicht unterstützte/zu große Dateien vorab aussortieren, statt Worker dafür zu belegen
+        # (stat-Aufrufe und DB-Commits laufen im Worker-Thread, nicht auf dem Event-Loop)
+        file_paths, skipped = await asyncio.to_thread(self._prefilter_batch, file_paths)
+        for i, file_path in enumerate(skipped):
+            results[file_path] = {
+                'file_path': file_path,
+                'filename': os.path.basename(file_path),
+                'errors': ["Datei-Validierung fehlgeschlagen"],
+                'status': 'skipped'
+            }
+            if progress_callback:
+                await progress_callback(i + 1, total, file_path)
+        
+        # DB-Schreibzugriffe während des Batches puffern und gebündelt committen
+        with self._write_lock:
+            if self._write_behind_depth == 0:
+                self._last_flush = time.monotonic()
+            self._write_behind_depth += 1
+        try:
+            await self._run_batch(file_paths, progress_callback, results,
+                                  completed=len(skipped), total=total)
+        finally:
+            with self._write_lock:
+                self._write_behind_depth -= 1
+            await asyncio.to_thread(self._flush_now)
+        
+        return results
+    
+    def _prefilter_batch(self, file_paths: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Teilt einen Batch in zu analysierende und übersprungene Dateien (Format/Größe).
+        
+        Dateien, deren stat fehlschlägt, bleiben im Batch; analyze_track meldet den Fehler.
+        """
+        accepted, skipped = [], []
+        for file_path in file_paths:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                accepted.append(file_path)
+                continue
+            (accepted if self._quick_validate(file_path, st) else skipped).append(file_path)
+        return accepted, skipped
+    
+    async def _run_batch(self, file_paths: List[str], progress_callback: Optional[Callable],
+                         results: Dict[str, Dict], completed: int = 0,
+                         total: Optional[int] = None):
+        """Verteilt die Analyse sequenziell oder auf den Worker-Pool"""
+        if total is None:
+            total = len(file_paths)
         
         if not self.enable_multiprocessing or len(file_paths) < 2:
-            # Sequenzielle Verarbeitung
+            # Sequenzielle Verarbeitung (im Worker-Thread, damit der Event-Loop frei bleibt)
             for i, file_path in enumerate(file_paths):
                 try:
-                    results[file_path] = self.analyze_track(file_path)
+                    results[file_path] = await asyncio.to_thread(self.analyze_track, file_path)
                     if progress_callback:
-                        await progress_callback(i + 1, len(file_paths), file_path)
+                        await progress_callback(completed + i + 1, total, file_path)
                 except Exception as e:
                     logger.error(f"Fehler bei {file_path}: {e}")
                     results[file_path] = {
@@ -301,21 +937,30 @@ class AudioAnalyzer:
                         'errors': [str(e)]
                     }
         else:
-            # ThreadPool für Thread-sichere DB-Operationen
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = [executor.submit(self._analyze_track_safe, fp) for fp in file_paths]
-                batch_results = []
-                
-                # Sammle alle Ergebnisse
-                for fut in as_completed(futures):
-                    batch_results.append(fut.result())
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            in_process = self.executor_backend == 'process'
+            if in_process:
+                worker, worker_args = _analyze_track_in_process, (str(self.db_path), self._worker_kwargs())
+            else:
+                worker, worker_args = self._analyze_track_safe, ()
+            
+            futures = [loop.run_in_executor(executor, worker, fp, *worker_args) for fp in file_paths]
+            
+            # Ergebnisse einsammeln, ohne den Event-Loop zu blockieren
+            for i, fut in enumerate(asyncio.as_completed(futures)):
+                r = await fut
+                if in_process:
+                    # Cache-Schreibzugriffe der Worker gebündelt im Elternprozess ausführen
+                    r, pending_writes = r
+                    self._enqueue_writes(pending_writes)
                 
-                # DB-Schreiben NUR hier im Aufrufer (keine Connection in Threads teilen)  
-                for r in batch_results:
-                    db_insert_result(r)
-                    results[r.get('file_path', 'unknown')] = r
-        
-        return results
+                results[r.get('file_path', 'unknown')] = r
+                if progress_callback:
+                    await progress_callback(completed + i + 1, total, r.get('file_path', 'unknown'))
+            
+            # Kein zusätzlicher DB-Schreibvorgang hier: abgeschlossene Ergebnisse liegen im
+            # Write-Behind-Puffer und werden in analyze_batch_async gebündelt committet
     
     
     def _extract_time_series_features(self, y: np.ndarray, sr: int, 
@@ -332,63 +977,11 @@ class AudioAnalyzer:
         Returns:
             Liste von Zeitpunkten mit entsprechenden Feature-Werten
         """
-        duration = len(y) / sr
-        window_samples = int(window_seconds * sr)
-        hop_samples = window_samples  # Non-overlapping windows
-        
-        time_series_data = []
-        
         try:
-            # Iteriere über das Audio-Signal in Zeitfenstern
-            for start_sample in range(0, len(y), hop_samples):
-                end_sample = min(start_sample + window_samples, len(y))
-                
-                if end_sample - start_sample < window_samples // 2:
-                    # Skip zu kurze Segmente am Ende
-                    break
-                
-                # Zeitstempel für dieses Segment
-                timestamp = start_sample / sr
-                
-                # Audio-Segment extrahieren
-                segment = y[start_sample:end_sample]
-                
-                if len(segment) == 0:
-                    continue
-                
-                # Features für dieses Zeitfenster berechnen
-                time_point_features = {}
-                
-                # 1. Energie (RMS)
-                rms = librosa.feature.rms(y=segment)[0]
-                time_point_features['energy_value'] = float(np.mean(rms))
-                time_point_features['rms_energy'] = float(np.mean(rms))
-                
-                # 2. Spektrale Helligkeit (Centroid)
-                spectral_centroid = librosa.feature.spectral_centroid(y=segment, sr=sr)[0]
-                time_point_features['brightness_value'] = float(np.mean(spectral_centroid))
-                
-                # 3. Spektrale Rolloff (zusätzliche Information für Klangfarbe)
-                spectral_rolloff = librosa.feature.spectral_rolloff(y=segment, sr=sr)[0]
-                time_point_features['spectral_rolloff'] = float(np.mean(spectral_rolloff))
-                
-                # 4. Zeitstempel
-                time_point_features['timestamp'] = timestamp
-                
-                # Optional: Weitere Features für erweiterte Analyse
-                try:
-                    # Zero Crossing Rate (Indikator für Percussion vs. Tonal)
-                    zcr = librosa.feature.zero_crossing_rate(segment)[0]
-                    time_point_features['zero_crossing_rate'] = float(np.mean(zcr))
-                    
-                    # Spectral Bandwidth (Klangbreite)
-                    spectral_bandwidth = librosa.feature.spectral_bandwidth(y=segment, sr=sr)[0]
-                    time_point_features['spectral_bandwidth'] = float(np.mean(spectral_bandwidth))
-                    
-                except Exception as e:
-                    logger.debug(f"Could not extract additional time series features: {e}")
-                
-                time_series_data.append(time_point_features)
+            columns = self._extract_time_series_columns(y, sr, window_seconds)
+            # Zeilen-Dicts erst an der JSON/API-Grenze bauen (tolist → Python-floats, dann zip)
+            values = [columns[field].tolist() for field in TIME_SERIES_FIELDS]
+            time_series_data = [dict(zip(TIME_SERIES_FIELDS, row)) for row in zip(*values)]
             
             logger.debug(f"Extracted {len(time_series_data)} time series data points")
             return time_series_data
@@ -397,9 +990,72 @@ class AudioAnalyzer:
             logger.error(f"Error extracting time series features: {e}")
             return []
     
-    def get_analysis_stats(self) -> Dict[str, Any]:
-        """Gibt Analyse-Statistiken zurück"""
-        return self.analysis_stats.copy()
+    def _extract_time_series_columns(self, y: np.ndarray, sr: int,
+                                     window_seconds: float = 5.0) -> Dict[str, np.ndarray]:
+        """
+        Zeitreihen-Features spaltenweise (SoA): ein zusammenhängendes float32-Array pro Feld
+        aus TIME_SERIES_FIELDS (timestamp in float64), ein Eintrag pro Fenster.
+        """
+        # Nur für die Visualisierung: auf niedrigere Rate heruntertasten (Polyphasen-FIR)
+        if sr > TIME_SERIES_SAMPLE_RATE:
+            y = librosa.resample(y, orig_sr=sr, target_sr=TIME_SERIES_SAMPLE_RATE, res_type='polyphase')
+            sr = TIME_SERIES_SAMPLE_RATE
+        
+        window_samples = int(window_seconds * sr)
+        hop = TIME_SERIES_HOP_LENGTH
+        
+        # Fenster-Starts (nicht überlappend); zu kurze Segmente am Ende werden übersprungen
+        window_starts = np.arange(0, len(y), window_samples)
+        window_ends = np.minimum(window_starts + window_samples, len(y))
+        keep = (window_ends - window_starts) >= window_samples // 2
+        window_starts, window_ends = window_starts[keep], window_ends[keep]
+        
+        if len(window_starts) == 0:
+            return {field: np.empty(0, dtype=np.float32) for field in TIME_SERIES_FIELDS}
+        
+        # Frame-Features einmal für das ganze Signal (gemeinsames Frame-Raster, eine STFT)
+        y = np.ascontiguousarray(y, dtype=np.float32)
+        S = _magnitude_stft(y, TIME_SERIES_N_FFT, hop)
+        freqs = librosa.fft_frequencies(sr=sr, n_fft=TIME_SERIES_N_FFT)
+        
+        # Centroid/Bandbreite (p=2) als Matrixprodukte über die Frequenzachse statt
+        # librosa-Temporärarrays in Spektrogrammgröße
+        magnitude = np.maximum(S.sum(axis=0), np.finfo(S.dtype).tiny)
+        centroid = (freqs.astype(S.dtype) @ S) / magnitude
+        bandwidth = np.sqrt(np.maximum((freqs.astype(S.dtype) ** 2 @ S) / magnitude - centroid ** 2, 0.0))
+        
+        frame_features = np.vstack([
+            centroid,
+            librosa.feature.spectral_rolloff(S=S, sr=sr, freq=freqs)[0],
+            bandwidth,
+        ])
+        
+        # Fenster-Mittelwerte als eine Reduktion über die Frame-Grenzen der Fenster
+        frame_starts = window_starts // hop
+        frame_ends = np.maximum(frame_starts + 1, window_ends // hop)
+        frame_ends[:-1] = frame_starts[1:]
+        last_frame = min(int(frame_ends[-1]), frame_features.shape[1])
+        window_sums = np.add.reduceat(frame_features[:, :last_frame], frame_starts, axis=1)
+        frame_counts = np.maximum(np.minimum(frame_ends, last_frame) - frame_starts, 1)
+        centroid, rolloff, bandwidth = window_sums / frame_counts
+        
+        # RMS und ZCR direkt über die Samples jedes Fensters (ein fusionierter Durchlauf über y)
+        rms, zcr = _rms_zcr_per_window(y, window_starts.astype(np.int64), window_ends.astype(np.int64))
+        
+        rms = rms.astype(np.float32)
+        return {
+            'energy_value': rms,
+            'rms_energy': rms,
+            'brightness_value': centroid.astype(np.float32),
+            'spectral_rolloff': rolloff.astype(np.float32),
+            'timestamp': window_starts / sr,
+            'zero_crossing_rate': zcr.astype(np.float32),
+            'spectral_bandwidth': bandwidth.astype(np.float32),
+        }
+    
+    def get_analysis_stats(self) -> Mapping[str, Any]:
+        """Gibt Analyse-Statistiken als schreibgeschützte Live-Ansicht zurück (ohne Kopie)"""
+        return MappingProxyType(self.analysis_stats)
     
     def clear_cache(self) -> int:
         """Leert die Analyse-Datenbank"""
@@ -1,75 +1,582 @@
 """Feature Extractor - Modulare Audio-Feature-Extraktion"""
 
 import logging
+import math
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 import numpy as np
-from typing import Dict, Any, Optional, Tuple, List
+import scipy.fft
+from typing import Dict, Any, Optional, Tuple, List, Set
 import librosa
 from mutagen import File as MutagenFile
 import os
 from pathlib import Path
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Länge des mittleren Ausschnitts für Tonart-/Modus-Erkennung (statistisch ausreichend)
+KEY_EXCERPT_SECONDS = 60.0
+
+# Version der Feature-Berechnung; bei Änderungen an den Features erhöhen, damit der
+# Analyse-Cache (Inhalts-Fingerprint + Version) alte Ergebnisse nicht mehr liefert
+FEATURE_EXTRACTOR_VERSION = '3'
+
+# Frame-Größe für Essentia-Spektralalgorithmen (MFCC erwartet frameSize/2+1 Bins)
+ESSENTIA_FRAME_SIZE = 2048
+
+# Essentia nur nachrechnen, wenn das librosa-Ergebnis unter diesen Schwellen bleibt
+ESSENTIA_SKIP_THRESHOLDS = {
+    'beat_regularity': 0.8,  # RhythmExtractor2013 überspringen bei regelmäßigem Beat-Raster
+    'key_confidence': 0.9,   # KeyExtractor überspringen bei eindeutigem Chroma-Maximum
+}
+
+# RhythmExtractor2013 ist auf sehr kurzen Clips instabil; darunter nur librosa-Beats
+ESSENTIA_RHYTHM_MIN_SECONDS = 6.0
+
+# Signale mit kleinerem Spitzenpegel (-80 dBFS) gelten als still und werden nicht analysiert
+SILENCE_PEAK_THRESHOLD = 1e-4
+
+# Rhythmus, Chroma/Tonart, Energie und Perceptual-Features brauchen nicht mehr als 11 kHz Bandbreite
+ANALYSIS_SAMPLE_RATE = 22050
+
+# Essentia-Algorithmen (RhythmExtractor2013, KeyExtractor, ...) erwarten 44.1 kHz
+ESSENTIA_SAMPLE_RATE = 44100
+
+# Gemeinsames STFT-Raster aller librosa-Spektralfeatures (librosa-Standardwerte)
+STFT_N_FFT = 2048
+STFT_HOP_LENGTH = 512
+
+# Mel-Bänder und MFCC-Koeffizienten (librosa-Standardwerte)
+N_MELS = 128
+N_MFCC = 13
+
+# Tracks pro torchlibrosa-Batch auf der GPU (begrenzt den Speicher des gepaddeten (B, T)-Tensors)
+GPU_BATCH_SIZE = 16
+
+KEY_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+
+# Chroma-Bins, explizit an chroma_stft übergeben: chroma_mean hat damit immer 12 Einträge
+N_CHROMA = len(KEY_NAMES)
+
+# Krumhansl-Schmuckler-Tonartprofile (Grundton C)
+MAJOR_PROFILE = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
+MINOR_PROFILE = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
+
+# Camelot Wheel mapping (Tonart -> Camelot-Code)
+CAMELOT_WHEEL = {
+    'C': '8B', 'G': '9B', 'D': '10B', 'A': '11B', 'E': '12B', 'B': '1B',
+    'F#': '2B', 'C#': '3B', 'G#': '4B', 'D#': '5B', 'A#': '6B', 'F': '7B',
+    'Am': '8A', 'Em': '9A', 'Bm': '10A', 'F#m': '11A', 'C#m': '12A', 'G#m': '1A',
+    'D#m': '2A', 'A#m': '3A', 'Fm': '4A', 'Cm': '5A', 'Gm': '6A', 'Dm': '7A'
+}
+
+# ID3-Frames für extract_metadata (ein Durchlauf über audio_file.tags) und Defaults ohne Tag;
+# ein fehlender Titel fällt auf den Dateinamen ohne Endung zurück
+ID3_METADATA_TAGS = (('title', 'TIT2'), ('artist', 'TPE1'), ('album', 'TALB'),
+                     ('genre', 'TCON'), ('year', 'TDRC'))
+METADATA_TAG_DEFAULTS = {'artist': 'Unknown', 'album': 'Unknown', 'genre': 'Unknown', 'year': None}
+
+def _camelot_neighbours(number: int, letter: str) -> Tuple[str, ...]:
+    """Relative Dur/Moll-Tonart plus ±1 im Quintenzirkel"""
+    # Gleiche Nummer, andere Modalität (relative Dur/Moll)
+    relative = f"{number}B" if letter == 'A' else f"{number}A"
+    # +1 und -1 (Quintenzirkel)
+    next_num = (number % 12) + 1
+    prev_num = ((number - 2) % 12) + 1
+    return (relative, f"{next_num}{letter}", f"{prev_num}{letter}")
+
+# Kompatible Camelot-Keys, einmalig beim Import vorberechnet (Lookup pro Track)
+_CAMELOT_COMPAT = {
+    f"{number}{letter}": _camelot_neighbours(number, letter)
+    for number in range(1, 13) for letter in ('A', 'B')
+}
+
+def _zscore_rows(m: np.ndarray) -> np.ndarray:
+    return (m - m.mean(axis=-1, keepdims=True)) / m.std(axis=-1, keepdims=True)
+
+# Alle 24 Tonarten (Zeilen 0-11: Dur C..B, 12-23: Moll C..B), einmalig standardisiert
+_KEY_PROFILES_Z = _zscore_rows(np.vstack(
+    [np.roll(MAJOR_PROFILE, i) for i in range(12)] + [np.roll(MINOR_PROFILE, i) for i in range(12)]
+))
+
+# Von allen Instanzen und Threads geteilt: versehentliches Überschreiben verhindern
+for _table in (MAJOR_PROFILE, MINOR_PROFILE, _KEY_PROFILES_Z):
+    _table.setflags(write=False)
+
+# Zeilen in _KEY_PROFILES_Z der unverschobenen Profile (C-Dur, C-Moll)
+C_MAJOR_ROW, C_MINOR_ROW = 0, 12
+
+def key_profile_correlations(chroma_mean: np.ndarray, rows=None) -> np.ndarray:
+    """
+    Pearson-Korrelation von chroma_mean mit allen 24 Tonartprofilen in einem Matrixprodukt.
+    
+    Entspricht np.corrcoef(chroma_mean, profil)[0, 1] je Profil; NaN bei konstantem Chroma.
+    Mit rows (Index oder Indexliste) werden nur diese Profile korreliert.
+    """
+    profiles = _KEY_PROFILES_Z if rows is None else _KEY_PROFILES_Z[rows]
+    x = np.asarray(chroma_mean, dtype=np.float64)
+    std = x.std()
+    if x.shape != (12,) or std == 0:
+        return np.full(profiles.shape[:-1], np.nan)
+    # Profilzeilen sind mittelwertfrei: p·(x - mean) = p·x, x muss nicht zentriert werden
+    return (profiles @ x) / (12 * std)
+
+def _stats1d_numpy(x: np.ndarray) -> Tuple[float, float, float, float]:
+    """(mean, var, min, max) eines Arrays (NumPy-Fallback, mehrere Durchläufe; NaN wenn leer)"""
+    x = np.ravel(x)
+    if x.size == 0:
+        return (np.nan,) * 4
+    # Mittelwert nur einmal reduzieren (np.var würde ihn erneut berechnen)
+    mean = x.mean(dtype=np.float64)
+    centered = x - mean
+    var = np.dot(centered, centered) / x.size
+    return mean.item(), float(var), x.min().item(), x.max().item()
+
+# Kein cache=True: das Modul wird als backend.core_engine... (Tests) und core_engine... (App)
+# importiert, ein On-Disk-Cache des einen Namens ist unter dem anderen nicht ladbar
+if NUMBA_AVAILABLE:
+    @njit(fastmath=True)
+    def _stats1d_kernel(x):
+        """Welford: Mittelwert, Varianz (ddof=0), Minimum und Maximum in einem Durchlauf"""
+        mean = 0.0
+        m2 = 0.0
+        lo = x[0]
+        hi = x[0]
+        for i in range(x.size):
+            v = x[i]
+            delta = v - mean
+            mean += delta / (i + 1)
+            m2 += delta * (v - mean)
+            if v < lo:
+                lo = v
+            if v > hi:
+                hi = v
+        return mean, m2 / x.size, lo, hi
+    
+    def stats1d(x: np.ndarray) -> Tuple[float, float, float, float]:
+        """(mean, var, min, max) eines Arrays in einem fusionierten Durchlauf (NaN wenn leer)"""
+        x = np.ravel(x)
+        if x.size == 0:
+            return (np.nan,) * 4
+        try:
+            mean, var, lo, hi = _stats1d_kernel(x)
+        except Exception as e:
+            # Laufzeitfehler des Dispatchers (z.B. neue Signatur) nicht als Feature-Ausfall durchreichen
+            logger.debug(f"numba-Kernel fehlgeschlagen, nutze NumPy: {e}")
+            return _stats1d_numpy(x)
+        return float(mean), float(var), float(lo), float(hi)
+    
+    # JIT beim Import für float32 und float64 aufwärmen, damit die erste Analyse keine Kompilierzeit zahlt
+    try:
+        for _dtype in (np.float32, np.float64):
+            _stats1d_kernel(np.zeros(2, dtype=_dtype))
+    except Exception as e:
+        logger.debug(f"numba-Kernel nicht verfügbar, nutze NumPy: {e}")
+        NUMBA_AVAILABLE = False
+        stats1d = _stats1d_numpy
+else:
+    stats1d = _stats1d_numpy
+
+def _best_key_row_numpy(chroma_mean: np.ndarray) -> int:
+    """Zeile in _KEY_PROFILES_Z der besten Tonart (0-11 Dur, 12-23 Moll; 12 = Cm bei konstantem Chroma)"""
+    correlations = key_profile_correlations(chroma_mean)
+    max_major_idx = int(np.argmax(correlations[:12]))
+    max_minor_idx = int(np.argmax(correlations[12:]))
+    # NaN-Werte in 0 umwandeln, um Vergleich zu ermöglichen
+    if np.nan_to_num(correlations[max_major_idx]) > np.nan_to_num(correlations[12 + max_minor_idx]):
+        return max_major_idx
+    return 12 + max_minor_idx
+
+if NUMBA_AVAILABLE:
+    @njit  # ohne fastmath: der NaN-/Nullvarianz-Fall muss erkannt werden; ohne cache=True (s.o.)
+    def _best_key_row_kernel(x, profiles_z):
+        """Krumhansl-Schmuckler in einem Aufruf: z-Score von x und 24 Skalarprodukte, bestes Profil"""
+        n = x.size
+        mean = 0.0
+        for i in range(n):
+            mean += x[i]
+        mean /= n
+        var = 0.0
+        for i in range(n):
+            d = x[i] - mean
+            var += d * d
+        std = np.sqrt(var / n)
+        if not std > 0:
+            return 12
+        
+        best_major, best_minor = 0, 12
+        best_major_corr, best_minor_corr = -np.inf, -np.inf
+        for r in range(profiles_z.shape[0]):
+            acc = 0.0
+            for i in range(n):
+                acc += profiles_z[r, i] * x[i]  # Profilzeilen mittelwertfrei
+            corr = acc / (std * n)
+            if r < 12:
+                if corr > best_major_corr:
+                    best_major, best_major_corr = r, corr
+            elif corr > best_minor_corr:
+                best_minor, best_minor_corr = r, corr
+        return best_major if best_major_corr > best_minor_corr else best_minor
+    
+    def best_key_row(chroma_mean: np.ndarray) -> int:
+        """Zeile in _KEY_PROFILES_Z der besten Tonart (0-11 Dur, 12-23 Moll; 12 = Cm bei konstantem Chroma)"""
+        x = np.asarray(chroma_mean, dtype=np.float64)
+        if x.shape != (12,):
+            return _best_key_row_numpy(x)
+        try:
+            return int(_best_key_row_kernel(x, _KEY_PROFILES_Z))
+        except Exception as e:
+            logger.debug(f"numba-Kernel fehlgeschlagen, nutze NumPy: {e}")
+            return _best_key_row_numpy(x)
+    
+    # JIT beim Import aufwärmen
+    try:
+        best_key_row(np.arange(12, dtype=np.float64))
+    except Exception as e:
+        logger.debug(f"numba-Kernel nicht verfügbar, nutze NumPy: {e}")
+        best_key_row = _best_key_row_numpy
+else:
+    best_key_row = _best_key_row_numpy
+
+def get_center_excerpt(y: np.ndarray, sr: int, seconds: float = KEY_EXCERPT_SECONDS) -> np.ndarray:
+    """Gibt einen zentrierten Ausschnitt von `seconds` Länge zurück (kürzere Signale unverändert)"""
+    excerpt_samples = int(seconds * sr)
+    if excerpt_samples <= 0 or len(y) <= excerpt_samples:
+        return y
+    start = (len(y) - excerpt_samples) // 2
+    return y[start:start + excerpt_samples]
+
+def frame_rms(y: np.ndarray, frame_length: int = STFT_N_FFT,
+              hop_length: int = STFT_HOP_LENGTH) -> np.ndarray:
+    """
+    RMS pro Frame wie librosa.feature.rms(center=True, pad_mode='constant'), Form (..., 1, n_frames).
+    
+    Die Frame-Leistungen kommen als Differenzen einer kumulativen Quadratsumme: ein Durchlauf
+    über y statt einer (frame_length x n_frames)-Kopie aller Frames.
+    """
+    y = np.asarray(y)
+    n = y.shape[-1]
+    pad = frame_length // 2
+    n_frames = 1 + (n + 2 * pad - frame_length) // hop_length
+    
+    # csum[..., k] = Summe der Quadrate der ersten k Samples des mit Nullen gepaddeten Signals
+    csum = np.zeros(y.shape[:-1] + (n + 2 * pad + 1,), dtype=np.float64)
+    np.cumsum(np.square(y, dtype=np.float64), axis=-1, out=csum[..., pad + 1:pad + 1 + n])
+    csum[..., pad + 1 + n:] = csum[..., pad + n:pad + n + 1]
+    
+    starts = np.arange(n_frames) * hop_length
+    power = (csum[..., starts + frame_length] - csum[..., starts]) / frame_length
+    # Rundungsfehler der Differenz können in Stille minimal negativ werden
+    rms = np.sqrt(np.maximum(power, 0.0))
+    dtype = y.dtype if np.issubdtype(y.dtype, np.floating) else np.float32
+    return rms.astype(dtype, copy=False)[..., None, :]
+
+def frame_zcr(y: np.ndarray, frame_length: int = STFT_N_FFT,
+              hop_length: int = STFT_HOP_LENGTH) -> np.ndarray:
+    """
+    Zero-Crossing-Rate pro Frame wie librosa.feature.zero_crossing_rate(center=True), Form (..., 1, n_frames).
+    
+    Nulldurchgänge werden einmal über y bestimmt und per kumulativer Summe je Frame gezählt,
+    statt eine boolesche (frame_length x n_frames)-Matrix zu bilden. Das Edge-Padding erzeugt
+    keine Nulldurchgänge und wird daher nur in den Indizes berücksichtigt.
+    """
+    y = np.asarray(y)
+    n = y.shape[-1]
+    pad = frame_length // 2
+    n_frames = 1 + (n + 2 * pad - frame_length) // hop_length
+    
+    # Wie librosa.zero_crossings(threshold=1e-10, zero_pos=True): |x| <= 1e-10 zählt als positiv
+    negative = y < -1e-10
+    # csum[..., k] = Anzahl der Nulldurchgänge an gepaddeten Positionen j < k
+    csum = np.zeros(y.shape[:-1] + (n + 2 * pad + 1,), dtype=np.int64)
+    np.cumsum(negative[..., 1:] != negative[..., :-1], axis=-1, out=csum[..., pad + 2:pad + n + 1])
+    csum[..., pad + n + 1:] = csum[..., pad + n:pad + n + 1]
+    
+    # Der erste Wert eines Frames hat keinen Vorgänger im Frame (librosa: pad=False)
+    starts = np.arange(n_frames) * hop_length
+    crossings = csum[..., starts + frame_length] - csum[..., starts + 1]
+    return (crossings / frame_length)[..., None, :]
+
+@lru_cache(maxsize=8)
+def mel_basis(sr: int, n_fft: int = STFT_N_FFT, n_mels: int = N_MELS) -> np.ndarray:
+    """Mel-Filterbank (n_mels, 1 + n_fft // 2) je Samplerate, einmal gebaut und read-only geteilt"""
+    basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)
+    basis.setflags(write=False)
+    return basis
+
+@lru_cache(maxsize=4)
+def _hann_window(n_fft: int, dtype: str) -> np.ndarray:
+    """Periodisches Hann-Fenster (wie librosa.stft), einmal pro Länge/dtype gebaut"""
+    window = librosa.filters.get_window('hann', n_fft, fftbins=True).astype(dtype)
+    window.setflags(write=False)
+    return window
+
+def batch_stft_mag(signals: List[np.ndarray], n_fft: int = STFT_N_FFT,
+                   hop_length: int = STFT_HOP_LENGTH, workers: int = -1) -> List[np.ndarray]:
+    """
+    Betragsspektrogramme wie np.abs(librosa.stft(y)) für mehrere Signale in einem rfft-Aufruf
+    
+    Jedes Signal wird einzeln zentriert gepaddet und gerahmt (kein Padding auf eine gemeinsame
+    Länge, die Frames bleiben identisch); alle Frames liegen zeilenweise in einem
+    (sum(n_frames), n_fft)-Block, der einmal gefenstert und mit workers Threads transformiert wird.
+    Rückgabe je Signal als (1 + n_fft // 2, n_frames)-Sicht. Alle Signale müssen denselben dtype
+    haben und dürfen nicht leer sein.
+    """
+    frames = [librosa.util.frame(np.pad(y, n_fft // 2, mode='constant'), frame_length=n_fft,
+                                 hop_length=hop_length, axis=0) for y in signals]
+    stacked = np.concatenate(frames)
+    stacked *= _hann_window(n_fft, stacked.dtype.str)
+    S = np.abs(scipy.fft.rfft(stacked, axis=-1, workers=workers, overwrite_x=True))
+    splits = np.cumsum([len(f) for f in frames[:-1]])
+    return [part.T for part in np.split(S, splits)]
+
+def _as_float32(y: np.ndarray) -> np.ndarray:
+    """Zusammenhängende float32-Sicht für Essentia (keine Kopie, wenn y bereits passt)"""
+    return np.ascontiguousarray(y, dtype=np.float32)
+
+@dataclass(eq=False)
+class _AnalysisContext:
+    """
+    Gemeinsame Zwischenergebnisse eines Signals für alle Feature-Gruppen.
+    
+    Jedes Zwischenergebnis wird beim ersten Zugriff einmal berechnet; extract_all_features
+    reicht denselben Kontext an alle extract_*-Methoden weiter.
+    """
+    y: np.ndarray
+    sr: int
+    # Kontext des Originalsignals, falls y eine heruntergetastete Kopie ist
+    source: Optional['_AnalysisContext'] = None
+    # Log-Mel/MFCC aus einem GPU-Batch-Lauf (extract_all_features_batch), sonst pro Track berechnet
+    gpu_features: Optional[Dict[str, np.ndarray]] = None
+    
+    @cached_property
+    def essentia_audio(self) -> np.ndarray:
+        """Signal als float32 mit 44.1 kHz für Essentia (vom Originalsignal, falls vorhanden)"""
+        if self.source is not None:
+            return self.source.essentia_audio
+        if self.sr == ESSENTIA_SAMPLE_RATE:
+            return _as_float32(self.y)
+        return _as_float32(librosa.resample(self.y, orig_sr=self.sr, target_sr=ESSENTIA_SAMPLE_RATE,
+                                            res_type='polyphase'))
+    
+    @cached_property
+    def stft_mag(self) -> np.ndarray:
+        """Betrags-STFT (n_fft=2048, hop=512, center=True)"""
+        return np.abs(librosa.stft(self.y, n_fft=STFT_N_FFT, hop_length=STFT_HOP_LENGTH))
+    
+    @cached_property
+    def stft_power(self) -> np.ndarray:
+        """Leistungsspektrum |STFT|², einmal quadriert für Chroma und Mel-Spektrogramm"""
+        return np.square(self.stft_mag)
+    
+    @cached_property
+    def rms(self) -> np.ndarray:
+        """Zeitbereichs-RMS pro Frame (gleiches Frame-Raster wie die STFT)"""
+        return frame_rms(self.y)
+    
+    @cached_property
+    def rms_stats(self) -> Tuple[float, float, float, float]:
+        """(mean, var, min, max) der RMS-Frames, geteilt von Energie- und Perceptual-Features"""
+        return stats1d(self.rms)
+    
+    @cached_property
+    def chroma(self) -> np.ndarray:
+        """Chromagramm aus dem Leistungsspektrum der gemeinsamen STFT"""
+        return librosa.feature.chroma_stft(S=self.stft_power, sr=self.sr, n_chroma=N_CHROMA)
+    
+    def center_chroma(self, seconds: float = KEY_EXCERPT_SECONDS) -> np.ndarray:
+        """Chroma-Frames des zentrierten Ausschnitts (wie get_center_excerpt, ohne neue STFT)"""
+        excerpt_samples = int(seconds * self.sr)
+        if excerpt_samples <= 0 or len(self.y) <= excerpt_samples:
+            return self.chroma
+        start_frame = ((len(self.y) - excerpt_samples) // 2) // STFT_HOP_LENGTH
+        n_frames = excerpt_samples // STFT_HOP_LENGTH + 1
+        return self.chroma[:, start_frame:start_frame + n_frames]
+    
+    @cached_property
+    def center_chroma_mean(self) -> np.ndarray:
+        """Mittleres Chroma-Profil des zentrierten Ausschnitts (für Tonart und Modus geteilt)"""
+        chroma = self.center_chroma()
+        return np.mean(chroma, axis=1) if chroma.ndim > 1 else chroma
+    
+    @cached_property
+    def mel_db(self) -> np.ndarray:
+        """Log-Mel-Spektrogramm (dB) aus der gemeinsamen STFT: Basis für MFCC und Onsets"""
+        # Vorberechnete Filterbank statt melspectrogram, das sie bei jedem Aufruf neu baut
+        return librosa.power_to_db(mel_basis(self.sr) @ self.stft_power)
+    
+    @cached_property
+    def onset_env(self) -> np.ndarray:
+        """Onset-Hüllkurve für das Beat-Tracking (wie onset_strength(y=...), ohne eigene STFT)"""
+        return librosa.onset.onset_strength(S=self.mel_db, sr=self.sr, hop_length=STFT_HOP_LENGTH)
+    
+    @cached_property
+    def _beat_track(self) -> Tuple[float, np.ndarray]:
+        tempo, beats = librosa.beat.beat_track(onset_envelope=self.onset_env, sr=self.sr,
+                                               hop_length=STFT_HOP_LENGTH)
+        # librosa >= 0.10 liefert das Tempo als 1-Element-Array
+        return float(np.atleast_1d(tempo)[0]), beats
+    
+    def warm(self, include_essentia: bool = False) -> None:
+        """
+        Berechnet alle gemeinsamen Zwischenergebnisse sofort (vor parallelem Lesezugriff).
+        
+        include_essentia: auch das 44.1-kHz-Signal vorbereiten, das mehrere Essentia-Gruppen lesen.
+        Fehler werden hier ignoriert; sie treten beim Zugriff in der jeweiligen Feature-Gruppe
+        erneut auf und werden dort behandelt.
+        """
+        names = ('chroma', 'center_chroma_mean', 'rms_stats', 'mel_db', '_beat_track')
+        for name in names + (('essentia_audio',) if include_essentia else ()):
+            try:
+                getattr(self, name)
+            except Exception:
+                pass
+    
+    @property
+    def tempo(self) -> float:
+        return self._beat_track[0]
+    
+    @property
+    def beats(self) -> np.ndarray:
+        return self._beat_track[1]
+
+def _get_context(y: np.ndarray, sr: int, ctx: Optional[_AnalysisContext]) -> _AnalysisContext:
+    """Übergebenen Kontext verwenden, wenn er zu y/sr gehört, sonst einen neuen (float32) anlegen"""
+    if ctx is not None and ctx.y is y and ctx.sr == sr:
+        return ctx
+    return _AnalysisContext(_as_float32(y), sr)
+
+def _batched_contexts(signals: List[np.ndarray], sr: int) -> List[_AnalysisContext]:
+    """
+    Analyse-Kontexte für mehrere Signale mit einer gemeinsamen STFT über alle Tracks.
+    
+    Die Frames aller nicht-leeren Signale laufen durch einen rfft-Aufruf (batch_stft_mag), auch bei
+    unterschiedlichen Längen, da jedes Signal für sich gerahmt wird. Für RMS werden nur gleich
+    lange Signale zu (N, samples) gestapelt; gepaddet oder gekürzt wird nie, da das die Features
+    verändern würde.
+    """
+    contexts = [_AnalysisContext(y, sr) for y in signals]
+    # cached_property liest aus __dict__: vorbelegte Werte ersetzen die Einzelberechnung
+    indices = [i for i, y in enumerate(signals) if len(y)]
+    if len(indices) > 1:
+        for i, S in zip(indices, batch_stft_mag([signals[i] for i in indices])):
+            contexts[i].__dict__['stft_mag'] = S
+    
+    groups: Dict[int, List[int]] = {}
+    for i in indices:
+        groups.setdefault(len(signals[i]), []).append(i)
+    
+    for same_length in groups.values():
+        if len(same_length) < 2:
+            continue
+        R = frame_rms(np.stack([signals[i] for i in same_length]))
+        for row, i in enumerate(same_length):
+            contexts[i].__dict__['rms'] = R[row]
+    return contexts
+
+# Read-only Vorlagen für Default-, Stille- und Fallback-Ergebnisse; die get_*-Funktionen
+# liefern flache Kopien, damit Aufrufer die Ergebnisse weiter befüllen können
+_SAFE_DEFAULTS = MappingProxyType({
+    'bpm': 120.0,
+    'key': 'Unknown',
+    'camelot': '1A',
+    'key_confidence': 0.0,
+    'energy': 0.5,
+    'valence': 0.5,
+    'danceability': 0.5,
+    'acousticness': 0.5,
+    'instrumentalness': 0.5,
+    'loudness': -20.0,
+    'spectral_centroid': 2000.0,
+    'zero_crossing_rate': 0.1,
+    'mfcc_variance': 0.5,
+    'tempo_confidence': 0.0,
+    'rhythm_strength': 0.5
+})
+
+_SILENT_FEATURES = MappingProxyType({
+    **_SAFE_DEFAULTS,
+    'silent': True,
+    'bpm': 0.0,
+    'beat_count': 0,
+    'energy': 0.0,
+    'energy_variance': 0.0,
+    'dynamic_range': 0.0,
+    'valence': 0.0,
+    'danceability': 0.0,
+    'loudness': -60.0,
+    'spectral_centroid': 0.0,
+    'zero_crossing_rate': 0.0,
+    'mfcc_variance': 0.0,
+    'rhythm_strength': 0.0
+})
+
+_FALLBACK_METADATA = MappingProxyType({
+    'title': 'Unknown',
+    'artist': 'Unknown Artist',
+    'album': 'Unknown',
+    'duration': 180.0,
+    'file_size': 0,
+    'format': 'unknown',
+})
+
+_FALLBACK_CAMELOT = MappingProxyType({
+    'key': 'Unknown',
+    'camelot': '1A',
+    'key_confidence': 0.0,
+})
+_FALLBACK_COMPATIBLE_KEYS = ('1A', '12A', '2A')
+
+_FALLBACK_MOOD_SCORES = MappingProxyType({
+    'energetic': 0.0,
+    'happy': 0.0,
+    'calm': 0.0,
+    'melancholic': 0.0,
+    'aggressive': 0.0,
+    'neutral': 1.0
+})
+
+_FALLBACK_DERIVED_METRICS = MappingProxyType({
+    'energy_level': 'medium',
+    'bpm_category': 'medium',
+    'estimated_mood': 'neutral',
+    'danceability_level': 'medium'
+})
+
 def get_safe_defaults() -> Dict[str, Any]:
     """Sichere Default-Werte für Feature-Extraktion"""
-    return {
-        'bpm': 120.0,
-        'key': 'Unknown',
-        'camelot': '1A',
-        'key_confidence': 0.0,
-        'energy': 0.5,
-        'valence': 0.5,
-        'danceability': 0.5,
-        'acousticness': 0.5,
-        'instrumentalness': 0.5,
-        'loudness': -20.0,
-        'spectral_centroid': 2000.0,
-        'zero_crossing_rate': 0.1,
-        'mfcc_variance': 0.5,
-        'tempo_confidence': 0.0,
-        'rhythm_strength': 0.5
-    }
+    return dict(_SAFE_DEFAULTS)
+
+def get_silent_features() -> Dict[str, Any]:
+    """Feature-Satz für stille/nahezu stille Signale (ohne STFT, Chroma oder Beat-Tracking)"""
+    return dict(_SILENT_FEATURES)
 
 def get_fallback_analysis(file_path: str = "unknown") -> Dict[str, Any]:
     """Vollständige Fallback-Analyse für fehlgeschlagene Dateien"""
-    import time
     return {
         'file_path': file_path,
         'filename': os.path.basename(file_path) if file_path != "unknown" else "unknown",
-        'features': get_safe_defaults(),
-        'metadata': {
-            'title': 'Unknown',
-            'artist': 'Unknown Artist',
-            'album': 'Unknown',
-            'duration': 180.0,
-            'file_size': 0,
-            'format': 'unknown',
-            'analyzed_at': time.time()
-        },
-        'camelot': {
-            'key': 'Unknown',
-            'camelot': '1A',
-            'key_confidence': 0.0,
-            'compatible_keys': ['1A', '12A', '2A']
-        },
+        'features': dict(_SAFE_DEFAULTS),
+        'metadata': {**_FALLBACK_METADATA, 'analyzed_at': time.time()},
+        'camelot': {**_FALLBACK_CAMELOT, 'compatible_keys': list(_FALLBACK_COMPATIBLE_KEYS)},
         'mood': {
             'primary_mood': 'neutral',
             'confidence': 0.0,
-            'scores': {
-                'energetic': 0.0,
-                'happy': 0.0,
-                'calm': 0.0,
-                'melancholic': 0.0,
-                'aggressive': 0.0,
-                'neutral': 1.0
-            }
-        },
-        'derived_metrics': {
-            'energy_level': 'medium',
-            'bpm_category': 'medium',
-            'estimated_mood': 'neutral',
-            'danceability_level': 'medium'
+            'scores': dict(_FALLBACK_MOOD_SCORES)
         },
+        'derived_metrics': dict(_FALLBACK_DERIVED_METRICS),
         'status': 'fallback',
         'errors': ['Analysis failed - using fallback values'],
         'version': '2.0'
@@ -77,7 +584,6 @@ def get_fallback_analysis(file_path: str = "unknown") -> Dict[str, Any]:
 
 def safe_analyze_audio_file(file_path: str) -> Dict[str, Any]:
     """Ultimativ sichere Audio-Analyse mit Fallback"""
-    import time
     
     # File validation
     if not Path(file_path).is_file():
@@ -105,238 +611,339 @@ def safe_analyze_audio_file(file_path: str) -> Dict[str, Any]:
 
 # Optionales Essentia-Import
 try:
-    import essentia
     import essentia.standard as es
     ESSENTIA_AVAILABLE = True
 except ImportError:
     ESSENTIA_AVAILABLE = False
 
+# Optionaler GPU-Pfad (torch + torchlibrosa) für STFT/Mel/MFCC
+try:
+    import torch
+    from torchlibrosa.stft import Spectrogram, LogmelFilterBank
+    TORCHLIBROSA_AVAILABLE = True
+except ImportError:
+    TORCHLIBROSA_AVAILABLE = False
+
 
 class FeatureExtractor:
     """Modulare Klasse für Audio-Feature-Extraktion"""
     
-    def __init__(self, use_essentia: bool = True):
+    # Feature-Gruppen in Merge-Reihenfolge: (Name, Methode, braucht volle Samplerate);
+    # nur die Spektralfeatures (Centroid, Rolloff, Bandbreite) nutzen das obere Frequenzband
+    FEATURE_GROUPS = (
+        ('Rhythm', 'extract_rhythm_features', False),
+        ('Tonal', 'extract_tonal_features', False),
+        ('Spectral', 'extract_spectral_features', True),
+        ('Energy', 'extract_energy_features', False),
+        ('Perceptual', 'extract_perceptual_features', False),
+    )
+    
+    def __init__(self, use_essentia: bool = True, use_gpu: bool = True, feature_workers: int = 1):
         self.use_essentia = use_essentia and ESSENTIA_AVAILABLE
         
+        # Feature-Gruppen pro Track parallel rechnen (librosa/NumPy geben den GIL frei);
+        # Standard 1, da Batches bereits über Worker-Prozesse parallelisiert werden
+        self.feature_workers = max(1, int(feature_workers))
+        self._group_executor = None
+        
+        # GPU-Backend nur wenn torchlibrosa installiert und CUDA verfügbar ist
+        self.device = 'cuda' if use_gpu and TORCHLIBROSA_AVAILABLE and torch.cuda.is_available() else None
+        self._torch_frontends = {}
+        if self.device:
+            logger.info("FeatureExtractor nutzt torchlibrosa auf CUDA für STFT/Mel/MFCC")
+        
+        # Essentia-Algorithmen sind zustandsbehaftet: Aufrufe aus Worker-Threads serialisieren
+        self._essentia_lock = threading.Lock()
+        self.essentia_skip_thresholds = dict(ESSENTIA_SKIP_THRESHOLDS)
         if self.use_essentia:
-            self._init_essentia_algorithms()
-            logger.info("FeatureExtractor mit Essentia initialisiert")
+            logger.info("FeatureExtractor mit Essentia initialisiert (Algorithmen lazy)")
         else:
             logger.info("FeatureExtractor nur mit librosa initialisiert")
         
-        # Camelot Wheel mapping
-        self.camelot_wheel = {
-            'C': '8B', 'G': '9B', 'D': '10B', 'A': '11B', 'E': '12B', 'B': '1B',
-            'F#': '2B', 'C#': '3B', 'G#': '4B', 'D#': '5B', 'A#': '6B', 'F': '7B',
-            'Am': '8A', 'Em': '9A', 'Bm': '10A', 'F#m': '11A', 'C#m': '12A', 'G#m': '1A',
-            'D#m': '2A', 'A#m': '3A', 'Fm': '4A', 'Cm': '5A', 'Gm': '6A', 'Dm': '7A'
-        }
-    
-    def _init_essentia_algorithms(self):
-        """Initialisiert Essentia-Algorithmen"""
-        try:
-            # Rhythm-Algorithmen
-            self.rhythm_extractor = es.RhythmExtractor2013(method="multifeature")
-            self.onset_rate = es.OnsetRate()
-            
-            # Tonal-Algorithmen
-            self.key_extractor = es.KeyExtractor()
-            
-            # Spectral-Algorithmen
-            self.spectral_centroid = es.SpectralCentroid()
-            self.spectral_rolloff = es.SpectralRollOff()
-            self.mfcc = es.MFCC(numberCoefficients=13)
-            
-            # Loudness-Algorithmen
-            self.loudness_ebu128 = es.LoudnessEBUR128()
-            self.dynamic_complexity = es.DynamicComplexity()
-            
-            # High-Level-Algorithmen
-            self.danceability = es.Danceability()
+        # Camelot Wheel mapping (geteilte Modulkonstante)
+        self.camelot_wheel = CAMELOT_WHEEL
+    
+    # Essentia-Algorithmen: jeder wird erst beim ersten Zugriff erzeugt (pro Prozess/Instanz),
+    # Zugriffe erfolgen unter self._essentia_lock
+    @cached_property
+    def rhythm_extractor(self):
+        return es.RhythmExtractor2013(method="multifeature") if self.use_essentia else None
+    
+    @cached_property
+    def key_extractor(self):
+        return es.KeyExtractor() if self.use_essentia else None
+    
+    @cached_property
+    def windowing(self):
+        return es.Windowing(type='hann', size=ESSENTIA_FRAME_SIZE) if self.use_essentia else None
+    
+    @cached_property
+    def spectrum(self):
+        return es.Spectrum(size=ESSENTIA_FRAME_SIZE) if self.use_essentia else None
+    
+    # Spektrum stammt aus ctx.essentia_audio (44.1 kHz, ESSENTIA_FRAME_SIZE); SpectralCentroid
+    # normiert sonst auf range=1, mit range=Nyquist liefert er Hz wie librosa
+    @cached_property
+    def spectral_centroid(self):
+        return es.SpectralCentroid(range=ESSENTIA_SAMPLE_RATE / 2) if self.use_essentia else None
+    
+    @cached_property
+    def spectral_rolloff(self):
+        return es.SpectralRollOff(sampleRate=ESSENTIA_SAMPLE_RATE) if self.use_essentia else None
+    
+    @cached_property
+    def mfcc(self):
+        return es.MFCC(numberCoefficients=N_MFCC, sampleRate=ESSENTIA_SAMPLE_RATE,
+                       inputSize=ESSENTIA_FRAME_SIZE // 2 + 1) if self.use_essentia else None
+    
+    @cached_property
+    def loudness_ebu128(self):
+        return es.LoudnessEBUR128() if self.use_essentia else None
+    
+    @cached_property
+    def dynamic_complexity(self):
+        return es.DynamicComplexity() if self.use_essentia else None
+    
+    @cached_property
+    def danceability(self):
+        return es.Danceability() if self.use_essentia else None
+    
+    def _get_torch_frontend(self, sr: int):
+        """Baut die STFT→Log-Mel-Kette einmalig pro Sample-Rate auf dem GPU-Device auf"""
+        frontend = self._torch_frontends.get(sr)
+        if frontend is None:
+            frontend = torch.nn.Sequential(
+                Spectrogram(n_fft=2048, hop_length=512, win_length=2048, window='hann',
+                            center=True, pad_mode='reflect', power=2.0, freeze_parameters=True),
+                LogmelFilterBank(sr=sr, n_fft=2048, n_mels=128, fmin=0.0, fmax=sr / 2,
+                                 ref=1.0, amin=1e-10, top_db=80.0, freeze_parameters=True)
+            ).to(self.device).eval()
+            self._torch_frontends[sr] = frontend
+        return frontend
+    
+    def _extract_features_torch(self, y: np.ndarray, sr: int) -> Dict[str, np.ndarray]:
+        """Berechnet Log-Mel-Spektrogramm und MFCCs via torchlibrosa auf der GPU"""
+        return self._extract_features_torch_batch([y], sr)[0]
+    
+    def _extract_features_torch_batch(self, signals: List[np.ndarray], sr: int) -> List[Dict[str, np.ndarray]]:
+        """
+        Log-Mel und MFCCs für mehrere Signale: ein (B, T)-Tensor pro GPU_BATCH_SIZE Tracks
+        
+        Kürzere Signale werden mit Nullen auf die Batch-Länge gepaddet und ihre Frames danach
+        auf 1 + len(y) // hop gekürzt; nur die letzten Frames sehen statt Reflect-Padding Nullen.
+        """
+        frontend = self._get_torch_frontend(sr)
+        results = []
+        for start in range(0, len(signals), GPU_BATCH_SIZE):
+            chunk = signals[start:start + GPU_BATCH_SIZE]
+            batch = np.zeros((len(chunk), max(len(y) for y in chunk)), dtype=np.float32)
+            for row, y in enumerate(chunk):
+                batch[row, :len(y)] = y
+            with torch.no_grad():
+                log_mel = frontend(torch.from_numpy(batch).to(self.device))[:, 0]  # (B, time, mel)
+            log_mel = log_mel.cpu().numpy()
             
-        except Exception as e:
-            logger.error(f"Fehler bei Essentia-Initialisierung: {e}")
-            self.use_essentia = False
+            for row, y in enumerate(chunk):
+                # Zurück ins librosa-Layout (mel, time)
+                track_mel = np.ascontiguousarray(log_mel[row, :1 + len(y) // STFT_HOP_LENGTH].T)
+                mfcc = librosa.feature.mfcc(S=track_mel, n_mfcc=N_MFCC)
+                results.append({'log_mel': track_mel, 'mfcc': mfcc})
+        return results
     
-    def extract_rhythm_features(self, y: np.ndarray, sr: int) -> Dict[str, float]:
+    def extract_rhythm_features(self, y: np.ndarray, sr: int,
+                                ctx: Optional[_AnalysisContext] = None) -> Dict[str, float]:
         """Extrahiert Rhythmus-Features (BPM, Beat-Tracking)"""
         features = {}
         
         try:
-            # Librosa BPM
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-            features['bpm'] = float(tempo)
+            ctx = _get_context(y, sr, ctx)
+            
+            # Librosa BPM (Beat-Tracking aus dem gemeinsamen Kontext)
+            beats = ctx.beats
+            features['bpm'] = ctx.tempo
             features['beat_count'] = len(beats)
             
             # Beat strength heuristic
             if len(beats) > 0:
-                beat_times = librosa.frames_to_time(beats, sr=sr)
-                beat_intervals = np.diff(beat_times)
-                features['beat_regularity'] = float(1.0 - np.std(beat_intervals) / np.mean(beat_intervals))
+                # std/mean ist skaleninvariant: Frame-Abstände statt Sekunden, Mittelwert und
+                # Varianz in einem fusionierten Durchlauf; ein einzelner Beat hat keine Abstände
+                # und gilt als unregelmäßig (0 statt NaN, damit Essentia nachrechnet)
+                interval_mean, interval_var, _, _ = stats1d(np.diff(beats).astype(np.float64))
+                features['beat_regularity'] = float(np.nan_to_num(1.0 - np.sqrt(interval_var) / interval_mean,
+                                                                  nan=0.0))
             
-            # Essentia rhythm features
-            if self.use_essentia:
-                try:
-                    audio_mono = essentia.array(y)
-                    bpm_est, beats_est, confidence, _, _ = self.rhythm_extractor(audio_mono)
-                    
-                    features['essentia_bpm'] = float(bpm_est)
-                    features['beat_confidence'] = float(confidence)
-                    
-                    # Use Essentia BPM if more confident
-                    if confidence > 0.7:
-                        features['bpm'] = float(bpm_est)
+            # Onset-Rate (Onsets/s) aus derselben Onset-Hüllkurve wie das Beat-Tracking
+            if len(y) > 0:
+                onsets = librosa.onset.onset_detect(onset_envelope=ctx.onset_env, sr=sr,
+                                                    hop_length=STFT_HOP_LENGTH)
+                features['onset_rate'] = float(len(onsets) / (len(y) / sr))
+            
+            # Essentia rhythm features (nur wenn das librosa-Beat-Raster unsicher ist)
+            if self.use_essentia and len(y) >= ESSENTIA_RHYTHM_MIN_SECONDS * sr and \
+                    features.get('beat_regularity', 0) < self.essentia_skip_thresholds['beat_regularity']:
+                with self._essentia_lock:
+                    try:
+                        audio_mono = ctx.essentia_audio
+                        bpm_est, beats_est, confidence, _, _ = self.rhythm_extractor(audio_mono)
                         
-                    # Onset rate
-                    onset_rate = self.onset_rate(audio_mono)
-                    features['onset_rate'] = float(onset_rate)
-                    
-                except Exception as e:
-                    logger.debug(f"Essentia rhythm extraction failed: {e}")
+                        features['essentia_bpm'] = float(bpm_est)
+                        features['beat_confidence'] = float(confidence)
+                        
+                        # Use Essentia BPM if more confident
+                        if confidence > 0.7:
+                            features['bpm'] = float(bpm_est)
+                        
+                    except Exception as e:
+                        logger.debug(f"Essentia rhythm extraction failed: {e}")
             
         except Exception as e:
             logger.error(f"Rhythm feature extraction failed: {e}")
         
         return features
     
-    def extract_tonal_features(self, y: np.ndarray, sr: int) -> Dict[str, Any]:
+    def extract_tonal_features(self, y: np.ndarray, sr: int,
+                               ctx: Optional[_AnalysisContext] = None) -> Dict[str, Any]:
         """Extrahiert tonale Features (Key, Harmonie, Chroma) mit robustem Array-Handling"""
         features = {}
         
         try:
-            # ROBUST CHROMA FEATURES mit Array-Safety
-            chroma = librosa.feature.chroma_stft(y=y, sr=sr)
+            # ROBUST CHROMA FEATURES mit Array-Safety (mittlerer Ausschnitt genügt für Key/Modus)
+            ctx = _get_context(y, sr, ctx)
+            chroma = ctx.center_chroma()
             
             # Sichere Array-Validierung und Aggregation
             if chroma.size == 0:
                 logger.warning("Empty chroma array, using fallback values")
-                chroma_mean = np.zeros(12)
+                chroma_mean = np.zeros(N_CHROMA)
                 features['chroma_mean'] = 0.0
                 features['chroma_variance'] = 0.0
             else:
-                chroma_mean = np.mean(chroma, axis=1) if chroma.ndim > 1 else chroma
-                
-                # Sicherstellen, dass chroma_mean 12 Elemente hat, sonst mit Nullen auffüllen
-                if chroma_mean.shape[0] != 12:
-                    logger.warning(f"Chroma_mean hat {chroma_mean.shape[0]} Elemente, erwartet 12. Fülle mit Nullen auf.")
-                    chroma_mean = np.pad(chroma_mean, (0, 12 - chroma_mean.shape[0]), 'constant')
-                
-                features['chroma_mean'] = float(np.mean(chroma))
-                features['chroma_variance'] = float(np.var(chroma))
+                chroma_mean = ctx.center_chroma_mean
+                features['chroma_mean'], features['chroma_variance'], _, _ = stats1d(chroma)
             
             # Key detection (librosa-based)
             key_index = np.argmax(chroma_mean)
             features['key_numeric'] = key_index
             features['key_confidence'] = float(chroma_mean[key_index])
             
-            # Mode detection (major/minor)
-            major_profile = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
-            minor_profile = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
-            
-            # FIX: corrcoef returns 2D matrix, need [0,1] element
-            # Sicherstellen, dass chroma_mean 12 Elemente hat, sonst Korrelation auf 0 setzen
-            if chroma_mean.shape[0] == 12:
-                major_corr = np.corrcoef(chroma_mean, major_profile)[0, 1]
-                minor_corr = np.corrcoef(chroma_mean, minor_profile)[0, 1]
+            # Tonart und Modus (major/minor) aus derselben Krumhansl-Schmuckler-Schätzung wie estimate_key;
+            # das Chroma kommt aus dem gemeinsamen Kontext, es wird nichts neu berechnet
+            key, _ = self.estimate_key(ctx.y, ctx.sr, ctx=ctx)
+            features['key'] = key
+            features['mode'] = 'minor' if key.endswith('m') else 'major'
+            if key in self.camelot_wheel:
+                tonic = KEY_NAMES.index(key.rstrip('m'))
+                major_corr, minor_corr = np.nan_to_num(
+                    key_profile_correlations(chroma_mean, [C_MAJOR_ROW + tonic, C_MINOR_ROW + tonic]))
+                features['mode_confidence'] = float(abs(major_corr - minor_corr))
             else:
-                major_corr = 0.0
-                minor_corr = 0.0
-            
-            features['mode'] = 'major' if major_corr > minor_corr else 'minor'
-            features['mode_confidence'] = float(abs(major_corr - minor_corr))
+                features['mode_confidence'] = 0.0
             
-            # Essentia key detection
-            if self.use_essentia:
-                try:
-                    audio_mono = essentia.array(y)
-                    key, scale, strength = self.key_extractor(audio_mono)
-                    
-                    features['key_essentia'] = key
-                    features['scale_essentia'] = scale
-                    features['key_strength'] = float(strength)
-                    
-                    # Use Essentia key if more confident
-                    if strength > features.get('key_confidence', 0):
-                        features['detected_key'] = key
-                        features['detected_scale'] = scale
+            # Essentia key detection (nur wenn die librosa-Tonart unsicher ist)
+            if self.use_essentia and \
+                    features['key_confidence'] <= self.essentia_skip_thresholds['key_confidence']:
+                with self._essentia_lock:
+                    try:
+                        audio_mono = ctx.essentia_audio
+                        key, scale, strength = self.key_extractor(audio_mono)
                         
-                except Exception as e:
-                    logger.debug(f"Essentia key extraction failed: {e}")
+                        features['key_essentia'] = key
+                        features['scale_essentia'] = scale
+                        features['key_strength'] = float(strength)
+                        
+                        # Use Essentia key if more confident
+                        if strength > features.get('key_confidence', 0):
+                            features['detected_key'] = key
+                            features['detected_scale'] = scale
+                            
+                    except Exception as e:
+                        logger.debug(f"Essentia key extraction failed: {e}")
             
         except Exception as e:
             logger.error(f"Tonal feature extraction failed: {e}")
         
         return features
     
-    def extract_spectral_features(self, y: np.ndarray, sr: int) -> Dict[str, float]:
+    def extract_spectral_features(self, y: np.ndarray, sr: int,
+                                  ctx: Optional[_AnalysisContext] = None) -> Dict[str, float]:
         """Extrahiert spektrale Features"""
         features = {}
         
         try:
-            # ROBUST SPECTRAL CENTROID mit Array-Safety
-            spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)
+            # Frame-Features aus einer gemeinsamen STFT (n_fft=2048, hop=512, center=True)
+            ctx = _get_context(y, sr, ctx)
+            S = ctx.stft_mag
+            spectral_centroids = librosa.feature.spectral_centroid(S=S, sr=sr)
+            spectral_rolloff = librosa.feature.spectral_rolloff(S=S, sr=sr)
+            zcr = frame_zcr(y)
+            spectral_bandwidth = librosa.feature.spectral_bandwidth(S=S, sr=sr)
+            spectral_flatness = librosa.feature.spectral_flatness(S=S)
+            
+            # Centroid-Mittelwert und -Varianz in einem Durchlauf, übrige Mittelwerte in einem
+            # einzigen Reduce über den (n_features, n_frames)-Stack
             if spectral_centroids.size > 0:
-                features['spectral_centroid'] = float(np.mean(spectral_centroids))
-                features['spectral_centroid_variance'] = float(np.var(spectral_centroids))
+                centroid_mean, centroid_var, _, _ = stats1d(spectral_centroids)
+                stack = np.vstack([spectral_rolloff, zcr, spectral_bandwidth, spectral_flatness])
+                rolloff_mean, zcr_mean, bandwidth_mean, flatness_mean = stack.mean(axis=1).tolist()
+                
+                features['spectral_centroid'] = centroid_mean
+                features['spectral_centroid_variance'] = centroid_var
+                features['spectral_rolloff'] = rolloff_mean
+                features['zero_crossing_rate'] = zcr_mean
+                features['spectral_bandwidth'] = bandwidth_mean
+                features['spectral_flatness'] = flatness_mean
             else:
                 features['spectral_centroid'] = float(sr / 4)  # Fallback: quarter of Nyquist
                 features['spectral_centroid_variance'] = 0.0
-            
-            # ROBUST SPECTRAL ROLLOFF 
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)
-            if spectral_rolloff.size > 0:
-                features['spectral_rolloff'] = float(np.mean(spectral_rolloff))
-            else:
                 features['spectral_rolloff'] = float(sr / 2)  # Fallback: Nyquist frequency
-            
-            # ROBUST ZERO CROSSING RATE
-            zcr = librosa.feature.zero_crossing_rate(y)
-            if zcr.size > 0:
-                features['zero_crossing_rate'] = float(np.mean(zcr))
-            else:
                 features['zero_crossing_rate'] = 0.0
             
-            # Spectral bandwidth
-            spectral_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)
-            features['spectral_bandwidth'] = float(np.mean(spectral_bandwidth))
-            
-            # Spectral flatness
-            spectral_flatness = librosa.feature.spectral_flatness(y=y)
-            features['spectral_flatness'] = float(np.mean(spectral_flatness))
-            
-            # MFCC features
-            mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-            features['mfcc_mean'] = float(np.mean(mfccs))
-            features['mfcc_variance'] = float(np.var(mfccs))
+            # MFCC features (GPU via torchlibrosa falls verfügbar, sonst librosa)
+            mfccs = None
+            if self.device is not None:
+                try:
+                    mfccs = (ctx.gpu_features or self._extract_features_torch(y, sr))['mfcc']
+                except Exception as e:
+                    logger.debug(f"GPU MFCC extraction failed, falling back to librosa: {e}")
+            if mfccs is None:
+                # Wie librosa.feature.mfcc(S=mel_db): orthonormale DCT-II über die Mel-Achse
+                mfccs = scipy.fft.dct(ctx.mel_db, axis=-2, type=2, norm='ortho')[..., :N_MFCC, :]
+            features['mfcc_mean'], features['mfcc_variance'], _, _ = stats1d(mfccs)
             
             # Essentia spectral features
             if self.use_essentia:
-                try:
-                    # Create simple spectrum for Essentia
-                    spectrum = np.abs(np.fft.fft(y[:4096]))
-                    
-                    features['spectral_centroid_essentia'] = float(self.spectral_centroid(spectrum))
-                    features['spectral_rolloff_essentia'] = float(self.spectral_rolloff(spectrum))
-                    
-                    # MFCC (Essentia)
-                    bands, mfcc_coeffs = self.mfcc(spectrum)
-                    features['mfcc_essentia_mean'] = float(np.mean(mfcc_coeffs))
-                    
-                except Exception as e:
-                    logger.debug(f"Essentia spectral extraction failed: {e}")
+                with self._essentia_lock:
+                    try:
+                        # Betragsspektrum des ersten Frames mit vorinitialisierten Algorithmen
+                        frame = ctx.essentia_audio[:ESSENTIA_FRAME_SIZE]
+                        if len(frame) < ESSENTIA_FRAME_SIZE:
+                            frame = np.pad(frame, (0, ESSENTIA_FRAME_SIZE - len(frame)))
+                        spectrum = self.spectrum(self.windowing(frame))
+                        
+                        features['spectral_centroid_essentia'] = float(self.spectral_centroid(spectrum))
+                        features['spectral_rolloff_essentia'] = float(self.spectral_rolloff(spectrum))
+                        
+                        # MFCC (Essentia)
+                        bands, mfcc_coeffs = self.mfcc(spectrum)
+                        features['mfcc_essentia_mean'] = np.mean(mfcc_coeffs).item()
+                        
+                    except Exception as e:
+                        logger.debug(f"Essentia spectral extraction failed: {e}")
             
         except Exception as e:
             logger.error(f"Spectral feature extraction failed: {e}")
         
         return features
     
-    def extract_energy_features(self, y: np.ndarray, sr: int) -> Dict[str, float]:
+    def extract_energy_features(self, y: np.ndarray, sr: int,
+                                ctx: Optional[_AnalysisContext] = None) -> Dict[str, float]:
         """Extrahiert Energie- und Loudness-Features"""
         features = {}
         
         try:
             # ROBUST RMS ENERGY mit Array-Safety  
-            rms = librosa.feature.rms(y=y)
+            ctx = _get_context(y, sr, ctx)
+            rms = ctx.rms
             
             if rms.size == 0:
                 logger.warning("Empty RMS array, using fallback energy values")
@@ -345,226 +952,241 @@ class FeatureExtractor:
                 features['loudness'] = -60.0  # Silent fallback
                 features['dynamic_range'] = 0.0
             else:
-                # Sichere Skalar-Konvertierung
-                features['energy'] = float(np.mean(rms))
-                features['energy_variance'] = float(np.var(rms))
+                # Mittelwert, Varianz, Min und Max in einem Durchlauf über rms
+                rms_mean, rms_var, rms_min, rms_max = ctx.rms_stats
+                features['energy'] = rms_mean
+                features['energy_variance'] = rms_var
                 
                 # Loudness mit Array-Validierung
-                rms_mean = np.mean(rms)
                 if rms_mean > 0:
-                    features['loudness'] = float(librosa.amplitude_to_db(rms_mean))
+                    # Wie librosa.amplitude_to_db (ref=1, amin=1e-5) für einen Skalar, ohne Array-Umweg
+                    features['loudness'] = 20.0 * math.log10(max(rms_mean, 1e-5))
                 else:
                     features['loudness'] = -60.0  # Silent fallback
                 
                 # Dynamic range mit Min/Max-Safety
-                features['dynamic_range'] = float(np.max(rms) - np.min(rms))
+                features['dynamic_range'] = rms_max - rms_min
             
             # Essentia loudness features
             if self.use_essentia:
-                try:
-                    audio_mono = essentia.array(y)
-                    
-                    # EBU R128 Loudness
-                    loudness = self.loudness_ebu128(audio_mono)
-                    features['loudness_ebu128'] = float(loudness)
-                    
-                    # Dynamic complexity
-                    dynamic_complexity = self.dynamic_complexity(audio_mono)
-                    features['dynamic_complexity'] = float(dynamic_complexity)
-                    
-                except Exception as e:
-                    logger.debug(f"Essentia energy extraction failed: {e}")
+                with self._essentia_lock:
+                    try:
+                        audio_mono = ctx.essentia_audio
+                        
+                        # EBU R128 Loudness
+                        loudness = self.loudness_ebu128(audio_mono)
+                        features['loudness_ebu128'] = float(loudness)
+                        
+                        # Dynamic complexity
+                        dynamic_complexity = self.dynamic_complexity(audio_mono)
+                        features['dynamic_complexity'] = float(dynamic_complexity)
+                        
+                    except Exception as e:
+                        logger.debug(f"Essentia energy extraction failed: {e}")
             
         except Exception as e:
             logger.error(f"Energy feature extraction failed: {e}")
         
         return features
     
-    def extract_perceptual_features(self, y: np.ndarray, sr: int) -> Dict[str, float]:
+    def extract_perceptual_features(self, y: np.ndarray, sr: int,
+                                    ctx: Optional[_AnalysisContext] = None) -> Dict[str, float]:
         """Extrahiert perzeptuelle Features (Valence, Danceability, etc.)"""
         features = {}
         
         try:
+            ctx = _get_context(y, sr, ctx)
+            
             # Simple valence estimation (based on spectral and tonal features)
-            chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-            chroma_mean = np.mean(chroma, axis=1)
+            chroma_mean = np.mean(ctx.chroma, axis=1)
             
-            # Major/minor correlation for valence
-            major_profile = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
-            # FIX: corrcoef returns 2D matrix, need [0,1] element  
-            major_corr = np.corrcoef(chroma_mean, major_profile)[0, 1] if len(chroma_mean) == 12 else 0.5
+            # Major/minor correlation for valence (vorstandardisierte Profilzeile; neutral bei konstantem Chroma)
+            major_corr = np.nan_to_num(key_profile_correlations(chroma_mean, C_MAJOR_ROW), nan=0.5)
             
             # RMS for energy component
-            rms = librosa.feature.rms(y=y)
-            energy = np.mean(rms)
+            energy = ctx.rms_stats[0]
             
             # Combine for valence estimation
             features['valence'] = float(np.clip((major_corr + energy) / 2, 0, 1))
             
-            # Simple danceability heuristic
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-            beat_strength = len(beats) / (len(y) / sr) / 4.0
+            # Simple danceability heuristic (Beats aus dem Rhythmus-Schritt wiederverwenden)
+            beat_strength = len(ctx.beats) / (len(y) / sr) / 4.0
             features['danceability'] = float(np.clip(beat_strength * energy, 0, 1))
             
             # Essentia perceptual features
             if self.use_essentia:
-                try:
-                    audio_mono = essentia.array(y)
-                    
-                    # Danceability
-                    danceability, dfa = self.danceability(audio_mono)
-                    features['danceability_essentia'] = float(danceability)
-                    features['dfa'] = float(dfa)
-                    
-                    # Use Essentia danceability if available
-                    if not np.isnan(danceability) and danceability > 0:
-                        features['danceability'] = float(danceability)
-                    
-                except Exception as e:
-                    logger.debug(f"Essentia perceptual extraction failed: {e}")
+                with self._essentia_lock:
+                    try:
+                        audio_mono = ctx.essentia_audio
+                        
+                        # Danceability
+                        danceability, dfa = self.danceability(audio_mono)
+                        features['danceability_essentia'] = float(danceability)
+                        features['dfa'] = float(dfa)
+                        
+                        # Use Essentia danceability if available
+                        if not np.isnan(danceability) and danceability > 0:
+                            features['danceability'] = float(danceability)
+                        
+                    except Exception as e:
+                        logger.debug(f"Essentia perceptual extraction failed: {e}")
             
         except Exception as e:
             logger.error(f"Perceptual feature extraction failed: {e}")
         
         return features
     
-    def extract_all_features(self, y: np.ndarray, sr: int) -> Dict[str, Any]:
+    def extract_all_features(self, y: np.ndarray, sr: int,
+                             ctx: Optional[_AnalysisContext] = None) -> Dict[str, Any]:
         """Extrahiert alle verfügbaren Features mit Fehlerbehandlung"""
-        all_features = get_safe_defaults()
+        all_features = dict(_SAFE_DEFAULTS)
         
-        try:
+        # STFT, RMS, Chroma und Beats einmal pro Signal für alle Feature-Gruppen;
+        # ohne passenden Kontext das Signal einmal als zusammenhängendes float32 ablegen
+        # (librosa und Essentia arbeiten dann ohne weitere Kopien darauf); Mehrkanal-Signale
+        # (channels, samples) werden vorher einmal auf Mono gemischt
+        if ctx is None or ctx.y is not y or ctx.sr != sr:
+            if np.ndim(y) > 1:
+                y = librosa.to_mono(np.asarray(y, dtype=np.float32))
+            y = _as_float32(y)
+            ctx = _AnalysisContext(y, sr)
+        
+        # Stille (leere Stems, Sample-Libraries): keine FFT-/Beat-Tracking-Arbeit
+        peak = max(float(y.max()), -float(y.min())) if len(y) else 0.0
+        if peak < SILENCE_PEAK_THRESHOLD:
+            return get_silent_features()
+        
+        # Gruppen ohne Bedarf an voller Rate laufen einmalig heruntergetastet auf ANALYSIS_SAMPLE_RATE
+        low_ctx = ctx
+        if sr > ANALYSIS_SAMPLE_RATE:
+            y_low = librosa.resample(y, orig_sr=sr, target_sr=ANALYSIS_SAMPLE_RATE, res_type='polyphase')
+            low_ctx = _AnalysisContext(_as_float32(y_low), ANALYSIS_SAMPLE_RATE, source=ctx)
+        
+        groups = [(name, getattr(self, method), ctx if full_rate else low_ctx)
+                  for name, method, full_rate in self.FEATURE_GROUPS]
+        
+        def run_group(group):
             # Extract different feature categories with individual error handling
+            name, extract, group_ctx = group
             try:
-                rhythm_features = self.extract_rhythm_features(y, sr)
-                all_features.update(rhythm_features)
-                logger.debug("Rhythm features extracted successfully")
+                features = extract(group_ctx.y, group_ctx.sr, ctx=group_ctx)
+                logger.debug(f"{name} features extracted successfully")
+                return features
             except Exception as e:
-                logger.warning(f"Rhythm feature extraction failed: {e}")
-            
-            try:
-                tonal_features = self.extract_tonal_features(y, sr)
-                all_features.update(tonal_features)
-                logger.debug("Tonal features extracted successfully")
-            except Exception as e:
-                logger.warning(f"Tonal feature extraction failed: {e}")
-            
-            try:
-                spectral_features = self.extract_spectral_features(y, sr)
-                all_features.update(spectral_features)
-                logger.debug("Spectral features extracted successfully")
-            except Exception as e:
-                logger.warning(f"Spectral feature extraction failed: {e}")
-            
-            try:
-                energy_features = self.extract_energy_features(y, sr)
-                all_features.update(energy_features)
-                logger.debug("Energy features extracted successfully")
-            except Exception as e:
-                logger.warning(f"Energy feature extraction failed: {e}")
+                logger.warning(f"{name} feature extraction failed: {e}")
+                return {}
+        
+        try:
+            if self.feature_workers > 1:
+                # Gemeinsame Zwischenergebnisse vorab im aufrufenden Thread berechnen, damit die
+                # Gruppen-Threads nur noch lesen; Essentia bleibt über _essentia_lock serialisiert
+                low_ctx.warm(include_essentia=self.use_essentia)
+                results = self._get_group_executor().map(run_group, groups)
+            else:
+                results = map(run_group, groups)
             
-            try:
-                perceptual_features = self.extract_perceptual_features(y, sr)
-                all_features.update(perceptual_features)
-                logger.debug("Perceptual features extracted successfully")
-            except Exception as e:
-                logger.warning(f"Perceptual feature extraction failed: {e}")
+            # Reihenfolge wie in FEATURE_GROUPS: spätere Gruppen überschreiben gleichnamige Keys
+            for features in results:
+                all_features.update(features)
                 
         except Exception as e:
             logger.error(f"Critical error in feature extraction: {e}")
             # Return safe defaults if everything fails
             
         return all_features
+    
+    def _get_group_executor(self) -> ThreadPoolExecutor:
+        """Thread-Pool für die Feature-Gruppen (lazy, lebt so lange wie der Extractor)"""
+        if self._group_executor is None:
+            self._group_executor = ThreadPoolExecutor(max_workers=self.feature_workers,
+                                                      thread_name_prefix="feature-group")
+        return self._group_executor
 
-    def estimate_key(self, y: np.ndarray, sr: int) -> Tuple[str, str]:
-        """Schätzt Tonart mit Krumhansl-Schmuckler Algorithmus - robust gegen Fehler"""
+    def extract_all_features_batch(self, signals: List[np.ndarray], sr: int) -> List[Dict[str, Any]]:
+        """extract_all_features für mehrere Signale gleicher Samplerate (gemeinsame Batch-STFT)"""
+        signals = [_as_float32(y) for y in signals]
+        contexts = _batched_contexts(signals, sr)
+        
+        # GPU: Log-Mel/MFCC aller Tracks in wenigen gebatchten Aufrufen statt einem pro Track
+        if self.device is not None:
+            indices = [i for i, y in enumerate(signals) if len(y)]
+            try:
+                batch_features = self._extract_features_torch_batch([signals[i] for i in indices], sr)
+                for i, gpu_features in zip(indices, batch_features):
+                    contexts[i].gpu_features = gpu_features
+            except Exception as e:
+                logger.debug(f"GPU batch extraction failed, falling back to per-track path: {e}")
+        return [self.extract_all_features(y, sr, ctx=ctx) for y, ctx in zip(signals, contexts)]
+    
+    def estimate_key(self, y: np.ndarray, sr: int,
+                     ctx: Optional[_AnalysisContext] = None) -> Tuple[str, str]:
+        """
+        Schätzt Tonart mit Krumhansl-Schmuckler Algorithmus - robust gegen Fehler
+        
+        Mit passendem ctx wird das Chroma des zentrierten Ausschnitts aus dem Kontext
+        wiederverwendet, statt eine weitere STFT zu rechnen.
+        """
         try:
-            chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-            chroma_mean = np.mean(chroma, axis=1) if chroma.ndim > 1 else chroma
+            if ctx is not None and ctx.y is y and ctx.sr == sr:
+                chroma_mean = ctx.center_chroma_mean
+            else:
+                chroma = librosa.feature.chroma_stft(y=y, sr=sr, n_chroma=N_CHROMA)
+                chroma_mean = np.mean(chroma, axis=1) if chroma.ndim > 1 else chroma
         except Exception as e:
             logger.warning(f"Key estimation failed: {e}")
             return 'Unknown', '1A'
         
-        # Sicherstellen, dass chroma_mean 12 Elemente hat, sonst mit Nullen auffüllen
-        if chroma_mean.shape[0] != 12:
-            logger.warning(f"Chroma_mean in estimate_key hat {chroma_mean.shape[0]} Elemente, erwartet 12. Fülle mit Nullen auf.")
-            chroma_mean = np.pad(chroma_mean, (0, 12 - chroma_mean.shape[0]), 'constant')
-        
-        # Key templates (Krumhansl-Schmuckler)
-        major_template = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
-        minor_template = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
-        
-        key_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        
-        major_correlations = []
-        minor_correlations = []
-        
-        for i in range(12):
-            major_shifted = np.roll(major_template, i)
-            minor_shifted = np.roll(minor_template, i)
-            
-            # FIX: corrcoef returns 2D matrix, extract scalar correlation
-            # Sicherstellen, dass chroma_mean und shifted_template nicht leer sind
-            if chroma_mean.size == 0 or major_shifted.size == 0:
-                major_corr = 0.0
-            else:
-                major_corr = np.corrcoef(chroma_mean, major_shifted)[0, 1]
-            
-            if chroma_mean.size == 0 or minor_shifted.size == 0:
-                minor_corr = 0.0
-            else:
-                minor_corr = np.corrcoef(chroma_mean, minor_shifted)[0, 1]
-            
-            major_correlations.append(major_corr)
-            minor_correlations.append(minor_corr)
-        
-        max_major_idx = np.argmax(major_correlations)
-        max_minor_idx = np.argmax(minor_correlations)
-        
-        # NaN-Werte in 0 umwandeln, um Vergleich zu ermöglichen
-        major_max_corr = np.nan_to_num(major_correlations[max_major_idx])
-        minor_max_corr = np.nan_to_num(minor_correlations[max_minor_idx])
-
-        if major_max_corr > minor_max_corr:
-            key = key_names[max_major_idx]
-        else:
-            key = key_names[max_minor_idx] + 'm'
+        # Korrelation mit allen 24 rotierten Krumhansl-Schmuckler-Profilen (numba-Kernel, falls verfügbar)
+        row = best_key_row(chroma_mean)
+        key = KEY_NAMES[row % 12] + ('m' if row >= 12 else '')
         
         camelot = self.camelot_wheel.get(key, 'Unknown')
         return key, camelot
     
-    def estimate_energy(self, y: np.ndarray) -> float:
-        """Schätzt Energie des Tracks"""
-        rms = librosa.feature.rms(y=y)
-        return float(np.mean(rms))
+    def estimate_energy(self, y: np.ndarray, ctx: Optional[_AnalysisContext] = None) -> float:
+        """Schätzt Energie des Tracks (RMS aus dem Analyse-Kontext, falls übergeben)"""
+        if ctx is not None and ctx.y is y:
+            return ctx.rms_stats[0]
+        return frame_rms(y).mean().item()
     
-    def estimate_brightness(self, y: np.ndarray, sr: int) -> float:
-        """Schätzt Helligkeit/Spektrum des Tracks"""
-        spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)
-        return float(np.mean(spectral_centroids))
+    def estimate_brightness(self, y: np.ndarray, sr: int,
+                            ctx: Optional[_AnalysisContext] = None) -> float:
+        """Schätzt Helligkeit/Spektrum des Tracks (aus der gemeinsamen STFT)"""
+        S = _get_context(y, sr, ctx).stft_mag
+        spectral_centroids = librosa.feature.spectral_centroid(S=S, sr=sr)
+        return spectral_centroids.mean().item()
 
-    def extract_metadata(self, file_path: str) -> Dict[str, Any]:
-        """Extrahiert Metadaten aus Audio-Datei"""
+    def extract_metadata(self, file_path: str, file_stats: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """
+        Extrahiert Metadaten aus Audio-Datei
+        
+        file_stats: bereits vorhandenes stat-Ergebnis (z.B. aus os.scandir), spart den stat-Aufruf
+        """
         metadata = {}
         
         try:
+            # Dateiname einmal zerlegen statt basename/splitext/Path.suffix einzeln
+            filename = os.path.basename(file_path)
+            stem, extension = os.path.splitext(filename)
+            
             # Mutagen für ID3-Tags
             audio_file = MutagenFile(file_path)
             if audio_file is not None:
-                metadata.update({
-                    'title': str(audio_file.get('TIT2', [''])) if audio_file.get('TIT2') else os.path.splitext(os.path.basename(file_path)),
-                    'artist': str(audio_file.get('TPE1', [''])) if audio_file.get('TPE1') else 'Unknown',
-                    'album': str(audio_file.get('TALB', [''])) if audio_file.get('TALB') else 'Unknown',
-                    'genre': str(audio_file.get('TCON', [''])) if audio_file.get('TCON') else 'Unknown',
-                    'year': str(audio_file.get('TDRC', [''])) if audio_file.get('TDRC') else None,
-                })
+                metadata.update(METADATA_TAG_DEFAULTS, title=stem)
+                tags = audio_file.tags or {}
+                for field, frame_id in ID3_METADATA_TAGS:
+                    frame = tags.get(frame_id)
+                    if frame:
+                        metadata[field] = str(frame)
             
             # Datei-Informationen
-            file_stats = os.stat(file_path)
+            if file_stats is None:
+                file_stats = os.stat(file_path)
             metadata.update({
                 'file_size': file_stats.st_size,
                 'file_path': file_path,
-                'filename': os.path.basename(file_path),
-                'extension': Path(file_path).suffix.lower(),
+                'filename': filename,
+                'extension': extension.lower(),
                 'analyzed_at': file_stats.st_mtime
             })
             
@@ -573,29 +1195,67 @@ class FeatureExtractor:
         
         return metadata
     
+    def extract_metadata_bulk(self, dir_path: str, extensions: Optional[Set[str]] = None):
+        """
+        Metadaten aller Dateien eines Verzeichnisses (nicht rekursiv) als (Dateiname, Metadaten)
+        
+        os.scandir liefert stat-Informationen mit dem Verzeichniseintrag (unter Windows ohne
+        weiteren Syscall); extensions filtert optional nach kleingeschriebenen Endungen.
+        """
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    if extensions is not None and os.path.splitext(entry.name)[1].lower() not in extensions:
+                        continue
+                    file_stats = entry.stat()
+                except OSError as e:
+                    logger.warning(f"Datei übersprungen ({entry.path}): {e}")
+                    continue
+                yield entry.name, self.extract_metadata(entry.path, file_stats)
+    
     def get_compatible_keys(self, camelot: str) -> List[str]:
         """Gibt harmonisch kompatible Keys zurück"""
-        if not camelot or len(camelot) < 2:
-            return []
-        
+        compatible = _CAMELOT_COMPAT.get(camelot)
+        if compatible is None:
+            # Nicht-kanonische Schreibweisen (z.B. '08A') wie bisher parsen
+            if not camelot or len(camelot) < 2:
+                return []
+            try:
+                compatible = _camelot_neighbours(int(camelot[:-1]), camelot[-1])
+            except (ValueError, IndexError):
+                return []
+        return list(compatible)
+
+
+
+class FeatureExtractorPool:
+    """
+    Pool vorinitialisierter FeatureExtractor-Instanzen für Thread-basierte Analyse.
+    
+    Essentia-Algorithmen sind nicht threadsicher; jede Instanz besitzt eigene Algorithmus-Objekte,
+    und ein Thread leiht sich eine Instanz exklusiv aus. Für Essentia-lastige Workloads bleibt
+    Prozess-Parallelisierung die robustere Wahl, für librosa-only-Setups reichen Threads.
+    """
+    
+    def __init__(self, size: Optional[int] = None, **extractor_kwargs):
+        self.size = max(1, size or os.cpu_count() or 1)
+        self._extractors: queue.Queue = queue.Queue(maxsize=self.size)
+        for _ in range(self.size):
+            self._extractors.put(FeatureExtractor(**extractor_kwargs))
+    
+    @contextmanager
+    def borrow(self):
+        """Leiht die nächste freie Instanz exklusiv aus (blockiert, bis eine frei ist)"""
+        extractor = self._extractors.get()
         try:
-            number = int(camelot[:-1])
-            letter = camelot[-1]
-        except (ValueError, IndexError):
-            return []
-        
-        compatible = []
-        
-        # Gleiche Nummer, andere Modalität (relative Dur/Moll)
-        if letter == 'A':
-            compatible.append(f"{number}B")
-        else:
-            compatible.append(f"{number}A")
-        
-        # +1 und -1 (Quintenzirkel)
-        next_num = (number % 12) + 1
-        prev_num = ((number - 2) % 12) + 1
-        
-        compatible.extend([f"{next_num}{letter}", f"{prev_num}{letter}"])
-        
-        return compatible
\ No newline at end of file
+            yield extractor
+        finally:
+            self._extractors.put(extractor)
+    
+    def extract(self, y: np.ndarray, sr: int,
+                ctx: Optional[_AnalysisContext] = None) -> Dict[str, Any]:
+        """extract_all_features auf der nächsten freien Instanz"""
+        with self.borrow() as extractor:
+            return extractor.extract_all_features(y, sr, ctx=ctx)
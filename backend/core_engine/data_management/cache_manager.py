@@ -3,13 +3,45 @@
 import os
 import json
 import hashlib
+import struct
 import time
 import logging
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
+# Optional: orjson für Cache-Dateien und Metadaten (gleiches JSON-Format auf der Platte)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _json_loads = orjson.loads
+except ImportError:
+    ORJSON_AVAILABLE = False
+    _json_loads = json.loads
+
+try:
+    # xxh3 für den Cache-Schlüssel (kein kryptografischer Zweck); sonst MD5 wie bisher
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Maximale Anzahl gemerkter Cache-Schlüssel (path, size, mtime) -> Hash (LRU)
+FILE_HASH_CACHE_SIZE = 4096
+
+
+def _json_dumps(data: Any) -> bytes:
+    """JSON mit 2er-Einrückung als UTF-8-Bytes (orjson, sonst json wie bisher)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                                | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # Typen, die orjson nicht kennt: Standardbibliothek
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
 
 class CacheManager:
     """Verwaltet Cache-Dateien für Audio-Analyse-Ergebnisse im headless Backend"""
@@ -22,12 +54,15 @@ class CacheManager:
         self.metadata_file = self.cache_dir / "cache_metadata.json"
         self.metadata = self.load_metadata()
         
+        # Gemerkte Cache-Schlüssel; eine geänderte Datei hat eine neue (size, mtime)-Kombination
+        self._hash_cache: "OrderedDict[Tuple[str, Optional[int], Optional[float]], str]" = OrderedDict()
+        
     def load_metadata(self) -> Dict[str, Any]:
         """Lädt Cache-Metadaten"""
         if self.metadata_file.exists():
             try:
-                with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.metadata_file, 'rb') as f:
+                    return _json_loads(f.read())
             except Exception as e:
                 logger.warning(f"Fehler beim Laden der Cache-Metadaten: {e}")
         
@@ -42,75 +77,84 @@ class CacheManager:
     def save_metadata(self):
         """Speichert Cache-Metadaten"""
         try:
-            with open(self.metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(self.metadata, f, indent=2, ensure_ascii=False)
+            with open(self.metadata_file, 'wb') as f:
+                f.write(_json_dumps(self.metadata))
         except Exception as e:
             logger.error(f"Fehler beim Speichern der Cache-Metadaten: {e}")
     
-    def get_file_hash(self, file_path: str) -> str:
-        """Berechnet MD5-Hash einer Datei basierend auf Pfad und Metadaten"""
+    def _stat_and_hash(self, file_path: str) -> Tuple[str, Optional[os.stat_result]]:
+        """
+        Ein os.stat pro Aufruf; der Hash wird pro (path, size, mtime) nur einmal berechnet
+        
+        Gibt (Cache-Schlüssel, stat-Ergebnis) zurück; stat ist None, wenn die Datei fehlt.
+        """
         try:
-            hash_md5 = hashlib.md5()
-            
-            # Datei-Informationen für Hash
             stat = os.stat(file_path)
-            file_info = f"{file_path}_{stat.st_size}_{stat.st_mtime}"
-            hash_md5.update(file_info.encode('utf-8'))
-            
-            return hash_md5.hexdigest()
+            key = (file_path, stat.st_size, stat.st_mtime)
         except Exception as e:
             logger.warning(f"Fehler beim Hash-Berechnen für {file_path}: {e}")
-            return hashlib.md5(file_path.encode('utf-8')).hexdigest()
+            stat = None
+            key = (file_path, None, None)
+        
+        file_hash = self._hash_cache.get(key)
+        if file_hash is not None:
+            self._hash_cache.move_to_end(key)
+            return file_hash, stat
+        
+        digest = xxhash.xxh3_64() if XXHASH_AVAILABLE else hashlib.md5()
+        digest.update(file_path.encode('utf-8'))
+        if stat is not None:
+            # Größe und mtime binär statt als formatierter String
+            digest.update(struct.pack('<qd', stat.st_size, stat.st_mtime))
+        file_hash = digest.hexdigest()
+        
+        self._hash_cache[key] = file_hash
+        if len(self._hash_cache) > FILE_HASH_CACHE_SIZE:
+            self._hash_cache.popitem(last=False)
+        return file_hash, stat
+    
+    def get_file_hash(self, file_path: str) -> str:
+        """Berechnet den Cache-Schlüssel einer Datei aus Pfad, Größe und mtime (xxh3_64 bzw. MD5)"""
+        return self._stat_and_hash(file_path)[0]
+    
+    def _cache_path_for(self, file_hash: str) -> Path:
+        return self.cache_dir / f"{file_hash}.json"
     
     def get_cache_path(self, file_path: str) -> Path:
         """Gibt den Cache-Pfad für eine Datei zurück"""
-        file_hash = self.get_file_hash(file_path)
-        return self.cache_dir / f"{file_hash}.json"
+        return self._cache_path_for(self.get_file_hash(file_path))
     
-    def is_cached(self, file_path: str) -> bool:
-        """Prüft ob eine Datei im Cache existiert und aktuell ist"""
-        cache_path = self.get_cache_path(file_path)
-        
-        if not cache_path.exists():
+    def _is_cached(self, file_hash: str, stat: Optional[os.stat_result]) -> bool:
+        """Cache-Prüfung mit bereits ermitteltem Schlüssel und stat-Ergebnis (ohne weitere Syscalls)"""
+        # Original-Datei muss noch existieren, die Cache-Datei ebenfalls
+        if stat is None or not self._cache_path_for(file_hash).exists():
             return False
         
-        # Prüfe ob die Original-Datei noch existiert und unverändert ist
-        if not os.path.exists(file_path):
+        cached_info = self.metadata['files'].get(file_hash)
+        if cached_info is None:
             return False
         
-        try:
-            # Prüfe Metadaten
-            file_hash = self.get_file_hash(file_path)
-            if file_hash in self.metadata['files']:
-                cached_info = self.metadata['files'][file_hash]
-                
-                # Prüfe ob die Datei seit dem Caching verändert wurde
-                current_mtime = os.path.getmtime(file_path)
-                cached_mtime = cached_info.get('original_mtime', 0)
-                
-                # Toleranz von 1 Sekunde für Zeitstempel-Ungenauigkeiten
-                if abs(current_mtime - cached_mtime) > 1:
-                    return False
-                
-                return True
-        except Exception as e:
-            logger.warning(f"Fehler beim Cache-Check für {file_path}: {e}")
-        
-        return False
+        # Prüfe ob die Datei seit dem Caching verändert wurde
+        # (Toleranz von 1 Sekunde für Zeitstempel-Ungenauigkeiten)
+        return abs(stat.st_mtime - cached_info.get('original_mtime', 0)) <= 1
+    
+    def is_cached(self, file_path: str) -> bool:
+        """Prüft ob eine Datei im Cache existiert und aktuell ist"""
+        return self._is_cached(*self._stat_and_hash(file_path))
     
     def load_from_cache(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Lädt Analyse-Ergebnisse aus dem Cache"""
-        if not self.is_cached(file_path):
+        file_hash, stat = self._stat_and_hash(file_path)
+        if not self._is_cached(file_hash, stat):
             return None
         
-        cache_path = self.get_cache_path(file_path)
+        cache_path = self._cache_path_for(file_hash)
         
         try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(cache_path, 'rb') as f:
+                data = _json_loads(f.read())
             
             # Update last accessed time
-            file_hash = self.get_file_hash(file_path)
             if file_hash in self.metadata['files']:
                 self.metadata['files'][file_hash]['last_accessed'] = time.time()
                 self.save_metadata()
@@ -125,7 +169,10 @@ class CacheManager:
     def save_to_cache(self, file_path: str, analysis_data: Dict[str, Any]) -> bool:
         """Speichert Analyse-Ergebnisse im Cache"""
         try:
-            cache_path = self.get_cache_path(file_path)
+            file_hash, stat = self._stat_and_hash(file_path)
+            if stat is None:
+                raise FileNotFoundError(file_path)
+            cache_path = self._cache_path_for(file_hash)
             
             # Füge Cache-Metadaten hinzu
             cache_data = {
@@ -136,11 +183,10 @@ class CacheManager:
             }
             
             # Speichere Cache-Datei
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            with open(cache_path, 'wb') as f:
+                f.write(_json_dumps(cache_data))
             
             # Update Metadaten
-            file_hash = self.get_file_hash(file_path)
             file_size = cache_path.stat().st_size
             
             self.metadata['files'][file_hash] = {
@@ -148,7 +194,7 @@ class CacheManager:
                 'cache_path': str(cache_path),
                 'cached_at': time.time(),
                 'last_accessed': time.time(),
-                'original_mtime': os.path.getmtime(file_path),
+                'original_mtime': stat.st_mtime,
                 'cache_size_bytes': file_size
             }
             
@@ -169,8 +215,10 @@ class CacheManager:
     def remove_from_cache(self, file_path: str) -> bool:
         """Entfernt eine Datei aus dem Cache"""
         try:
-            cache_path = self.get_cache_path(file_path)
-            file_hash = self.get_file_hash(file_path)
+            file_hash, stat = self._stat_and_hash(file_path)
+            cache_path = self._cache_path_for(file_hash)
+            if stat is not None:
+                self._hash_cache.pop((file_path, stat.st_size, stat.st_mtime), None)
             
             # Lösche Cache-Datei
             if cache_path.exists():
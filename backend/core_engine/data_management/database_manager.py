@@ -9,23 +9,170 @@ import logging
 import time
 import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
 import hashlib
 from dataclasses import dataclass
 from contextlib import contextmanager
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Optional: orjson für schnelleres JSON-Parsing im Cache-Hit-Pfad
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _json_loads = orjson.loads
+except ImportError:
+    ORJSON_AVAILABLE = False
+    _json_loads = json.loads
+
+# Wertespalten der Zeitreihen (Reihenfolge = Layout im gepackten BLOB)
+TIME_SERIES_VALUE_FIELDS = ('energy_value', 'brightness_value', 'spectral_rolloff', 'rms_energy')
+
+
+def _time_series_columns(time_series_data: Union[List[Dict[str, Any]], Dict[str, Any]]) -> Tuple[list, List[list]]:
+    """Zeitstempel und Wertespalten aus einer Punktliste oder spaltenweisen Zeitreihe ({feld: [werte]})"""
+    if isinstance(time_series_data, dict):
+        # Spalten (Listen oder NumPy-Arrays) einmal nach Python-Werten wandeln
+        def as_list(column):
+            return column.tolist() if hasattr(column, 'tolist') else list(column)
+        
+        timestamps = as_list(time_series_data.get('timestamp', ()))
+        columns = [
+            as_list(time_series_data[field]) if field in time_series_data else [None] * len(timestamps)
+            for field in TIME_SERIES_VALUE_FIELDS
+        ]
+        return timestamps, columns
+    
+    timestamps = [point.get('timestamp', 0.0) for point in time_series_data]
+    columns = [[point.get(field) for point in time_series_data] for field in TIME_SERIES_VALUE_FIELDS]
+    return timestamps, columns
+
+
+def pack_time_series(time_series_data: Union[List[Dict[str, Any]], Dict[str, Any]]) -> Optional[Tuple[int, bytes, bytes]]:
+    """
+    Packt eine Zeitreihe für den Cache: (Anzahl, Zeitstempel als float32, Werte als float16).
+    
+    Die Werte liegen spaltenweise in der Reihenfolge von TIME_SERIES_VALUE_FIELDS; fehlende
+    Werte werden als NaN gespeichert. None bei leerer Zeitreihe.
+    """
+    timestamps, columns = _time_series_columns(time_series_data)
+    if not timestamps:
+        return None
+    values = np.array(
+        [[np.nan if v is None else v for v in column] for column in columns], dtype=np.float16
+    )
+    return len(timestamps), np.asarray(timestamps, dtype=np.float32).tobytes(), values.tobytes()
+
+
+def unpack_time_series(n_points: int, timestamps: bytes, values_f16: bytes) -> Dict[str, list]:
+    """Gegenstück zu pack_time_series: Spalten als Python-Listen (float32-genau, NaN -> None)"""
+    columns = {'timestamp': np.frombuffer(timestamps, dtype=np.float32).tolist()}
+    values = np.frombuffer(values_f16, dtype=np.float16).astype(np.float32).reshape(
+        len(TIME_SERIES_VALUE_FIELDS), n_points
+    )
+    for field, column in zip(TIME_SERIES_VALUE_FIELDS, values.tolist()):
+        columns[field] = [None if v != v else v for v in column]
+    return columns
+
+
+# Einstellungen für jede neue Connection (DatabaseManager und get_conn)
+SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",   # WAL: fsync nur beim Checkpoint
+    "PRAGMA busy_timeout = 30000",   # 30s timeout
+    "PRAGMA mmap_size = 268435456",  # Lesezugriffe über 256 MB mmap statt read()-Kopien
+    "PRAGMA temp_store = MEMORY",    # Sortier-/Temp-Tabellen im RAM
+    "PRAGMA cache_size = -65536",    # 64 MB Page-Cache pro Connection
+)
+
+
+def _connect(db_path: str, **kwargs) -> sqlite3.Connection:
+    """Öffnet eine Connection und setzt SQLITE_PRAGMAS"""
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0, **kwargs)
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+# Offene get_conn-Connections pro Thread und DB-Pfad (pid: nach fork nicht weiterverwenden)
+_thread_conns = threading.local()
+# Alle get_conn-Connections des Prozesses als (pid, conn), damit close_all_conns sie beim
+# Herunterfahren schließen kann; die Generation macht danach die Thread-Einträge ungültig
+_open_conns: List[Tuple[int, sqlite3.Connection]] = []
+_open_conns_lock = threading.Lock()
+_conn_generation = 0
+
 
 @contextmanager
 def get_conn(db_path: str):
-    """Thread-sichere DB-Connection für einzelne Operationen"""
-    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0)
+    """
+    Thread-sichere DB-Connection für einzelne Operationen
+    
+    Die Connection bleibt pro Prozess/Thread und Pfad offen und wird wiederverwendet
+    (kein connect + Schema-Parsing pro Aufruf). Offene Transaktionen werden bei Fehlern
+    zurückgerollt.
+    
+    Lebensdauer: bis close_thread_conns() im eigenen Thread oder close_all_conns() beim
+    Herunterfahren (Analyzer-Pool, App-Lifespan); ein späterer Aufruf öffnet sie neu.
+    """
+    pid = os.getpid()
+    if (getattr(_thread_conns, 'pid', None) != pid or
+            getattr(_thread_conns, 'generation', None) != _conn_generation):
+        _thread_conns.pid = pid
+        _thread_conns.generation = _conn_generation
+        _thread_conns.by_path = {}
+    conn = _thread_conns.by_path.get(db_path)
+    if conn is None:
+        conn = _thread_conns.by_path[db_path] = _connect(db_path)
+        with _open_conns_lock:
+            _open_conns.append((pid, conn))
     try:
         yield conn
-    finally:
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+
+def _close_quietly(conn: sqlite3.Connection) -> None:
+    """Schließt eine Connection und ignoriert Fehler bereits geschlossener Connections"""
+    try:
         conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def close_thread_conns() -> None:
+    """Schließt die get_conn-Connections des aktuellen Threads"""
+    conns = list(getattr(_thread_conns, 'by_path', {}).values())
+    _thread_conns.by_path = {}
+    with _open_conns_lock:
+        _open_conns[:] = [entry for entry in _open_conns if entry[1] not in conns]
+    for conn in conns:
+        _close_quietly(conn)
+
+
+def close_all_conns() -> None:
+    """Schließt alle get_conn-Connections dieses Prozesses (beim Herunterfahren)"""
+    global _conn_generation
+    pid = os.getpid()
+    with _open_conns_lock:
+        _conn_generation += 1
+        conns = [conn for conn_pid, conn in _open_conns if conn_pid == pid]
+        _open_conns.clear()
+    for conn in conns:
+        _close_quietly(conn)
+
+
+def _nested_dict(analysis_result: Dict[str, Any], features: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """analysis_result[name] bzw. features[name], je nachdem welches ein Dict ist (sonst {})"""
+    for candidate in (analysis_result.get(name), features.get(name)):
+        if isinstance(candidate, dict) and candidate:
+            return candidate
+    return {}
 
 
 @dataclass
@@ -44,6 +191,7 @@ class TrackRecord:
     extension: str
     created_at: float
     updated_at: float
+    content_hash: Optional[str] = None
 
 
 @dataclass
@@ -111,16 +259,11 @@ class DatabaseManager:
                     pass
             
             # Erstelle neue thread-lokale Connection
-            self._local.connection = sqlite3.connect(
+            self._local.connection = _connect(
                 self.db_path,
-                timeout=30.0,
-                isolation_level='DEFERRED',  # Bessere Concurrency
-                check_same_thread=False  # Erlaubt Connection-Sharing innerhalb des Threads
+                isolation_level='DEFERRED'  # Bessere Concurrency
             )
             self._local.connection.row_factory = sqlite3.Row
-            self._local.connection.execute("PRAGMA foreign_keys = ON")
-            self._local.connection.execute("PRAGMA journal_mode = WAL")
-            self._local.connection.execute("PRAGMA busy_timeout = 30000")  # 30s timeout
             
             logger.debug(f"Created new thread-local DB connection for thread {threading.current_thread().ident}")
             
@@ -156,10 +299,16 @@ class DatabaseManager:
                 file_size INTEGER NOT NULL,
                 extension TEXT NOT NULL,
                 created_at REAL DEFAULT (strftime('%s', 'now')),
-                updated_at REAL DEFAULT (strftime('%s', 'now'))
+                updated_at REAL DEFAULT (strftime('%s', 'now')),
+                content_hash TEXT
             )
         """)
         
+        # Migration: content_hash für bestehende Datenbanken nachrüsten
+        cursor.execute("PRAGMA table_info(tracks)")
+        if 'content_hash' not in [col[1] for col in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE tracks ADD COLUMN content_hash TEXT")
+        
         # Global features table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS global_features (
@@ -201,6 +350,18 @@ class DatabaseManager:
             )
         """)
         
+        # Gepackte Zeitreihen für den Analyse-Cache: eine Zeile pro Track statt eine pro Zeitpunkt
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS time_series_packed (
+                track_id INTEGER PRIMARY KEY,
+                n_points INTEGER NOT NULL,
+                timestamps BLOB NOT NULL,  -- float32
+                values_f16 BLOB NOT NULL,  -- float16, spaltenweise (TIME_SERIES_VALUE_FIELDS)
+                created_at REAL DEFAULT (strftime('%s', 'now')),
+                FOREIGN KEY (track_id) REFERENCES tracks (id) ON DELETE CASCADE
+            )
+        """)
+        
         # Analysis tasks table (for background job tracking)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS analysis_tasks (
@@ -218,6 +379,7 @@ class DatabaseManager:
         
         # Create indexes for better performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracks_file_path ON tracks(file_path)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracks_content_hash ON tracks(content_hash)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracks_artist ON tracks(artist)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracks_genre ON tracks(genre)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_global_features_track_id ON global_features(track_id)")
@@ -398,8 +560,23 @@ class DatabaseManager:
             WHERE track_id = ? 
             ORDER BY timestamp ASC
         """, (track_id,))
+        records = [TimeSeriesRecord(**dict(row)) for row in cursor.fetchall()]
+        if records:
+            return records
         
-        return [TimeSeriesRecord(**dict(row)) for row in cursor.fetchall()]
+        # Über den Analyse-Cache gespeicherte Zeitreihen liegen gepackt vor (id = Position)
+        cursor.execute(
+            "SELECT n_points, timestamps, values_f16, created_at FROM time_series_packed WHERE track_id = ?",
+            (track_id,)
+        )
+        packed = cursor.fetchone()
+        if not packed:
+            return []
+        columns = unpack_time_series(packed[0], packed[1], packed[2])
+        return [
+            TimeSeriesRecord(id=i, track_id=track_id, created_at=packed[3], **dict(zip(columns, point)))
+            for i, point in enumerate(zip(*columns.values()))
+        ]
     
     def is_cached(self, file_path: str) -> bool:
         """Check if track is already analyzed (replaces CacheManager.is_cached)"""
@@ -419,137 +596,238 @@ class DatabaseManager:
             logger.error(f"Error checking cache: {e}")
             return False
     
-    def save_to_cache(self, file_path: str, analysis_result: Dict[str, Any]) -> bool:
-        """Save analysis results (replaces CacheManager.save_to_cache)"""
-        # Use context manager for thread-safe database operations
+    def _write_analysis(self, cursor: sqlite3.Cursor, file_path: str, analysis_result: Dict[str, Any],
+                        content_hash: Optional[str] = None) -> bool:
+        """Schreibt ein Analyse-Ergebnis über den gegebenen Cursor (ohne Commit)"""
+        # Add or get track
+        try:
+            cursor.execute("""
+                INSERT INTO tracks (
+                    file_path, filename, title, artist, album, genre, year,
+                    duration, file_size, extension, content_hash
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                file_path,
+                analysis_result.get('metadata', {}).get('filename', os.path.basename(file_path)),
+                analysis_result.get('metadata', {}).get('title'),
+                analysis_result.get('metadata', {}).get('artist'),
+                analysis_result.get('metadata', {}).get('album'),
+                analysis_result.get('metadata', {}).get('genre'),
+                analysis_result.get('metadata', {}).get('year'),
+                analysis_result.get('metadata', {}).get('duration', 0.0),
+                analysis_result.get('metadata', {}).get('file_size', 0),
+                analysis_result.get('metadata', {}).get('extension', Path(file_path).suffix.lower()),
+                content_hash
+            ))
+            track_id = cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Track already exists, get ID
+            cursor.execute("SELECT id FROM tracks WHERE file_path = ?", (file_path,))
+            result = cursor.fetchone()
+            track_id = result[0] if result else None
+            if track_id and content_hash:
+                cursor.execute(
+                    "UPDATE tracks SET content_hash = ?, updated_at = strftime('%s', 'now') WHERE id = ?",
+                    (content_hash, track_id)
+                )
+        
+        if not track_id:
+            return False
+        
+        # Update global features
+        features = analysis_result.get('features', {})
+        # analyze_track legt Camelot/Mood auf oberster Ebene ab; features['camelot'] ist dort nur
+        # der Camelot-Code (String). Ältere Ergebnisse tragen die Dicts innerhalb von features.
+        mood_data = _nested_dict(analysis_result, features, 'mood')
+        camelot_data = _nested_dict(analysis_result, features, 'camelot')
+        derived_metrics = features.get('derived_metrics', {}) or analysis_result.get('derived_metrics', {})
+        
+        mood_scores_json = None
+        if mood_data:
+            mood_scores_json = json.dumps(mood_data['scores'] if 'scores' in mood_data else mood_data)
+        
+        cursor.execute("""
+            INSERT OR REPLACE INTO global_features (
+                track_id, bpm, key_name, camelot, key_confidence,
+                energy, valence, danceability, loudness, spectral_centroid,
+                zero_crossing_rate, mfcc_variance, primary_mood, mood_confidence,
+                mood_scores, energy_level, bpm_category
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            track_id,
+            features.get('bpm', 0.0),
+            camelot_data.get('key'),
+            camelot_data.get('camelot'),
+            camelot_data.get('key_confidence'),
+            features.get('energy', 0.0),
+            features.get('valence', 0.0),
+            features.get('danceability', 0.0),
+            features.get('loudness'),
+            features.get('spectral_centroid'),
+            features.get('zero_crossing_rate'),
+            features.get('mfcc_variance'),
+            mood_data.get('primary_mood') if isinstance(mood_data, dict) else None,
+            mood_data.get('confidence') if isinstance(mood_data, dict) else None,
+            mood_scores_json,
+            derived_metrics.get('energy_level') if isinstance(derived_metrics, dict) else None,
+            derived_metrics.get('bpm_category') if isinstance(derived_metrics, dict) else None
+        ))
+        
+        # Add time series data if present (gepackt: float32-Zeitstempel, float16-Werte)
+        if 'time_series_features' in analysis_result:
+            # Zeilen im alten Format für diesen Track entfernen
+            cursor.execute("DELETE FROM time_series_features WHERE track_id = ?", (track_id,))
+            
+            packed = pack_time_series(analysis_result['time_series_features'])
+            if packed:
+                cursor.execute("""
+                    INSERT OR REPLACE INTO time_series_packed (
+                        track_id, n_points, timestamps, values_f16
+                    ) VALUES (?, ?, ?, ?)
+                """, (track_id, *packed))
+            else:
+                cursor.execute("DELETE FROM time_series_packed WHERE track_id = ?", (track_id,))
+        
+        return True
+    
+    def _load_time_series(self, cursor: sqlite3.Cursor, track_id: int) -> Optional[Dict[str, list]]:
+        """Zeitreihe eines Tracks spaltenweise: gepackter BLOB, sonst Zeilen im alten Format"""
+        cursor.execute(
+            "SELECT n_points, timestamps, values_f16 FROM time_series_packed WHERE track_id = ?",
+            (track_id,)
+        )
+        packed = cursor.fetchone()
+        if packed:
+            return unpack_time_series(packed[0], packed[1], packed[2])
+        
+        cursor.execute("""
+            SELECT timestamp, energy_value, brightness_value, spectral_rolloff, rms_energy
+            FROM time_series_features
+            WHERE track_id = ?
+            ORDER BY timestamp
+        """, (track_id,))
+        rows = cursor.fetchall()
+        if not rows:
+            return None
+        return dict(zip(('timestamp',) + TIME_SERIES_VALUE_FIELDS, map(list, zip(*rows))))
+    
+    def save_to_cache(self, file_path: str, analysis_result: Dict[str, Any],
+                      content_hash: Optional[str] = None) -> bool:
+        """
+        Save analysis results (replaces CacheManager.save_to_cache)
+        
+        content_hash: optionaler Inhalts-Fingerprint als Cache-Schlüssel (file_path bleibt für die UI)
+        """
+        conn = None
+        try:
+            conn = self._get_connection()
+            conn.row_factory = sqlite3.Row
+            
+            if not self._write_analysis(conn.cursor(), file_path, analysis_result, content_hash):
+                return False
+            
+            conn.commit()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error saving to database: {e}")
+            if conn:
+                conn.rollback()
+            return False
+    
+    def save_many_to_cache(self, items: List[Tuple[str, Dict[str, Any], Optional[str]]]) -> int:
+        """
+        Speichert mehrere Analyse-Ergebnisse in einer Transaktion (ein Commit statt N)
+        
+        items: Liste von (file_path, analysis_result, content_hash)
+        Returns: Anzahl gespeicherter Ergebnisse
+        """
+        if not items:
+            return 0
+        
+        conn = None
         try:
             conn = self._get_connection()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
-                
-                # Add or get track
+            
+            # Explizite Transaktion, damit die Savepoints pro Eintrag nicht einzeln committen
+            if not conn.in_transaction:
+                cursor.execute("BEGIN")
+            
+            saved = 0
+            for file_path, analysis_result, content_hash in items:
                 try:
-                    cursor.execute("""
-                        INSERT INTO tracks (
-                            file_path, filename, title, artist, album, genre, year,
-                            duration, file_size, extension
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        file_path,
-                        analysis_result.get('metadata', {}).get('filename', os.path.basename(file_path)),
-                        analysis_result.get('metadata', {}).get('title'),
-                        analysis_result.get('metadata', {}).get('artist'),
-                        analysis_result.get('metadata', {}).get('album'),
-                        analysis_result.get('metadata', {}).get('genre'),
-                        analysis_result.get('metadata', {}).get('year'),
-                        analysis_result.get('metadata', {}).get('duration', 0.0),
-                        analysis_result.get('metadata', {}).get('file_size', 0),
-                        analysis_result.get('metadata', {}).get('extension', Path(file_path).suffix.lower())
-                    ))
-                    track_id = cursor.lastrowid
-                except sqlite3.IntegrityError:
-                    # Track already exists, get ID
-                    cursor.execute("SELECT id FROM tracks WHERE file_path = ?", (file_path,))
-                    result = cursor.fetchone()
-                    track_id = result[0] if result else None
-                
-                if not track_id:
-                    return False
-                
-                # Update global features
-                features = analysis_result.get('features', {})
-                mood_data = features.get('mood', {})
-                camelot_data = features.get('camelot', {}) or analysis_result.get('camelot', {})
-                derived_metrics = features.get('derived_metrics', {}) or analysis_result.get('derived_metrics', {})
-                
-                mood_scores_json = None
-                if 'mood' in features:
-                    if isinstance(features['mood'], dict) and 'scores' in features['mood']:
-                        mood_scores_json = json.dumps(features['mood']['scores'])
-                    elif isinstance(features['mood'], dict):
-                        mood_scores_json = json.dumps(features['mood'])
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO global_features (
-                        track_id, bpm, key_name, camelot, key_confidence,
-                        energy, valence, danceability, loudness, spectral_centroid,
-                        zero_crossing_rate, mfcc_variance, primary_mood, mood_confidence,
-                        mood_scores, energy_level, bpm_category
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    track_id,
-                    features.get('bpm', 0.0),
-                    camelot_data.get('key'),
-                    camelot_data.get('camelot'),
-                    camelot_data.get('key_confidence'),
-                    features.get('energy', 0.0),
-                    features.get('valence', 0.0),
-                    features.get('danceability', 0.0),
-                    features.get('loudness'),
-                    features.get('spectral_centroid'),
-                    features.get('zero_crossing_rate'),
-                    features.get('mfcc_variance'),
-                    mood_data.get('primary_mood') if isinstance(mood_data, dict) else None,
-                    mood_data.get('confidence') if isinstance(mood_data, dict) else None,
-                    mood_scores_json,
-                    derived_metrics.get('energy_level') if isinstance(derived_metrics, dict) else None,
-                    derived_metrics.get('bpm_category') if isinstance(derived_metrics, dict) else None
-                ))
-                
-                # Add time series data if present
-                if 'time_series_features' in analysis_result:
-                    time_series_data = analysis_result['time_series_features']
-                    # Delete existing time series data for this track
-                    cursor.execute("DELETE FROM time_series_features WHERE track_id = ?", (track_id,))
-                    
-                    # Insert new time series data
-                    for data_point in time_series_data:
-                        cursor.execute("""
-                            INSERT INTO time_series_features (
-                                track_id, timestamp, energy_value, brightness_value,
-                                spectral_rolloff, rms_energy
-                            ) VALUES (?, ?, ?, ?, ?, ?)
-                        """, (
-                            track_id,
-                            data_point.get('timestamp', 0.0),
-                            data_point.get('energy_value'),
-                            data_point.get('brightness_value'),
-                            data_point.get('spectral_rolloff'),
-                            data_point.get('rms_energy')
-                        ))
-                
-                conn.commit()
-                return True
-                
+                    cursor.execute("SAVEPOINT save_item")
+                    if self._write_analysis(cursor, file_path, analysis_result, content_hash):
+                        saved += 1
+                    cursor.execute("RELEASE SAVEPOINT save_item")
+                except Exception as e:
+                    logger.error(f"Error saving {file_path} to database: {e}")
+                    cursor.execute("ROLLBACK TO SAVEPOINT save_item")
+                    cursor.execute("RELEASE SAVEPOINT save_item")
+            
+            conn.commit()
+            return saved
+            
         except Exception as e:
-            logger.error(f"Error saving to database: {e}")
+            logger.error(f"Error saving batch to database: {e}")
             if conn:
                 conn.rollback()
-            return False
+            return 0
     
-    def load_from_cache(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """Load analysis results (replaces CacheManager.load_from_cache)"""
+    def load_from_cache(self, file_path: str, content_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Load analysis results (replaces CacheManager.load_from_cache)
+        
+        Mit content_hash wird über den Inhalts-Fingerprint gesucht, sodass verschobene oder
+        umbenannte Dateien ihre Analyse wiederverwenden. Einträge ohne Hash (vor der Migration)
+        werden weiterhin über file_path gefunden.
+        
+        Die hier erzeugte Form ist maßgeblich: Aufrufer geben sie bei Cache-Treffern unverändert weiter.
+        """
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
             conn.row_factory = sqlite3.Row
             
-            # Get track with global features
-            cursor.execute("""
-                SELECT t.*, gf.*
-                FROM tracks t
-                JOIN global_features gf ON t.id = gf.track_id
-                WHERE t.file_path = ?
-            """, (file_path,))
+            row = None
+            if content_hash:
+                # Get track with global features by content hash (gleicher Pfad bevorzugt)
+                cursor.execute("""
+                    SELECT t.*, gf.*
+                    FROM tracks t
+                    JOIN global_features gf ON t.id = gf.track_id
+                    WHERE t.content_hash = ?
+                    ORDER BY (t.file_path = ?) DESC, t.updated_at DESC
+                    LIMIT 1
+                """, (content_hash, file_path))
+                row = cursor.fetchone()
+            
+            if not row:
+                # Get track with global features
+                cursor.execute("""
+                    SELECT t.*, gf.*
+                    FROM tracks t
+                    JOIN global_features gf ON t.id = gf.track_id
+                    WHERE t.file_path = ?
+                """ + (" AND t.content_hash IS NULL" if content_hash else ""), (file_path,))
+                row = cursor.fetchone()
             
-            row = cursor.fetchone()
             if not row:
                 return None
             
             # Reconstruct analysis result format with robust null handling
+            # (bei Hash-Treffer unter anderem Pfad gilt der angefragte Pfad)
+            if content_hash and row['file_path'] != file_path:
+                file_path_out, filename_out = file_path, os.path.basename(file_path)
+            else:
+                file_path_out = str(row['file_path']) if row['file_path'] else file_path
+                filename_out = str(row['filename']) if row['filename'] else os.path.basename(file_path)
+            
             result = {
-                'file_path': str(row['file_path']) if row['file_path'] else file_path,
-                'filename': str(row['filename']) if row['filename'] else os.path.basename(file_path),
+                'file_path': file_path_out,
+                'filename': filename_out,
                 'features': {
                     'bpm': float(row['bpm']) if row['bpm'] is not None else 0.0,
                     'energy': float(row['energy']) if row['energy'] is not None else 0.0,
@@ -568,8 +846,8 @@ class DatabaseManager:
                     'year': str(row['year']) if row['year'] else '',
                     'duration': float(row['duration']) if row['duration'] is not None else 0.0,
                     'file_size': int(row['file_size']) if row['file_size'] is not None else 0,
-                    'filename': str(row['filename']) if row['filename'] else os.path.basename(file_path),
-                    'file_path': str(row['file_path']) if row['file_path'] else file_path,
+                    'filename': filename_out,
+                    'file_path': file_path_out,
                     'extension': str(row['extension']) if row['extension'] else '',
                     'analyzed_at': str(row['updated_at']) if row['updated_at'] else str(time.time())
                 },
@@ -581,7 +859,7 @@ class DatabaseManager:
                 'mood': {
                     'primary_mood': str(row['primary_mood']) if row['primary_mood'] else '',
                     'confidence': float(row['mood_confidence']) if row['mood_confidence'] is not None else 0.0,
-                    'scores': json.loads(row['mood_scores']) if row['mood_scores'] else {}
+                    'scores': _json_loads(row['mood_scores']) if row['mood_scores'] else {}
                 },
                 'derived_metrics': {
                     'energy_level': str(row['energy_level']) if row['energy_level'] else '',
@@ -592,33 +870,48 @@ class DatabaseManager:
                 'errors': []
             }
             
-            # Add time series data if requested
-            cursor.execute("""
-                SELECT timestamp, energy_value, brightness_value, spectral_rolloff, rms_energy
-                FROM time_series_features
-                WHERE track_id = ?
-                ORDER BY timestamp
-            """, (row['id'],))
-            
-            time_series_data = cursor.fetchall()
-            if time_series_data:
+            # Add time series data if present
+            columns = self._load_time_series(cursor, row['id'])
+            if columns:
                 result['time_series_features'] = [
-                    {
-                        'timestamp': ts['timestamp'],
-                        'energy_value': ts['energy_value'],
-                        'brightness_value': ts['brightness_value'],
-                        'spectral_rolloff': ts['spectral_rolloff'],
-                        'rms_energy': ts['rms_energy']
-                    }
-                    for ts in time_series_data
+                    dict(zip(columns, point)) for point in zip(*columns.values())
                 ]
             
+            if content_hash and row['file_path'] != file_path:
+                self._adopt_path(conn, row, file_path, result, content_hash)
+            
             return result
             
         except Exception as e:
             logger.error(f"Error loading from database: {e}")
             return None
     
+    def _adopt_path(self, conn: sqlite3.Connection, row: sqlite3.Row, file_path: str,
+                    result: Dict[str, Any], content_hash: str):
+        """
+        Persistiert einen Hash-Treffer unter neuem Pfad
+        
+        Existiert der alte Pfad nicht mehr (verschoben/umbenannt), wird die Zeile umgeschrieben;
+        sonst (Kopie) bekommt der neue Pfad eine eigene Zeile mit denselben Features.
+        """
+        cursor = conn.cursor()
+        try:
+            if not os.path.exists(row['file_path']):
+                try:
+                    cursor.execute("""
+                        UPDATE tracks SET file_path = ?, filename = ?, updated_at = strftime('%s', 'now')
+                        WHERE id = ?
+                    """, (file_path, os.path.basename(file_path), row['id']))
+                    conn.commit()
+                    return
+                except sqlite3.IntegrityError:
+                    pass  # Neuer Pfad hat schon eine (veraltete) Zeile: unten überschreiben
+            if self._write_analysis(cursor, file_path, result, content_hash):
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error storing moved track {file_path}: {e}")
+            conn.rollback()
+    
     def get_all_tracks(self, 
                        limit: int = 100, 
                        offset: int = 0,
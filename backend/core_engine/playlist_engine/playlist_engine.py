@@ -6,6 +6,7 @@ import math
 from typing import Dict, List, Optional, Tuple, Any, Callable
 from dataclasses import dataclass, asdict, field
 from enum import Enum
+from pathlib import Path
 import logging
 from datetime import datetime
 import numpy as np
@@ -74,6 +75,8 @@ class PlaylistEngine:
         
         # Camelot Wheel Kompatibilitäts-Matrix
         self.camelot_compatibility = self._build_camelot_matrix()
+        # Harmonische Übergangs-Scores je Key-Paar, einmalig aus der Matrix abgeleitet
+        self.harmonic_scores = self._build_harmonic_scores()
         
         # Mood-Kompatibilitäts-Matrix
         self.mood_compatibility = self._build_mood_matrix()
@@ -241,6 +244,16 @@ class PlaylistEngine:
         
         return compatibility
     
+    def _build_harmonic_scores(self) -> Dict[str, Dict[str, float]]:
+        """Score-Tabelle für kompatible Key-Paare: relative Dur/Moll 0.9, Quintenzirkel 0.7"""
+        scores = {}
+        for key, compatible_keys in self.camelot_compatibility.items():
+            scores[key] = {
+                other: 0.9 if other[:-1] == key[:-1] else 0.7
+                for other in compatible_keys
+            }
+        return scores
+    
     def _build_mood_matrix(self) -> Dict[str, Dict[str, float]]:
         """Erstellt Mood-Kompatibilitäts-Matrix für Stimmungsübergänge"""
         mood_scores = {
@@ -770,20 +783,8 @@ class PlaylistEngine:
         if camelot1 == camelot2:
             return 1.0
         
-        compatible_keys = self.camelot_compatibility.get(camelot1, [])
-        
-        if camelot2 in compatible_keys:
-            # Gewichtung basierend auf Kompatibilitäts-Typ
-            if len(camelot1) >= 2 and len(camelot2) >= 2:
-                # Relative Dur/Moll (gleiche Nummer, andere Modalität)
-                if (camelot1[:-1] == camelot2[:-1] and 
-                    camelot1[-1] != camelot2[-1]):
-                    return 0.9
-                else:
-                    return 0.7  # Quintenzirkel
-            return 0.7
-        
-        return 0.1  # Nicht kompatibel
+        # Zwei Dict-Lookups statt Listen-Suche und String-Vergleichen pro Track-Paar
+        return self.harmonic_scores.get(camelot1, {}).get(camelot2, 0.1)  # 0.1: nicht kompatibel
     
     def _trim_to_duration(self, tracks: List[Dict], target_seconds: int) -> List[Dict]:
         """Kürzt Playlist auf Zieldauer"""
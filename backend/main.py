@@ -24,6 +24,7 @@ sys.path.insert(0, str(backend_root))
 
 from config.settings import settings
 from api.endpoints import tracks, playlists, analysis, config
+from core_engine.data_management.database_manager import close_all_conns
 
 # Configure logging
 logging.basicConfig(
@@ -55,6 +56,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("[INFO] Backend wird heruntergefahren...")
+    # Persistente Worker-Pools der Analyzer beenden (wartet auf laufende Analysen)
+    await asyncio.to_thread(tracks.close_analyzer)
+    await asyncio.to_thread(analysis.close_analyzer)
+    # get_conn-Connections aller Threads schließen (Checkpoint des WAL beim letzten close)
+    await asyncio.to_thread(close_all_conns)
 
 
 # Create FastAPI app
@@ -365,4 +365,20 @@ class TestAnalysisEndpoints:
             data = response.json()
             assert data["valid"] is True
             assert "audio_files_found" in data
-            assert "recommendation" in data
\ No newline at end of file
+            assert "recommendation" in data
+
+class TestLifespan:
+    """Test application startup/shutdown hooks"""
+    
+    def test_shutdown_closes_analyzers(self):
+        """Test that the analyzer worker pools are closed on shutdown"""
+        from fastapi.testclient import TestClient
+        from backend import main
+        
+        with patch.object(main.tracks, 'close_analyzer') as close_tracks, \
+             patch.object(main.analysis, 'close_analyzer') as close_analysis:
+            with TestClient(main.app):
+                close_tracks.assert_not_called()
+        
+        close_tracks.assert_called_once()
+        close_analysis.assert_called_once()
@@ -259,4 +259,106 @@ class TestAudioAnalyzerTimeSeries:
         timestamps = [point['timestamp'] for point in time_series_data]
         assert timestamps == sorted(timestamps)  # Should be in ascending order
         assert timestamps[0] == 0.0
-        assert timestamps[-1] == (expected_windows - 1) * 5.0
\ No newline at end of file
+        assert timestamps[-1] == (expected_windows - 1) * 5.0
+    
+    def test_rms_zcr_kernel_matches_numpy(self):
+        """Test that the fused RMS/ZCR kernel matches the NumPy fallback"""
+        from backend.core_engine.audio_analysis.analyzer import (
+            _rms_zcr_per_window, _rms_zcr_per_window_numpy
+        )
+        
+        y = np.random.RandomState(0).randn(10000).astype(np.float32)
+        starts = np.array([0, 4000, 8000], dtype=np.int64)
+        ends = np.array([4000, 8000, 10000], dtype=np.int64)
+        
+        rms, zcr = _rms_zcr_per_window(y, starts, ends)
+        rms_ref, zcr_ref = _rms_zcr_per_window_numpy(y, starts, ends)
+        
+        np.testing.assert_allclose(rms, rms_ref, rtol=1e-6)
+        np.testing.assert_allclose(zcr, zcr_ref)
+        assert np.all((zcr > 0.3) & (zcr < 0.7))  # Rauschen: ~50% Vorzeichenwechsel
+    
+    def test_rms_zcr_falls_back_when_kernel_fails(self):
+        """Test that a failing JIT dispatcher falls back to the NumPy implementation"""
+        import backend.core_engine.audio_analysis.analyzer as analyzer_module
+        
+        y = np.random.RandomState(1).randn(2000).astype(np.float32)
+        starts = np.array([0, 1000], dtype=np.int64)
+        ends = np.array([1000, 2000], dtype=np.int64)
+        broken = Mock(side_effect=ModuleNotFoundError("No module named 'backend'"))
+        
+        with patch.object(analyzer_module, '_rms_zcr_kernel', broken, create=True):
+            rms, zcr = analyzer_module._rms_zcr_per_window(y, starts, ends)
+        
+        rms_ref, zcr_ref = analyzer_module._rms_zcr_per_window_numpy(y, starts, ends)
+        np.testing.assert_allclose(rms, rms_ref)
+        np.testing.assert_allclose(zcr, zcr_ref)
+    
+    def test_time_series_uses_single_stft(self, mock_audio_analyzer):
+        """Test that all windows come from one STFT without per-window librosa feature calls"""
+        from backend.core_engine.audio_analysis import analyzer as analyzer_module
+        
+        sr = 22050
+        y = (0.1 * np.random.RandomState(2).randn(sr * 30)).astype(np.float32)
+        
+        with patch.object(analyzer_module, '_magnitude_stft', wraps=analyzer_module._magnitude_stft) as stft_spy, \
+             patch('librosa.feature.rms') as rms_mock, \
+             patch('librosa.feature.zero_crossing_rate') as zcr_mock, \
+             patch('librosa.feature.spectral_centroid') as centroid_mock:
+            time_series_data = mock_audio_analyzer._extract_time_series_features(y, sr, window_seconds=5.0)
+        
+        assert len(time_series_data) == 6
+        stft_spy.assert_called_once()
+        rms_mock.assert_not_called()
+        zcr_mock.assert_not_called()
+        centroid_mock.assert_not_called()
+    
+    def test_zcr_counts_crossings_per_window(self):
+        """Test that crossings are attributed to the window containing the later sample"""
+        from backend.core_engine.audio_analysis.analyzer import _rms_zcr_per_window_numpy
+        
+        y = np.array([1, -1, 1, 1, -1, -1, 1, 1], dtype=np.float32)
+        starts = np.array([0, 4], dtype=np.int64)
+        ends = np.array([4, 8], dtype=np.int64)
+        
+        _, zcr = _rms_zcr_per_window_numpy(y, starts, ends)
+        
+        np.testing.assert_allclose(zcr, [2 / 4, 2 / 4])
+    
+    def test_magnitude_stft_matches_librosa(self):
+        """Test that the direct scipy.fft STFT matches librosa.stft"""
+        import librosa
+        from backend.core_engine.audio_analysis.analyzer import _magnitude_stft
+        
+        y = np.random.RandomState(0).randn(20000).astype(np.float32)
+        
+        expected = np.abs(librosa.stft(y, n_fft=2048, hop_length=512))
+        actual = _magnitude_stft(y, 2048, 512)
+        
+        assert actual.shape == expected.shape
+        assert actual.dtype == np.float32
+        np.testing.assert_allclose(actual, expected, atol=1e-3)
+        # overwrite_x darf nur die temporäre gefensterte Kopie betreffen
+        np.testing.assert_array_equal(y, np.random.RandomState(0).randn(20000).astype(np.float32))
+    
+    def test_extract_features_batch_decodes_then_batches(self, mock_audio_analyzer, tmp_path):
+        """Test that file batches are decoded in parallel and extracted in one batch call"""
+        import soundfile as sf
+        
+        sr = mock_audio_analyzer.import_config['analysis_sample_rate']
+        paths = []
+        for i, seconds in enumerate((1.0, 2.0)):
+            path = tmp_path / f"track_{i}.wav"
+            sf.write(path, 0.1 * np.random.RandomState(i).randn(int(sr * seconds)), sr)
+            paths.append(str(path))
+        broken = tmp_path / "broken.wav"
+        broken.write_bytes(b"not audio")
+        
+        extractor = mock_audio_analyzer.feature_extractor
+        extractor.extract_all_features_batch.side_effect = lambda signals, sr: [{'n': len(y)} for y in signals]
+        
+        results = mock_audio_analyzer.extract_features_batch(paths + [str(broken)])
+        
+        assert extractor.extract_all_features_batch.call_count == 1
+        assert set(results) == set(paths)
+        assert results[paths[1]]['n'] > results[paths[0]]['n']
@@ -4,6 +4,7 @@ Unit test cases for core engine components
 
 import pytest
 import asyncio
+import os
 import tempfile
 from unittest.mock import Mock, patch, AsyncMock
 from pathlib import Path
@@ -18,6 +19,15 @@ from backend.core_engine.data_management.cache_manager import CacheManager
 from backend.core_engine.export.playlist_exporter import PlaylistExporter
 
 
+def _write_tone(path, freq: float, seconds: float = 6.0, sr: int = 22050) -> str:
+    """Schreibt einen gepulsten Sinuston als WAV (echte Eingabe für analyze_track)"""
+    import soundfile as sf
+    t = np.arange(int(seconds * sr)) / sr
+    pulses = (np.sin(2 * np.pi * 2 * t) > 0).astype(np.float32)
+    sf.write(str(path), (0.3 * np.sin(2 * np.pi * freq * t) * pulses).astype(np.float32), sr)
+    return str(path)
+
+
 class TestAudioAnalyzer:
     """Test AudioAnalyzer core functionality"""
     
@@ -68,6 +78,18 @@ class TestAudioAnalyzer:
         assert result['status'] == 'error'
         assert len(result['errors']) > 0
     
+    def test_analyze_track_rejects_before_decoding(self, analyzer, tmp_path):
+        """Test that tiny or unsupported files never reach the decoder"""
+        tiny = tmp_path / "tiny.wav"
+        tiny.write_bytes(b"\x00" * 100)
+        unsupported = tmp_path / "notes.txt"
+        unsupported.write_bytes(b"\x00" * 4096)
+        
+        with patch.object(analyzer, '_load_audio') as mock_load:
+            assert analyzer.analyze_track(str(tiny))['status'] == 'fallback'
+            assert analyzer.analyze_track(str(unsupported))['status'] == 'error'
+            mock_load.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_analyze_batch_async(self, analyzer, mock_audio_file):
         """Test batch analysis"""
@@ -89,6 +111,421 @@ class TestAudioAnalyzer:
             assert mock_audio_file in results
             progress_callback.assert_called()
     
+    @pytest.mark.asyncio
+    async def test_analyze_batch_async_thread_pool(self, analyzer):
+        """Test parallel batch analysis reports progress for every file"""
+        analyzer.enable_multiprocessing = True
+        analyzer.executor_backend = 'thread'  # Mocks gelten nur im eigenen Prozess
+        file_paths = ['/music/a.mp3', '/music/b.mp3', '/music/c.mp3']
+        
+        with patch.object(analyzer, 'analyze_track', side_effect=lambda fp: {
+            'status': 'completed', 'file_path': fp, 'features': {}
+        }):
+            progress_callback = AsyncMock()
+            results = await analyzer.analyze_batch_async(file_paths, progress_callback)
+        
+        assert set(results) == set(file_paths)
+        assert progress_callback.await_count == len(file_paths)
+    
+    @pytest.mark.asyncio
+    async def test_analyze_batch_async_skips_unsupported(self, analyzer, tmp_path):
+        """Test unsupported files are skipped before dispatch but still reported"""
+        analyzer.enable_multiprocessing = True
+        analyzer.executor_backend = 'thread'  # Mocks gelten nur im eigenen Prozess
+        supported = [tmp_path / "a.mp3", tmp_path / "b.wav"]
+        unsupported = tmp_path / "cover.jpg"
+        for path in supported + [unsupported]:
+            path.write_bytes(b"\x00" * 16)
+        file_paths = [str(p) for p in supported + [unsupported]]
+        
+        with patch.object(analyzer, 'analyze_track', side_effect=lambda fp: {
+            'status': 'completed', 'file_path': fp, 'features': {}
+        }) as mock_analyze:
+            progress_callback = AsyncMock()
+            results = await analyzer.analyze_batch_async(file_paths, progress_callback)
+        
+        assert mock_analyze.call_count == 2
+        assert results[str(unsupported)]['status'] == 'skipped'
+        assert progress_callback.await_count == 3
+        assert progress_callback.await_args.args[:2] == (3, 3)
+    
+    @pytest.mark.asyncio
+    async def test_analyze_batch_async_writes_behind(self, analyzer):
+        """Test that batch results are written in one bulk DB call"""
+        analyzer.enable_multiprocessing = True
+        analyzer.executor_backend = 'thread'  # Mocks gelten nur im eigenen Prozess
+        file_paths = ['/music/a.mp3', '/music/b.mp3', '/music/c.mp3']
+        
+        def fake_analyze(fp):
+            result = {'status': 'completed', 'file_path': fp, 'features': {}}
+            analyzer.save_analysis_results(fp, result)
+            return result
+        
+        with patch.object(analyzer, 'analyze_track', side_effect=fake_analyze), \
+             patch.object(analyzer.database_manager, 'save_to_cache') as mock_save, \
+             patch.object(analyzer.database_manager, 'save_many_to_cache', return_value=3) as mock_save_many:
+            await analyzer.analyze_batch_async(file_paths)
+        
+        mock_save.assert_not_called()
+        mock_save_many.assert_called_once()
+        assert {item[0] for item in mock_save_many.call_args[0][0]} == set(file_paths)
+    
+    @pytest.mark.asyncio
+    async def test_analyze_batch_async_db_writes_off_event_loop(self, analyzer):
+        """Test that the batch-end DB commit does not run on the event-loop thread"""
+        import threading
+        analyzer.enable_multiprocessing = True
+        analyzer.executor_backend = 'thread'  # Mocks gelten nur im eigenen Prozess
+        loop_thread = threading.current_thread()
+        write_threads = []
+        
+        with patch.object(analyzer, 'analyze_track', side_effect=lambda fp: {
+            'status': 'completed', 'file_path': fp, 'features': {}
+        }), patch.object(analyzer, '_flush_now',
+                         side_effect=lambda: write_threads.append(threading.current_thread())):
+            await analyzer.analyze_batch_async(['/music/a.mp3', '/music/b.mp3'])
+        
+        assert len(write_threads) == 1
+        assert loop_thread not in write_threads
+    
+    def test_db_insert_results_bulk_single_transaction(self, tmp_path):
+        """Test that completed analyze_track results are saved together and others skipped"""
+        from backend.core_engine.audio_analysis import analyzer as analyzer_module
+        from backend.core_engine.data_management.database_manager import DatabaseManager
+        
+        source = AudioAnalyzer(db_path=str(tmp_path / "source.db"), enable_multiprocessing=False)
+        results = [source.analyze_track(_write_tone(tmp_path / name, freq))
+                   for name, freq in (("a.wav", 440.0), ("b.wav", 330.0))]
+        assert [r['status'] for r in results] == ['completed', 'completed']
+        results.append({'file_path': str(tmp_path / "c.wav"), 'errors': ['kaputt'], 'status': 'error'})
+        
+        db = DatabaseManager(str(tmp_path / "tracks.db"))
+        with patch.object(db, 'save_many_to_cache', wraps=db.save_many_to_cache) as save_many:
+            assert analyzer_module.db_insert_results_bulk(results, db) == 2
+        
+        save_many.assert_called_once()
+        for result in results[:2]:
+            loaded = db.load_from_cache(result['file_path'])
+            assert loaded['camelot']['key'] == result['camelot']['key']
+            assert loaded['camelot']['camelot'] == result['camelot']['camelot']
+            assert loaded['mood']['primary_mood'] == result['mood']['primary_mood']
+            assert loaded['features']['bpm'] == pytest.approx(result['features']['bpm'])
+        assert not db.is_cached(str(tmp_path / "c.wav"))
+        db.close()
+        source.database_manager.close()
+    
+    @pytest.mark.asyncio
+    async def test_reanalysis_and_renamed_copy_hit_content_hash_cache(self, tmp_path):
+        """Test end to end that a real WAV, re-analyzed and copied under a new name, hits the cache"""
+        import shutil
+        analyzer = AudioAnalyzer(db_path=str(tmp_path / "cache.db"), enable_multiprocessing=True)
+        analyzer.executor_backend = 'thread'
+        wav = _write_tone(tmp_path / "track.wav", 440.0)
+        
+        # Erste Analyse über den Batch-Pfad (Write-Behind-Puffer, gepackte Zeitreihe)
+        first = (await analyzer.analyze_batch_async([wav]))[wav]
+        assert first['status'] == 'completed'
+        assert analyzer.is_cached(wav)
+        
+        again = analyzer.analyze_track(wav)
+        copy = str(tmp_path / "renamed copy.wav")
+        shutil.copyfile(wav, copy)
+        copied = analyzer.analyze_track(copy)
+        
+        assert analyzer.analysis_stats['total_analyzed'] == 1
+        assert analyzer.analysis_stats['cache_hits'] == 2
+        assert copied['file_path'] == copy
+        assert analyzer.is_cached(copy)
+        for cached in (again, copied):
+            assert cached['camelot']['camelot'] == first['camelot']['camelot']
+            assert cached['mood']['primary_mood'] == first['mood']['primary_mood']
+            assert len(cached['time_series_features']) == len(first['time_series_features'])
+        analyzer.close()
+        analyzer.database_manager.close()
+    
+    def test_silent_track_skips_key_estimation(self, tmp_path):
+        """Test that near-silent audio keeps key 'Unknown' without running estimate_key"""
+        import soundfile as sf
+        wav = str(tmp_path / "hiss.wav")
+        sf.write(wav, (1e-5 * np.random.RandomState(3).randn(22050 * 4)).astype(np.float32), 22050)
+        analyzer = AudioAnalyzer(db_path=str(tmp_path / "silent.db"), enable_multiprocessing=False)
+        
+        with patch.object(analyzer.feature_extractor, 'estimate_key') as estimate_key:
+            result = analyzer.analyze_track(wav)
+        
+        estimate_key.assert_not_called()
+        assert result['features']['silent'] is True
+        assert result['camelot']['key'] == 'Unknown'
+        analyzer.database_manager.close()
+    
+    def test_deferred_writes_are_handed_back(self, analyzer):
+        """Test that worker-process analyzers collect writes instead of touching the DB"""
+        analyzer.defer_writes = True
+        result = {'status': 'completed', 'file_path': '/music/a.mp3', 'features': {}}
+        
+        with patch.object(analyzer.database_manager, 'save_to_cache') as mock_save, \
+             patch.object(analyzer.database_manager, 'save_many_to_cache') as mock_save_many:
+            analyzer.save_analysis_results('/music/a.mp3', result, 'abc123')
+        
+        mock_save.assert_not_called()
+        mock_save_many.assert_not_called()
+        assert analyzer._drain_writes() == [('/music/a.mp3', result, 'abc123')]
+        assert analyzer._drain_writes() == []
+    
+    def test_executor_is_persistent(self, analyzer):
+        """Test that the worker pool is reused across batches until close()"""
+        executor = analyzer._get_executor()
+        assert analyzer._get_executor() is executor
+        
+        analyzer.close()
+        assert analyzer._executor is None
+    
+    def test_thread_backend_lends_pooled_extractors(self, analyzer):
+        """Test that thread workers borrow their own FeatureExtractor from the pool"""
+        with analyzer._borrow_extractor() as extractor:
+            assert extractor is analyzer.feature_extractor
+        
+        analyzer.executor_backend = 'thread'
+        analyzer._get_executor()
+        assert analyzer._extractor_pool.size == analyzer.max_workers
+        with analyzer._borrow_extractor() as extractor:
+            assert extractor is not analyzer.feature_extractor
+        
+        analyzer.close()
+        assert analyzer._extractor_pool is None
+    
+    def test_process_worker_init_warms_up_extractor(self, tmp_path):
+        """Test that each process worker runs one warm-up extraction at startup"""
+        from backend.core_engine.audio_analysis import analyzer as analyzer_module
+        from backend.core_engine.audio_analysis.feature_extractor import FeatureExtractor
+        
+        with patch.object(analyzer_module, '_process_analyzer', None), \
+                patch.object(analyzer_module, 'FFT_WORKERS', analyzer_module.FFT_WORKERS), \
+                patch.object(FeatureExtractor, 'extract_all_features', return_value={}) as warm_up:
+            analyzer_module._init_process_worker(str(tmp_path / "worker.db"))
+            worker = analyzer_module._process_analyzer
+            assert worker.defer_writes is True
+            
+        warm_up.assert_called_once()
+        y, sr = warm_up.call_args[0]
+        assert sr == worker.import_config['analysis_sample_rate'] and len(y) == sr
+    
+    def test_analysis_rate_and_memory_budget_reach_process_workers(self, tmp_path):
+        """Test that configured analysis rate/budget are used by the analyzer and its workers"""
+        from backend.core_engine.audio_analysis import analyzer as analyzer_module
+        from backend.core_engine.audio_analysis.feature_extractor import FeatureExtractor
+        
+        parent = AudioAnalyzer(db_path=str(tmp_path / "parent.db"), enable_multiprocessing=False,
+                               analysis_sample_rate=16000, max_analysis_memory_mb=64)
+        assert parent._max_analysis_seconds() == pytest.approx(64 * 1024 * 1024 / (4 * 16000))
+        
+        with patch.object(analyzer_module, '_process_analyzer', None), \
+                patch.object(analyzer_module, 'FFT_WORKERS', analyzer_module.FFT_WORKERS), \
+                patch.object(FeatureExtractor, 'extract_all_features', return_value={}):
+            analyzer_module._init_process_worker(str(tmp_path / "worker.db"), parent._worker_kwargs())
+            worker = analyzer_module._process_analyzer
+        
+        assert worker.import_config['analysis_sample_rate'] == 16000
+        assert worker.import_config['max_analysis_memory_mb'] == 64
+    
+    def test_fingerprint_is_path_independent(self, tmp_path):
+        """Test that the content fingerprint survives a rename and detects edits"""
+        from backend.core_engine.audio_analysis.analyzer import _fingerprint
+        
+        data = np.random.RandomState(0).bytes(3 * 1024 * 1024)
+        original = tmp_path / "original.wav"
+        original.write_bytes(data)
+        renamed = tmp_path / "renamed.wav"
+        renamed.write_bytes(data)
+        edited = tmp_path / "edited.wav"
+        edited.write_bytes(data[:-1] + b"\x00")
+        
+        assert _fingerprint(str(original)) == _fingerprint(str(renamed))
+        assert _fingerprint(str(original)) != _fingerprint(str(edited))
+        # 128 Bit, unabhängig davon ob xxhash oder blake2b genutzt wird
+        assert len(_fingerprint(str(original))) == 32
+    
+    def test_fingerprint_includes_extractor_version(self, tmp_path):
+        """Test that bumping the feature extractor version invalidates cached fingerprints"""
+        from backend.core_engine.audio_analysis import analyzer as analyzer_module
+        
+        track = tmp_path / "track.wav"
+        track.write_bytes(b"RIFF" + bytes(1024))
+        before = analyzer_module._fingerprint(str(track))
+        
+        with patch.object(analyzer_module, 'FEATURE_EXTRACTOR_VERSION', 'test-bump'):
+            assert analyzer_module._fingerprint(str(track)) != before
+        assert analyzer_module._fingerprint(str(track)) == before
+    
+    def test_load_audio_downmixes_and_resamples(self, tmp_path):
+        """Test soundfile-based loading returns mono float32 at the target rate"""
+        import soundfile as sf
+        from backend.core_engine.audio_analysis.analyzer import load_audio
+        
+        stereo = (0.1 * np.random.randn(48000, 2)).astype(np.float32)
+        wav_path = tmp_path / "stereo_48k.wav"
+        sf.write(str(wav_path), stereo, 48000)
+        
+        y, sr = load_audio(str(wav_path), 44100)
+        
+        assert sr == 44100
+        assert y.ndim == 1
+        assert y.dtype == np.float32
+        assert abs(len(y) - 44100) <= 1
+    
+    def test_analyzer_loads_at_analysis_sample_rate(self, analyzer, tmp_path):
+        """Test tracks are decoded at the analysis rate, not the 44.1 kHz import rate"""
+        import soundfile as sf
+        
+        wav_path = tmp_path / "track_44k.wav"
+        sf.write(str(wav_path), np.zeros(44100, dtype=np.float32), 44100)
+        
+        y, sr = analyzer._load_audio(str(wav_path))
+        
+        assert sr == analyzer.import_config['analysis_sample_rate'] == 22050
+        assert abs(len(y) - 22050) <= 1
+    
+    def test_load_audio_skips_resampling_at_native_rate(self, tmp_path):
+        """Test that files already at the target rate are returned without resampling"""
+        import soundfile as sf
+        from backend.core_engine.audio_analysis import analyzer as analyzer_module
+        
+        wav_path = tmp_path / "native.wav"
+        sf.write(str(wav_path), np.zeros(22050, dtype=np.float32), 22050)
+        
+        with patch.object(analyzer_module, 'soxr', create=True) as mock_soxr, \
+             patch('librosa.resample') as mock_resample:
+            y, sr = analyzer_module.load_audio(str(wav_path), 22050)
+        
+        assert (len(y), sr) == (22050, 22050)
+        mock_soxr.resample.assert_not_called()
+        mock_resample.assert_not_called()
+    
+    def test_load_audio_limits_to_center_excerpt(self, tmp_path):
+        """Test that max_seconds decodes only a centered excerpt"""
+        import soundfile as sf
+        from backend.core_engine.audio_analysis.analyzer import load_audio
+        
+        sr = 8000
+        ramp = np.repeat(np.arange(10, dtype=np.float32) / 10, sr)  # 10 s, Stufe pro Sekunde
+        wav_path = tmp_path / "ramp.wav"
+        sf.write(str(wav_path), ramp, sr, subtype='FLOAT')
+        
+        y, out_sr = load_audio(str(wav_path), sr, max_seconds=2.0)
+        
+        assert out_sr == sr
+        assert len(y) == 2 * sr
+        assert y[0] == pytest.approx(0.4)
+        assert y[-1] == pytest.approx(0.5)
+    
+    def test_load_audio_excerpt_memory_scales_with_analysis_rate(self, tmp_path):
+        """Test that a 48 kHz excerpt is resampled block-wise, not buffered at the native rate"""
+        import tracemalloc
+        import soundfile as sf
+        from backend.core_engine.audio_analysis import analyzer as analyzer_module
+        
+        wav_path = tmp_path / "long_48k.wav"
+        sf.write(str(wav_path), (0.1 * np.random.RandomState(5).randn(48000 * 30, 2)).astype(np.float32), 48000)
+        out_bytes = 20 * 22050 * 4
+        
+        with patch.object(analyzer_module, 'LOAD_BLOCK_SECONDS', 1):
+            tracemalloc.start()
+            try:
+                y, sr = analyzer_module.load_audio(str(wav_path), 22050, max_seconds=20.0)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        
+        assert sr == 22050
+        assert len(y) >= 20 * 22050
+        # Ein Puffer mit Analyse-Rate plus ein Block, kein 48-kHz-Puffer samt Kopie
+        assert peak < 2 * out_bytes
+    
+    def test_trim_silence_matches_librosa(self):
+        """Test the single-pass trim finds the same boundaries as librosa.effects.trim"""
+        import librosa
+        from backend.core_engine.audio_analysis.analyzer import _trim_silence
+        
+        sr = 22050
+        tone = 0.5 * np.sin(np.arange(sr * 2) * 0.05)
+        y = np.concatenate([np.zeros(sr), tone, np.zeros(sr)]).astype(np.float32)
+        
+        trimmed = _trim_silence(y, top_db=20)
+        expected, _ = librosa.effects.trim(y, top_db=20)
+        
+        assert abs(len(trimmed) - len(expected)) <= 2048
+        assert len(_trim_silence(np.zeros(sr, dtype=np.float32))) == 0
+    
+    def test_normalize_inplace_matches_librosa(self):
+        """Test that in-place peak normalisation matches librosa.util.normalize without copying"""
+        import librosa
+        from backend.core_engine.audio_analysis.analyzer import _normalize_inplace
+        
+        y = (0.3 * np.random.RandomState(5).randn(4096)).astype(np.float32)
+        expected = librosa.util.normalize(y)
+        
+        out = _normalize_inplace(y)
+        assert out is y
+        np.testing.assert_allclose(out, expected, rtol=1e-6)
+        silent = np.zeros(16, dtype=np.float32)
+        assert not _normalize_inplace(silent).any()
+    
+    def test_quick_validate_extension_and_size(self, analyzer):
+        """Test format/size checks work from a given stat result"""
+        small = os.stat_result((0,) * 6 + (1024,) + (0,) * 3)
+        huge = os.stat_result((0,) * 6 + (10 * 1024 ** 3,) + (0,) * 3)
+        
+        assert analyzer._quick_validate('/music/track.MP3', small) is True
+        assert analyzer._quick_validate('/music/track.mp3', huge) is False
+        assert analyzer._quick_validate('/music/album.mp3/track', small) is False
+        assert analyzer._quick_validate('/music/notes.txt', small) is False
+    
+    def test_validate_audio_file_uses_metadata(self, analyzer, tmp_path):
+        """Test validation reads headers only and rejects undecodable files"""
+        import soundfile as sf
+        
+        wav_path = tmp_path / "valid.wav"
+        sf.write(str(wav_path), np.zeros(4410, dtype=np.float32), 44100)
+        
+        broken_path = tmp_path / "broken.mp3"
+        broken_path.write_bytes(b"not audio" * 200)
+        
+        with patch('librosa.load') as mock_load:
+            assert analyzer.validate_audio_file(str(wav_path)) is True
+            assert analyzer.validate_audio_file(str(broken_path)) is False
+            mock_load.assert_not_called()
+    
+    def test_feature_extraction_uses_fft_workers(self, analyzer, tmp_path):
+        """Test that librosa's scipy.fft calls run with the configured FFT thread count"""
+        import scipy.fft
+        import soundfile as sf
+        from backend.core_engine.audio_analysis import analyzer as analyzer_module
+        
+        wav_path = tmp_path / "tone.wav"
+        t = np.arange(22050 * 2) / 22050
+        sf.write(str(wav_path), (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), 22050)
+        seen_workers = []
+        
+        def fake_extract(y, sr, ctx=None):
+            seen_workers.append(scipy.fft.get_workers())
+            return {}
+        
+        with patch.object(analyzer_module, 'FFT_WORKERS', 2), \
+             patch.object(analyzer.feature_extractor, 'extract_all_features', side_effect=fake_extract), \
+             patch.object(analyzer, 'save_analysis_results'):
+            analyzer.analyze_track(str(wav_path))
+        
+        assert seen_workers == [2]
+    
+    def test_analysis_stats_view_is_read_only(self, analyzer):
+        """Test stats are exposed as a live, read-only view"""
+        stats = analyzer.get_analysis_stats()
+        
+        with pytest.raises(TypeError):
+            stats['errors'] = 5
+        analyzer._bump_stat('errors')
+        assert stats['errors'] == 1
+    
     def test_get_analysis_stats(self, analyzer):
         """Test getting analysis statistics"""
         stats = analyzer.get_analysis_stats()
@@ -113,6 +550,19 @@ class TestPlaylistEngine:
         assert hasattr(playlist_engine, 'presets')
         assert hasattr(playlist_engine, 'algorithms')
     
+    def test_harmonic_score_table(self, playlist_engine):
+        """Test the precomputed harmonic scores against the compatibility matrix"""
+        score = playlist_engine._calculate_harmonic_score
+        
+        assert score('8A', '8A', []) == 1.0
+        assert score('8A', '8B', []) == 0.9   # relative Dur/Moll
+        assert score('8A', '9A', []) == 0.7   # Quintenzirkel
+        assert score('12B', '2B', []) == 0.7  # +2 mit Umlauf
+        assert score('8A', '3B', []) == 0.1
+        assert score('Unknown', '8A', []) == 0.1
+        for key, compatible_keys in playlist_engine.camelot_compatibility.items():
+            assert all(score(key, other, []) in (0.7, 0.9) for other in compatible_keys)
+    
     def test_get_all_presets(self, playlist_engine):
         """Test getting all presets"""
         presets = playlist_engine.get_all_presets()
@@ -271,6 +721,64 @@ class TestCacheManager:
         assert loaded_data is not None
         assert loaded_data['file_path'] == file_path
     
+    def test_file_hash_tracks_size_and_mtime(self, cache_manager, tmp_path):
+        """Test that the cache key is stable and changes when the file is modified"""
+        track = tmp_path / "track.mp3"
+        track.write_bytes(b"\x00" * 32)
+        first = cache_manager.get_file_hash(str(track))
+        
+        assert cache_manager.get_file_hash(str(track)) == first
+        os.utime(track, (1_000_000, 1_000_000))
+        assert cache_manager.get_file_hash(str(track)) != first
+        # Fehlende Datei: Schlüssel nur aus dem Pfad, aber stabil
+        missing = str(tmp_path / "missing.mp3")
+        assert cache_manager.get_file_hash(missing) == cache_manager.get_file_hash(missing)
+    
+    def test_cache_round_trip_stats_track_once_per_call(self, cache_manager, tmp_path):
+        """Test that each public call stats the track once and reuses the memoized key"""
+        track = tmp_path / "track.mp3"
+        track.write_bytes(b"\x00" * 64)
+        assert cache_manager.save_to_cache(str(track), {'bpm': 128.0}) is True
+        
+        real_stat = os.stat
+        track_stats = []
+        def counting_stat(path, *args, **kwargs):
+            if os.fspath(path) == str(track):
+                track_stats.append(path)
+            return real_stat(path, *args, **kwargs)
+        
+        with patch('backend.core_engine.data_management.cache_manager.os.stat', side_effect=counting_stat), \
+             patch('backend.core_engine.data_management.cache_manager.hashlib.md5') as md5_spy, \
+             patch('backend.core_engine.data_management.cache_manager.xxhash', create=True) as xxh_spy:
+            assert cache_manager.load_from_cache(str(track)) == {'bpm': 128.0}
+        
+        assert len(track_stats) == 1
+        md5_spy.assert_not_called()
+        xxh_spy.xxh3_64.assert_not_called()
+        
+        # Geänderte Datei: neuer Schlüssel, alter Eintrag gilt nicht mehr
+        os.utime(track, (1_000_000, 1_000_000))
+        assert cache_manager.is_cached(str(track)) is False
+    
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_cache_files_stay_indented_json(self, cache_manager, tmp_path, use_orjson):
+        """Test that cache files are plain indented JSON with or without orjson"""
+        import json
+        from backend.core_engine.data_management import cache_manager as cache_module
+        
+        track = tmp_path / "Grüße.mp3"
+        track.write_bytes(b"\x00" * 16)
+        analysis = {'title': 'Grüße', 'bpm': np.float64(128.0), 'scores': [0.5, 1.0]}
+        
+        with patch.object(cache_module, 'ORJSON_AVAILABLE', use_orjson and cache_module.ORJSON_AVAILABLE):
+            assert cache_manager.save_to_cache(str(track), analysis) is True
+            loaded = cache_manager.load_from_cache(str(track))
+        
+        assert loaded == {'title': 'Grüße', 'bpm': 128.0, 'scores': [0.5, 1.0]}
+        text = cache_manager.get_cache_path(str(track)).read_text(encoding='utf-8')
+        assert 'Grüße' in text and '\n  "' in text
+        assert json.loads(text)['analysis_data']['bpm'] == 128.0
+    
     def test_get_cache_stats(self, cache_manager):
         """Test getting cache statistics"""
         stats = cache_manager.get_cache_stats()
@@ -317,6 +317,183 @@ class TestDatabaseManager:
         
         db_manager.close()
     
+    def test_load_from_cache_by_content_hash(self, test_database_file):
+        """Test that a moved file is found via its content hash"""
+        db_manager = DatabaseManager(test_database_file)
+        
+        analysis_result = {
+            'features': {'bpm': 126.0, 'energy': 0.7},
+            'metadata': {'filename': 'old.mp3', 'duration': 180.0, 'file_size': 1024, 'extension': '.mp3'}
+        }
+        assert db_manager.save_to_cache('/music/old.mp3', analysis_result, 'abc123') is True
+        
+        # Gleicher Pfad, geänderter Inhalt -> kein Treffer
+        assert db_manager.load_from_cache('/music/old.mp3', 'def456') is None
+        
+        # Pfad-Lookup ohne Hash bleibt kompatibel
+        assert db_manager.load_from_cache('/music/old.mp3') is not None
+        
+        # Neuer Pfad, gleicher Inhalt (alter Pfad existiert nicht mehr -> Zeile wird umbenannt)
+        loaded_data = db_manager.load_from_cache('/music/moved/new.mp3', 'abc123')
+        assert loaded_data is not None
+        assert loaded_data['file_path'] == '/music/moved/new.mp3'
+        assert loaded_data['filename'] == 'new.mp3'
+        assert loaded_data['features']['bpm'] == 126.0
+        assert db_manager.is_cached('/music/moved/new.mp3')
+        assert not db_manager.is_cached('/music/old.mp3')
+        
+        db_manager.close()
+    
+    def test_load_from_cache_hash_hit_for_copy(self, test_database_file, tmp_path):
+        """Test that a copied file gets its own row while the original stays cached"""
+        db_manager = DatabaseManager(test_database_file)
+        original = tmp_path / "original.mp3"
+        original.write_bytes(b"audio")
+        copy = str(tmp_path / "copy.mp3")
+        
+        analysis_result = {
+            'features': {'bpm': 98.0, 'energy': 0.4},
+            'metadata': {'duration': 200.0, 'file_size': 5, 'extension': '.mp3'}
+        }
+        assert db_manager.save_to_cache(str(original), analysis_result, 'abc123') is True
+        
+        loaded_data = db_manager.load_from_cache(copy, 'abc123')
+        assert loaded_data['file_path'] == copy
+        assert db_manager.is_cached(copy)
+        assert db_manager.is_cached(str(original))
+        assert db_manager.load_from_cache(copy)['features']['bpm'] == 98.0
+        
+        db_manager.close()
+    
+    def test_save_many_to_cache(self, test_database_file):
+        """Test bulk saving in one transaction, skipping broken entries"""
+        db_manager = DatabaseManager(test_database_file)
+        
+        items = [
+            (f'/music/{i}.mp3', {
+                'features': {'bpm': 120.0 + i},
+                'metadata': {'duration': 180.0, 'file_size': 1024},
+                'time_series_features': [{'timestamp': 0.0, 'energy_value': 0.5}]
+            }, f'hash{i}')
+            for i in range(3)
+        ]
+        # Nicht bindbarer Wert -> nur dieser Eintrag wird verworfen
+        items[1][1]['metadata']['title'] = ('not', 'bindable')
+        
+        assert db_manager.save_many_to_cache(items) == 2
+        assert db_manager.load_from_cache('/music/0.mp3')['features']['bpm'] == 120.0
+        assert db_manager.load_from_cache('/music/1.mp3') is None
+        assert len(db_manager.load_from_cache('/music/2.mp3', 'hash2')['time_series_features']) == 1
+        
+        db_manager.close()
+    
+    def test_save_columnar_time_series(self, test_database_file):
+        """Test that column-wise time series (NumPy arrays) are stored like point lists"""
+        import numpy as np
+        db_manager = DatabaseManager(test_database_file)
+        
+        analysis = {
+            'features': {'bpm': 120.0},
+            'metadata': {'duration': 10.0, 'file_size': 1024},
+            'time_series_features': {
+                'timestamp': np.array([0.0, 5.0]),
+                'energy_value': np.array([0.25, 0.5], dtype=np.float32),
+                'rms_energy': np.array([0.25, 0.5], dtype=np.float32),
+            }
+        }
+        
+        assert db_manager.save_to_cache('/music/columns.mp3', analysis)
+        points = db_manager.load_from_cache('/music/columns.mp3')['time_series_features']
+        assert [p['timestamp'] for p in points] == [0.0, 5.0]
+        assert [p['energy_value'] for p in points] == [0.25, 0.5]
+        assert points[0]['brightness_value'] is None
+        
+        db_manager.close()
+    
+    def test_time_series_stored_packed(self, test_database_file):
+        """Test that cached time series are stored as one float16 BLOB row per track"""
+        db_manager = DatabaseManager(test_database_file)
+        points = [{'timestamp': float(t), 'energy_value': 0.1 * t, 'brightness_value': 1800.0 + t,
+                   'spectral_rolloff': 4200.0, 'rms_energy': None} for t in range(0, 50, 5)]
+        
+        assert db_manager.save_to_cache('/music/packed.mp3', {
+            'features': {'bpm': 120.0},
+            'metadata': {'duration': 50.0, 'file_size': 1024},
+            'time_series_features': points
+        })
+        
+        cursor = db_manager._get_connection().cursor()
+        cursor.execute("SELECT COUNT(*) FROM time_series_features")
+        assert cursor.fetchone()[0] == 0
+        cursor.execute("SELECT n_points, length(values_f16) FROM time_series_packed")
+        assert tuple(cursor.fetchone()) == (10, 10 * 4 * 2)
+        
+        loaded = db_manager.load_from_cache('/music/packed.mp3')['time_series_features']
+        assert [p['timestamp'] for p in loaded] == [p['timestamp'] for p in points]
+        assert loaded[3]['energy_value'] == pytest.approx(1.5, rel=1e-3)
+        assert loaded[3]['brightness_value'] == pytest.approx(1815.0, rel=1e-3)
+        assert loaded[3]['rms_energy'] is None
+        
+        track_id = db_manager.get_track_by_path('/music/packed.mp3').id
+        records = db_manager.get_time_series_data(track_id)
+        assert len(records) == 10
+        assert records[-1].timestamp == 45.0
+        
+        db_manager.close()
+    
+    def test_get_conn_reuses_tuned_connection(self, tmp_path):
+        """Test that get_conn keeps one tuned connection per thread and path"""
+        from backend.core_engine.data_management.database_manager import get_conn, close_thread_conns
+        db_path = str(tmp_path / "reuse.db")
+        
+        with get_conn(db_path) as first:
+            assert first.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            assert first.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        with get_conn(db_path) as second:
+            assert second is first
+        
+        close_thread_conns()
+        with get_conn(db_path) as third:
+            assert third is not first
+        close_thread_conns()
+    
+    def test_close_all_conns_closes_other_threads(self, tmp_path):
+        """Test that close_all_conns closes worker-thread connections and get_conn reopens"""
+        import sqlite3
+        import threading
+        from backend.core_engine.data_management.database_manager import get_conn, close_all_conns
+        db_path = str(tmp_path / "shutdown.db")
+        opened = []
+        
+        def worker():
+            with get_conn(db_path) as conn:
+                opened.append(conn)
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        with get_conn(db_path) as own:
+            opened.append(own)
+        
+        close_all_conns()
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+        with get_conn(db_path) as reopened:
+            assert reopened is not own
+            assert reopened.execute("SELECT 1").fetchone()[0] == 1
+        close_all_conns()
+    
+    def test_content_hash_migration(self, test_database_file):
+        """Test that an existing tracks table gains the content_hash column"""
+        # Die Fixture legt das Schema ohne content_hash an (wie bestehende Datenbanken)
+        db_manager = DatabaseManager(test_database_file)
+        cursor = db_manager._get_connection().cursor()
+        cursor.execute("PRAGMA table_info(tracks)")
+        assert 'content_hash' in [col[1] for col in cursor.fetchall()]
+        
+        db_manager.close()
+    
     def test_get_all_tracks_with_filters(self, test_database_file):
         """Test getting tracks with filters"""
         db_manager = DatabaseManager(test_database_file)
@@ -0,0 +1,697 @@
+"""
+Unit tests for FeatureExtractor helpers and extraction paths
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import numpy as np
+import librosa
+import scipy.fft
+from unittest.mock import MagicMock, patch
+
+from backend.core_engine.audio_analysis.feature_extractor import (
+    FeatureExtractor,
+    FeatureExtractorPool,
+    _AnalysisContext,
+    _get_context,
+    _stats1d_numpy,
+    batch_stft_mag,
+    frame_rms,
+    frame_zcr,
+    MAJOR_PROFILE,
+    MINOR_PROFILE,
+    get_center_excerpt,
+    key_profile_correlations,
+    mel_basis,
+    stats1d,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.audio
+class TestFeatureExtractor:
+    """Test FeatureExtractor behaviour that does not depend on real audio files"""
+
+    @pytest.fixture
+    def extractor(self):
+        """FeatureExtractor ohne optionale Backends"""
+        return FeatureExtractor(use_essentia=False, use_gpu=False)
+
+    def test_center_excerpt_is_centered(self):
+        """Test that the key excerpt is taken from the middle of the signal"""
+        sr = 100
+        y = np.arange(300 * sr, dtype=np.float32)
+
+        excerpt = get_center_excerpt(y, sr, seconds=60.0)
+
+        assert len(excerpt) == 60 * sr
+        assert excerpt[0] == 120 * sr
+
+    def test_center_excerpt_short_signal_unchanged(self):
+        """Test that signals shorter than the excerpt are returned as-is"""
+        y = np.zeros(1000, dtype=np.float32)
+        assert get_center_excerpt(y, 100, seconds=60.0) is y
+
+    def test_key_profile_correlations_match_corrcoef(self):
+        """Test the 24-profile matrix correlation against per-profile np.corrcoef"""
+        chroma_mean = np.random.RandomState(3).rand(12)
+        expected = [np.corrcoef(chroma_mean, np.roll(MAJOR_PROFILE, i))[0, 1] for i in range(12)] + \
+                   [np.corrcoef(chroma_mean, np.roll(MINOR_PROFILE, i))[0, 1] for i in range(12)]
+        
+        np.testing.assert_allclose(key_profile_correlations(chroma_mean), expected, atol=1e-12)
+        np.testing.assert_allclose(key_profile_correlations(chroma_mean, [0, 12]),
+                                   [expected[0], expected[12]], atol=1e-12)
+        assert key_profile_correlations(chroma_mean, 0) == pytest.approx(expected[0], abs=1e-12)
+        assert np.isnan(key_profile_correlations(np.zeros(12))).all()
+        assert np.isnan(key_profile_correlations(np.zeros(12), 0))
+    
+    def test_key_paths_avoid_corrcoef(self, extractor):
+        """Test that tonal, perceptual and key estimation never fall back to np.corrcoef"""
+        sr = 22050
+        y = (0.3 * np.random.RandomState(43).randn(sr * 2)).astype(np.float32)
+        
+        with patch('numpy.corrcoef', side_effect=AssertionError('np.corrcoef used')):
+            ctx = _AnalysisContext(y, sr)
+            features = extractor.extract_all_features(y, sr, ctx=ctx)
+            extractor.estimate_key(y, sr, ctx=ctx)
+        
+        assert 'mode_confidence' in features and 'valence' in features
+    
+    def test_key_profile_correlations_match_circular_fft(self):
+        """Test that the 24 profile rows equal one circular cross-correlation per mode via rfft"""
+        chroma_mean = np.random.RandomState(5).rand(12)
+        z = (chroma_mean - chroma_mean.mean()) / chroma_mean.std()
+        
+        expected = []
+        for profile in (MAJOR_PROFILE, MINOR_PROFILE):
+            p = (profile - profile.mean()) / profile.std()
+            # corr[k] = sum_i z[i] * p[i - k]  (Profil um k Halbtöne verschoben)
+            expected.extend(np.fft.irfft(np.fft.rfft(z) * np.conj(np.fft.rfft(p)), n=12) / 12)
+        
+        np.testing.assert_allclose(key_profile_correlations(chroma_mean), expected, atol=1e-12)
+    
+    def test_frame_rms_matches_librosa(self):
+        """Test the cumulative-sum frame RMS against librosa.feature.rms incl. edges and batches"""
+        rng = np.random.RandomState(23)
+        for n in (0, 100, 2048, 22050 * 3 + 7):
+            y = (0.3 * rng.randn(n)).astype(np.float32)
+            expected = librosa.feature.rms(y=y, frame_length=2048, hop_length=512)
+            result = frame_rms(y)
+            assert result.shape == expected.shape and result.dtype == np.float32
+            np.testing.assert_allclose(result, expected, atol=1e-6)
+        
+        Y = rng.randn(3, 5000).astype(np.float32)
+        np.testing.assert_allclose(frame_rms(Y), librosa.feature.rms(y=Y), atol=1e-6)
+    
+    def test_frame_zcr_matches_librosa(self):
+        """Test the cumulative-sum zero-crossing rate against librosa incl. zeros and tiny values"""
+        rng = np.random.RandomState(41)
+        for n in (1, 100, 2048, 22050 * 2 + 3):
+            y = (0.3 * rng.randn(n)).astype(np.float32)
+            y[10:40] = 0.0
+            y[40:45] = -1e-12
+            expected = librosa.feature.zero_crossing_rate(y)
+            result = frame_zcr(y)
+            assert result.shape == expected.shape
+            np.testing.assert_array_equal(result, expected)
+    
+    def test_cached_mel_pipeline_matches_librosa(self, extractor):
+        """Test the cached mel filterbank and direct DCT against librosa melspectrogram/mfcc"""
+        sr = 22050
+        y = (0.3 * np.random.RandomState(29).randn(sr * 2)).astype(np.float32)
+        ctx = _AnalysisContext(y, sr)
+        
+        expected_mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=ctx.stft_mag ** 2, sr=sr))
+        np.testing.assert_allclose(ctx.mel_db, expected_mel_db, atol=1e-3)
+        assert mel_basis(sr) is mel_basis(sr)
+        
+        features = extractor.extract_spectral_features(y, sr, ctx=ctx)
+        mfccs = librosa.feature.mfcc(S=expected_mel_db, n_mfcc=13)
+        assert features['mfcc_mean'] == pytest.approx(float(np.mean(mfccs)), rel=1e-4)
+        assert features['mfcc_variance'] == pytest.approx(float(np.var(mfccs)), rel=1e-4)
+    
+    def test_stats1d_matches_numpy(self):
+        """Test the fused mean/var/min/max pass against the separate NumPy reductions"""
+        x = np.random.RandomState(6).rand(13, 400).astype(np.float32)
+        
+        for reduce in (stats1d, _stats1d_numpy):
+            mean, var, lo, hi = reduce(x)
+            
+            assert mean == pytest.approx(float(np.mean(x)), rel=1e-5)
+            assert var == pytest.approx(float(np.var(x)), rel=1e-4)
+            assert (lo, hi) == (float(x.min()), float(x.max()))
+            assert np.isnan(reduce(np.array([], dtype=np.float32))).all()
+    
+    def test_stats1d_float64_and_kernel_failure_fall_back(self):
+        """Test that float64 input works and a failing JIT dispatcher falls back to NumPy"""
+        x = np.arange(5.0)
+        expected = _stats1d_numpy(x)
+        assert stats1d(x) == pytest.approx(expected)
+        
+        broken = MagicMock(side_effect=ModuleNotFoundError("No module named 'backend'"))
+        with patch('backend.core_engine.audio_analysis.feature_extractor._stats1d_kernel', broken, create=True):
+            assert stats1d(x) == pytest.approx(expected)
+    
+    def test_estimate_key_matches_reference_loop(self, extractor):
+        """Test the matrix-product key estimate against the original per-shift corrcoef loop"""
+        key_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+        rng = np.random.RandomState(11)
+        
+        for _ in range(20):
+            chroma = rng.rand(12, 40)
+            chroma_mean = chroma.mean(axis=1)
+            major = [np.corrcoef(chroma_mean, np.roll(MAJOR_PROFILE, i))[0, 1] for i in range(12)]
+            minor = [np.corrcoef(chroma_mean, np.roll(MINOR_PROFILE, i))[0, 1] for i in range(12)]
+            expected = key_names[int(np.argmax(major))] if max(major) > max(minor) \
+                else key_names[int(np.argmax(minor))] + 'm'
+            
+            with patch('librosa.feature.chroma_stft', return_value=chroma):
+                key, camelot = extractor.estimate_key(np.zeros(1024, dtype=np.float32), 22050)
+            
+            assert key == expected
+            assert camelot == extractor.camelot_wheel[expected]
+    
+    def test_key_kernel_compiled_at_import(self):
+        """Test that the numba key kernel is selected and already JIT-compiled by the import warm-up"""
+        from backend.core_engine.audio_analysis import feature_extractor as fe_module
+        
+        if not fe_module.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+        assert fe_module.best_key_row is not fe_module._best_key_row_numpy
+        assert fe_module._best_key_row_kernel.signatures
+    
+    def test_best_key_row_matches_numpy(self):
+        """Test the (optionally JIT-compiled) key kernel against the NumPy reference"""
+        from backend.core_engine.audio_analysis.feature_extractor import _best_key_row_numpy, best_key_row
+        rng = np.random.RandomState(12)
+        
+        for _ in range(50):
+            chroma_mean = rng.rand(12)
+            assert best_key_row(chroma_mean) == _best_key_row_numpy(chroma_mean)
+        assert best_key_row(np.full(12, 0.5)) == _best_key_row_numpy(np.full(12, 0.5)) == 12
+        
+        # Laufzeitfehler des JIT-Dispatchers: NumPy-Referenz statt Ausnahme
+        chroma_mean = rng.rand(12)
+        broken = MagicMock(side_effect=ModuleNotFoundError("No module named 'backend'"))
+        with patch('backend.core_engine.audio_analysis.feature_extractor._best_key_row_kernel', broken, create=True):
+            assert best_key_row(chroma_mean) == _best_key_row_numpy(chroma_mean)
+    
+    def test_essentia_algorithms_built_lazily(self, extractor):
+        """Test that each Essentia algorithm is built on first access only"""
+        extractor.use_essentia = True  # Essentia-Pfad simulieren
+        
+        with patch('backend.core_engine.audio_analysis.feature_extractor.es', create=True) as mock_es:
+            assert extractor.key_extractor is extractor.key_extractor
+            mock_es.KeyExtractor.assert_called_once()
+            mock_es.RhythmExtractor2013.assert_not_called()
+    
+    def test_essentia_spectral_algorithms_configured_in_hz(self, extractor):
+        """Test that the Essentia centroid reports Hz for the 44.1 kHz frame spectrum"""
+        extractor.use_essentia = True
+        
+        with patch('backend.core_engine.audio_analysis.feature_extractor.es', create=True) as mock_es:
+            extractor.spectral_centroid
+            extractor.mfcc
+        mock_es.SpectralCentroid.assert_called_once_with(range=22050.0)
+        assert mock_es.MFCC.call_args.kwargs['inputSize'] == 1025
+    
+    def test_essentia_algorithms_none_without_essentia(self, extractor):
+        """Test that algorithm properties stay unset when Essentia is disabled"""
+        assert extractor.rhythm_extractor is None
+    
+    def test_essentia_rhythm_skipped_for_regular_beats(self, extractor):
+        """Test that RhythmExtractor2013 only runs when librosa beat tracking is uncertain"""
+        sr = 22050
+        clicks = librosa.clicks(times=np.arange(0, 10, 0.5), sr=sr, length=sr * 10).astype(np.float32)
+        extractor.use_essentia = True
+        extractor.rhythm_extractor = MagicMock(return_value=(128.0, [], 0.9, None, None))
+        
+        features = extractor.extract_rhythm_features(clicks, sr)
+        assert features['beat_regularity'] >= extractor.essentia_skip_thresholds['beat_regularity']
+        extractor.rhythm_extractor.assert_not_called()
+        
+        extractor.essentia_skip_thresholds['beat_regularity'] = 1.1  # Essentia immer nachrechnen
+        features = extractor.extract_rhythm_features(clicks, sr)
+        extractor.rhythm_extractor.assert_called_once()
+        assert features['bpm'] == 128.0
+    
+    def test_spectral_features_stacked_means(self, extractor):
+        """Test that the stacked reduce matches per-feature means"""
+        sr = 22050
+        y = (0.1 * np.random.RandomState(0).randn(sr * 5)).astype(np.float32)
+        features = extractor.extract_spectral_features(y, sr)
+
+        expected_zcr = np.mean(librosa.feature.zero_crossing_rate(y))
+        expected_flatness = np.mean(librosa.feature.spectral_flatness(y=y))
+        assert features['zero_crossing_rate'] == pytest.approx(expected_zcr, rel=1e-5)
+        assert features['spectral_flatness'] == pytest.approx(expected_flatness, rel=1e-5)
+        assert features['spectral_centroid'] > 0
+        assert 'spectral_bandwidth' in features
+
+    @pytest.mark.parametrize("sr", [22050, 44100])
+    def test_extract_all_features_shares_intermediates(self, extractor, sr):
+        """Test that onset envelope, beat tracking and chroma run once per signal across feature groups"""
+        y = (0.1 * np.random.RandomState(1).randn(sr * 3)).astype(np.float32)
+        
+        with patch('librosa.beat.beat_track', wraps=librosa.beat.beat_track) as beat_spy, \
+             patch('librosa.onset.onset_strength', wraps=librosa.onset.onset_strength) as onset_spy, \
+             patch('librosa.feature.chroma_stft', wraps=librosa.feature.chroma_stft) as chroma_spy:
+            features = extractor.extract_all_features(y, sr)
+        
+        beat_spy.assert_called_once()
+        onset_spy.assert_called_once()
+        chroma_spy.assert_called_once()
+        # 12 Bins werden explizit angefordert, chroma_mean braucht kein Padding
+        assert chroma_spy.call_args.kwargs['n_chroma'] == 12
+        assert 'danceability' in features
+        assert 'spectral_centroid' in features
+    
+    def test_extract_all_features_single_stft(self, extractor):
+        """Test that beat tracking, MFCC and spectral features share one STFT"""
+        sr = 22050
+        y = (0.1 * np.random.RandomState(2).randn(sr * 3)).astype(np.float32)
+        
+        with patch('librosa.stft', wraps=librosa.stft) as stft_spy:
+            features = extractor.extract_all_features(y, sr)
+        
+        stft_spy.assert_called_once()
+        assert 'mfcc_variance' in features
+        assert features['bpm'] > 0
+    
+    def test_extract_all_features_parallel_groups_match_serial(self, extractor):
+        """Test that running the feature groups on a thread pool gives the serial result"""
+        sr = 22050
+        y = (0.1 * np.random.RandomState(9).randn(sr * 3)).astype(np.float32)
+        parallel = FeatureExtractor(use_essentia=False, use_gpu=False, feature_workers=3)
+        
+        with patch('librosa.stft', wraps=librosa.stft) as stft_spy:
+            result = parallel.extract_all_features(y, sr)
+        
+        stft_spy.assert_called_once()
+        assert result == extractor.extract_all_features(y, sr)
+    
+    def test_extract_all_features_batch_matches_single(self, extractor):
+        """Test that the batched STFT path gives the same features as per-signal extraction"""
+        sr = 22050
+        rng = np.random.RandomState(4)
+        signals = [(0.1 * rng.randn(sr * 2)).astype(np.float32) for _ in range(2)]
+        signals.append((0.1 * rng.randn(sr * 3)).astype(np.float32))
+        
+        with patch('librosa.stft', wraps=librosa.stft) as stft_spy:
+            batched = extractor.extract_all_features_batch(signals, sr)
+        
+        # Alle Tracks (auch unterschiedlich lange) teilen sich die gepoolte rfft
+        assert stft_spy.call_count == 0
+        for features, y in zip(batched, signals):
+            single = extractor.extract_all_features(y, sr)
+            assert features['spectral_centroid'] == pytest.approx(single['spectral_centroid'], rel=1e-4)
+            assert features['energy'] == pytest.approx(single['energy'], rel=1e-4)
+    
+    def test_batch_gpu_features_reach_spectral_group(self, extractor):
+        """Test that the batched GPU log-mel/MFCC replace the per-track GPU call"""
+        sr = 22050
+        rng = np.random.RandomState(9)
+        signals = [(0.1 * rng.randn(n)).astype(np.float32) for n in (sr, sr * 2)]
+        fake = [{'log_mel': None, 'mfcc': np.full((13, 4), float(i + 1))} for i in range(2)]
+        extractor.device = 'cuda'  # GPU-Pfad simulieren
+        
+        with patch.object(extractor, '_extract_features_torch_batch', return_value=fake) as batch_spy, \
+             patch.object(extractor, '_extract_features_torch') as single_spy:
+            features = extractor.extract_all_features_batch(signals, sr)
+        
+        batch_spy.assert_called_once()
+        single_spy.assert_not_called()
+        assert [f['mfcc_mean'] for f in features] == [1.0, 2.0]
+    
+    def test_batch_stft_mag_matches_librosa_per_signal(self):
+        """Test that pooled frames of unequal-length signals give per-signal librosa spectrograms"""
+        rng = np.random.RandomState(8)
+        signals = [rng.randn(n).astype(np.float32) for n in (22050, 5000, 700)]
+        
+        with patch('scipy.fft.rfft', wraps=scipy.fft.rfft) as rfft_spy:
+            spectra = batch_stft_mag(signals)
+        
+        assert rfft_spy.call_count == 1
+        for S, y in zip(spectra, signals):
+            expected = np.abs(librosa.stft(y, n_fft=2048, hop_length=512))
+            assert S.shape == expected.shape
+            np.testing.assert_allclose(S, expected, atol=1e-3)
+    
+    def test_estimate_key_reuses_context_chroma(self, extractor):
+        """Test that estimate_key with the analysis context adds no further chroma_stft call"""
+        sr = 22050
+        t = np.arange(sr * 3) / sr
+        y = (0.3 * np.sin(2 * np.pi * 440.0 * t)).astype(np.float32)
+        ctx = _AnalysisContext(y, sr)
+        
+        with patch('librosa.feature.chroma_stft', wraps=librosa.feature.chroma_stft) as chroma_spy:
+            extractor.extract_all_features(y, sr, ctx=ctx)
+            key, camelot = extractor.estimate_key(y, sr, ctx=ctx)
+        
+        chroma_spy.assert_called_once()
+        assert (key, camelot) == extractor.estimate_key(y, sr)
+    
+    def test_context_squares_stft_once(self):
+        """Test that chroma and mel spectrogram share one cached power spectrogram"""
+        sr = 22050
+        y = (0.3 * np.random.RandomState(37).randn(sr)).astype(np.float32)
+        ctx = _AnalysisContext(y, sr)
+        
+        power = ctx.stft_power
+        np.testing.assert_allclose(ctx.chroma, librosa.feature.chroma_stft(S=ctx.stft_mag ** 2, sr=sr))
+        ctx.mel_db
+        
+        assert ctx.stft_power is power
+        np.testing.assert_allclose(power, ctx.stft_mag ** 2)
+    
+    def test_tonal_features_share_key_estimate(self, extractor):
+        """Test that key and mode in the tonal features come from estimate_key"""
+        sr = 22050
+        t = np.arange(sr * 3) / sr
+        # a-Moll-Dreiklang
+        y = sum(np.sin(2 * np.pi * f * t) for f in (220.0, 261.63, 329.63)).astype(np.float32) * 0.2
+        ctx = _AnalysisContext(y, sr)
+        
+        with patch('librosa.feature.chroma_stft', wraps=librosa.feature.chroma_stft) as chroma_spy:
+            features = extractor.extract_tonal_features(y, sr, ctx=ctx)
+        
+        chroma_spy.assert_called_once()
+        key, _ = extractor.estimate_key(y, sr, ctx=ctx)
+        assert features['key'] == key
+        np.testing.assert_allclose(ctx.center_chroma_mean, ctx.center_chroma().mean(axis=1))
+        assert features['mode'] == ('minor' if key.endswith('m') else 'major')
+        assert features['mode_confidence'] >= 0.0
+    
+    def test_key_tables_are_shared_constants(self, extractor):
+        """Test that the Camelot wheel and key profiles are read-only module constants"""
+        assert extractor.camelot_wheel is FeatureExtractor(use_essentia=False, use_gpu=False).camelot_wheel
+        assert len(extractor.camelot_wheel) == 24
+        with pytest.raises(ValueError):
+            MAJOR_PROFILE[0] = 0.0
+    
+    def test_metadata_title_falls_back_to_stem(self, extractor, tmp_path):
+        """Test that an untagged file gets its filename stem (not a tuple) as title"""
+        track = tmp_path / "My Track.MP3"
+        track.write_bytes(b"\x00" * 16)
+        
+        untagged = MagicMock(tags=None)
+        with patch('backend.core_engine.audio_analysis.feature_extractor.MutagenFile', return_value=untagged):
+            metadata = extractor.extract_metadata(str(track))
+        
+        assert metadata['title'] == 'My Track'
+        assert metadata['filename'] == 'My Track.MP3'
+        assert metadata['extension'] == '.mp3'
+        assert metadata['file_size'] == 16
+    
+    def test_metadata_reads_id3_tags_in_one_pass(self, extractor, tmp_path):
+        """Test that present ID3 frames override the defaults and missing ones keep them"""
+        track = tmp_path / "track.mp3"
+        track.write_bytes(b"\x00" * 4)
+        
+        tagged = MagicMock(tags={'TIT2': 'Night Drive', 'TPE1': 'Artist', 'TDRC': 2021})
+        with patch('backend.core_engine.audio_analysis.feature_extractor.MutagenFile', return_value=tagged):
+            metadata = extractor.extract_metadata(str(track))
+        
+        assert metadata['title'] == 'Night Drive'
+        assert metadata['artist'] == 'Artist'
+        assert metadata['year'] == '2021'
+        assert metadata['album'] == metadata['genre'] == 'Unknown'
+    
+    def test_metadata_bulk_scans_directory(self, extractor, tmp_path):
+        """Test the scandir-based bulk metadata with extension filter"""
+        (tmp_path / "a.wav").write_bytes(b"\x00" * 8)
+        (tmp_path / "b.FLAC").write_bytes(b"\x00" * 4)
+        (tmp_path / "notes.txt").write_text("x")
+        (tmp_path / "sub.wav").mkdir()
+        
+        with patch('backend.core_engine.audio_analysis.feature_extractor.MutagenFile', return_value=None):
+            results = dict(extractor.extract_metadata_bulk(str(tmp_path), {'.wav', '.flac'}))
+        
+        assert set(results) == {'a.wav', 'b.FLAC'}
+        assert results['a.wav']['file_size'] == 8
+        assert results['b.FLAC']['extension'] == '.flac'
+    
+    def test_compatible_keys_table(self, extractor):
+        """Test the precomputed Camelot neighbours including wrap-around and bad input"""
+        assert extractor.get_compatible_keys('8A') == ['8B', '9A', '7A']
+        assert extractor.get_compatible_keys('12B') == ['12A', '1B', '11B']
+        assert extractor.get_compatible_keys('1A') == ['1B', '2A', '12A']
+        assert extractor.get_compatible_keys('08A') == ['8B', '9A', '7A']
+        assert extractor.get_compatible_keys('Unknown') == []
+        assert extractor.get_compatible_keys('') == []
+    
+    @pytest.mark.parametrize("scale", [0.3, 1e-6])
+    def test_energy_loudness_matches_amplitude_to_db(self, extractor, scale):
+        """Test that the scalar loudness formula matches librosa.amplitude_to_db, including its floor"""
+        sr = 22050
+        y = (scale * np.random.RandomState(2).randn(sr)).astype(np.float32)
+        features = extractor.extract_energy_features(y, sr)
+        
+        expected = float(librosa.amplitude_to_db(features['energy']))
+        assert features['loudness'] == pytest.approx(expected, abs=1e-9)
+    
+    def test_estimate_helpers_reuse_context(self, extractor):
+        """Test that estimate_brightness/estimate_energy add no STFT when given the context"""
+        sr = 22050
+        y = (0.1 * np.random.RandomState(8).randn(sr * 2)).astype(np.float32)
+        ctx = _AnalysisContext(y, sr)
+        features = extractor.extract_all_features(y, sr, ctx=ctx)
+        
+        with patch('librosa.stft', wraps=librosa.stft) as stft_spy:
+            brightness = extractor.estimate_brightness(y, sr, ctx=ctx)
+            energy = extractor.estimate_energy(y, ctx=ctx)
+        
+        stft_spy.assert_not_called()
+        assert brightness == pytest.approx(features['spectral_centroid'], rel=1e-5)
+        assert energy == pytest.approx(features['energy'], rel=1e-5)
+    
+    def test_perceptual_features_reuse_context(self, extractor):
+        """Test that perceptual features take chroma, RMS stats and beats from a warmed context"""
+        sr = 22050
+        y = (0.1 * np.random.RandomState(10).randn(sr * 3)).astype(np.float32)
+        ctx = _AnalysisContext(y, sr)
+        ctx.warm()
+        
+        with patch('librosa.feature.rms') as rms_spy, \
+             patch('librosa.feature.chroma_stft') as chroma_spy, \
+             patch('librosa.beat.beat_track') as beat_spy:
+            features = extractor.extract_perceptual_features(y, sr, ctx=ctx)
+        
+        for spy in (rms_spy, chroma_spy, beat_spy):
+            spy.assert_not_called()
+        assert 0.0 <= features['valence'] <= 1.0
+        assert features['danceability'] >= 0.0
+    
+    def test_perceptual_valence_neutral_for_flat_chroma(self, extractor):
+        """Test that a constant chroma profile gives a finite valence instead of NaN"""
+        sr = 22050
+        y = (0.1 * np.random.RandomState(12).randn(sr * 2)).astype(np.float32)
+        ctx = _AnalysisContext(y, sr)
+        ctx.__dict__['chroma'] = np.ones((12, 20))
+        
+        features = extractor.extract_perceptual_features(y, sr, ctx=ctx)
+        
+        assert np.isfinite(features['valence'])
+    
+    def test_extract_all_features_converts_to_float32_once(self, extractor):
+        """Test that float64 input reaches every feature group as one shared float32 buffer"""
+        y = np.random.RandomState(13).randn(22050).astype(np.float64)
+        seen = []
+        
+        def capture(y, sr, ctx=None):
+            seen.append((y, ctx))
+            return {}
+        
+        names = ('extract_rhythm_features', 'extract_tonal_features', 'extract_spectral_features',
+                 'extract_energy_features', 'extract_perceptual_features')
+        with patch.multiple(extractor, **{name: capture for name in names}):
+            extractor.extract_all_features(y, 22050)
+        
+        assert len(seen) == 5
+        buffers = {id(y_seen) for y_seen, _ in seen}
+        assert len(buffers) == 1
+        y32, ctx = seen[0]
+        assert y32.dtype == np.float32 and y32.flags.c_contiguous
+        assert ctx.y is y32
+    
+    def test_all_features_downsamples_non_spectral_groups(self, extractor):
+        """Test that only the spectral group sees the full 44.1 kHz signal"""
+        y = np.random.RandomState(17).randn(44100).astype(np.float32)
+        seen = {}
+        
+        def capture(name):
+            def extract(y, sr, ctx=None):
+                seen[name] = (len(y), sr, ctx)
+                return {}
+            return extract
+        
+        names = ('extract_rhythm_features', 'extract_tonal_features', 'extract_spectral_features',
+                 'extract_energy_features', 'extract_perceptual_features')
+        with patch.multiple(extractor, **{name: capture(name) for name in names}):
+            extractor.extract_all_features(y, 44100)
+        
+        assert seen['extract_spectral_features'][:2] == (44100, 44100)
+        for name in names:
+            if name != 'extract_spectral_features':
+                assert seen[name][:2] == (22050, 22050)
+        # Essentia bekommt weiterhin das Originalsignal mit 44.1 kHz
+        assert seen['extract_rhythm_features'][2].essentia_audio is y
+    
+    def test_feature_groups_merge_in_table_order(self, extractor):
+        """Test that later groups in FEATURE_GROUPS override earlier keys"""
+        y = np.random.RandomState(5).randn(22050).astype(np.float32)
+        patches = {method: (lambda name: lambda y, sr, ctx=None: {'group': name})(name)
+                   for name, method, _ in extractor.FEATURE_GROUPS}
+        with patch.multiple(extractor, **patches):
+            features = extractor.extract_all_features(y, 22050)
+        
+        assert features['group'] == extractor.FEATURE_GROUPS[-1][0]
+    
+    def test_all_features_downmixes_stereo(self, extractor):
+        """Test that (channels, samples) input reaches the feature groups as mono at 22.05 kHz"""
+        stereo = np.random.RandomState(53).randn(2, 44100)
+        seen = []
+        
+        def capture(y, sr, ctx=None):
+            seen.append((y.ndim, y.dtype, sr))
+            return {}
+        
+        with patch.multiple(extractor, extract_rhythm_features=capture, extract_spectral_features=capture):
+            extractor.extract_all_features(stereo, 44100)
+        
+        assert seen == [(1, np.float32, 22050), (1, np.float32, 44100)]
+    
+    def test_silent_input_short_circuits(self, extractor):
+        """Test that silent signals return the canonical silent features without any STFT"""
+        with patch('librosa.stft') as stft_mock:
+            features = extractor.extract_all_features(np.full(22050, 1e-6, dtype=np.float32), 22050)
+            assert extractor.extract_all_features(np.zeros(0, dtype=np.float32), 22050)['silent'] is True
+        
+        stft_mock.assert_not_called()
+        assert features['silent'] is True
+        assert features['bpm'] == 0.0 and features['energy'] == 0.0
+    
+    def test_default_templates_return_independent_copies(self):
+        """Test that callers can mutate defaults and fallbacks without touching the shared templates"""
+        from backend.core_engine.audio_analysis.feature_extractor import (
+            get_fallback_analysis, get_safe_defaults, get_silent_features)
+        
+        defaults = get_safe_defaults()
+        defaults['bpm'] = 0.0
+        fallback = get_fallback_analysis("/music/a.mp3")
+        fallback['mood']['scores']['neutral'] = 0.0
+        fallback['camelot']['compatible_keys'].append('3A')
+        
+        assert get_safe_defaults()['bpm'] == 120.0
+        assert get_silent_features()['bpm'] == 0.0 and get_silent_features()['key'] == 'Unknown'
+        again = get_fallback_analysis("/music/a.mp3")
+        assert again['mood']['scores']['neutral'] == 1.0
+        assert again['camelot']['compatible_keys'] == ['1A', '12A', '2A']
+        assert again['filename'] == 'a.mp3' and 'analyzed_at' in again['metadata']
+    
+    def test_essentia_rhythm_skipped_for_short_clips(self, extractor):
+        """Test that RhythmExtractor2013 does not run on clips shorter than six seconds"""
+        sr = 22050
+        y = (0.3 * np.random.RandomState(31).randn(sr * 3)).astype(np.float32)
+        extractor.use_essentia = True
+        extractor.essentia_skip_thresholds['beat_regularity'] = 1.1
+        extractor.rhythm_extractor = MagicMock(return_value=(128.0, [], 0.9, None, None))
+        
+        extractor.extract_rhythm_features(y, sr)
+        
+        extractor.rhythm_extractor.assert_not_called()
+    
+    def test_single_beat_counts_as_irregular(self, extractor):
+        """Test that one detected beat gives regularity 0 (not NaN), so Essentia still runs"""
+        sr = 22050
+        y = (0.1 * np.random.RandomState(32).randn(sr * 8)).astype(np.float32)
+        ctx = _AnalysisContext(y, sr)
+        ctx.__dict__['_beat_track'] = (120.0, np.array([40]))
+        extractor.use_essentia = True
+        extractor.rhythm_extractor = MagicMock(return_value=(124.0, [], 0.9, None, None))
+        
+        features = extractor.extract_rhythm_features(y, sr, ctx=ctx)
+        
+        assert features['beat_regularity'] == 0.0
+        extractor.rhythm_extractor.assert_called_once()
+        assert features['bpm'] == 124.0
+    
+    def test_warm_prepares_shared_essentia_audio(self):
+        """Test that warming a downsampled context also resamples the shared Essentia signal once"""
+        y = (0.3 * np.random.RandomState(47).randn(48000)).astype(np.float32)
+        source = _AnalysisContext(y, 48000)
+        low = _AnalysisContext(librosa.resample(y, orig_sr=48000, target_sr=22050), 22050, source=source)
+        
+        low.warm()
+        assert 'essentia_audio' not in source.__dict__ and 'center_chroma_mean' in low.__dict__
+        
+        low.warm(include_essentia=True)
+        assert source.__dict__['essentia_audio'] is low.essentia_audio
+        assert len(low.essentia_audio) == 44100
+    
+    def test_direct_and_batch_extraction_use_float32(self, extractor):
+        """Test that float64 input is analysed in float32 outside extract_all_features as well"""
+        y64 = np.random.RandomState(59).randn(22050)
+        seen = []
+        
+        def capture(y, sr, ctx=None):
+            seen.append(ctx.y.dtype)
+            return {}
+        
+        assert _get_context(y64, 22050, None).y.dtype == np.float32
+        with patch.object(extractor, 'extract_rhythm_features', capture):
+            extractor.extract_all_features_batch([y64, y64.copy()], 22050)
+        assert seen == [np.float32, np.float32]
+    
+    def test_rhythm_features_bpm_is_float(self, extractor):
+        """Test that the 1-element tempo array from librosa is converted to a float BPM"""
+        sr = 22050
+        clicks = librosa.clicks(times=np.arange(0, 10, 0.5), sr=sr, length=sr * 10)
+        
+        features = extractor.extract_rhythm_features(clicks.astype(np.float32), sr)
+        
+        assert isinstance(features['bpm'], float)
+        assert features['bpm'] > 0
+        assert features['beat_count'] > 0
+        # 20 Klicks in 10 s, aus der gemeinsamen Onset-Hüllkurve
+        assert features['onset_rate'] == pytest.approx(2.0, abs=0.3)
+    
+    def test_beat_regularity_matches_time_intervals(self, extractor):
+        """Test the fused frame-interval regularity against std/mean of the beat times"""
+        sr = 22050
+        clicks = librosa.clicks(times=np.cumsum(np.tile([0.45, 0.55], 10)), sr=sr, length=sr * 12)
+        ctx = _AnalysisContext(clicks.astype(np.float32), sr)
+        
+        features = extractor.extract_rhythm_features(ctx.y, sr, ctx=ctx)
+        
+        intervals = np.diff(librosa.frames_to_time(ctx.beats, sr=sr, hop_length=512))
+        expected = 1.0 - np.std(intervals) / np.mean(intervals)
+        assert features['beat_regularity'] == pytest.approx(expected, abs=1e-9)
+    
+    def test_extractor_pool_lends_each_instance_exclusively(self):
+        """Test that concurrent pool users never share a FeatureExtractor instance"""
+        pool = FeatureExtractorPool(size=2, use_essentia=False, use_gpu=False)
+        y = np.random.RandomState(19).randn(22050).astype(np.float32)
+        in_use, overlaps = set(), []
+        lock = threading.Lock()
+        
+        def fake_extract(self, y, sr, ctx=None):
+            with lock:
+                if id(self) in in_use:
+                    overlaps.append(id(self))
+                in_use.add(id(self))
+            time.sleep(0.01)
+            with lock:
+                in_use.discard(id(self))
+            return {'extractor': id(self)}
+        
+        with patch.object(FeatureExtractor, 'extract_all_features', fake_extract):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda _: pool.extract(y, 22050), range(8)))
+        
+        assert not overlaps
+        assert len({r['extractor'] for r in results}) <= 2
+        assert pool._extractors.qsize() == 2